@@ -90,6 +90,22 @@ def get_driver_details(driver_number: int):
     }
 
 
+def get_driver_top_laps(driver_number: int, limit: int = 10):
+    """Get a driver's fastest ranked best laps across the season"""
+    conn = get_connection()
+
+    df = conn.execute("""
+        SELECT track_code, race_num, rank, lap_number, lap_time_seconds
+        FROM best_laps_long
+        WHERE driver_number = ?
+        ORDER BY lap_time_seconds
+        LIMIT ?
+    """, [driver_number, limit]).df()
+
+    conn.close()
+    return df
+
+
 def get_all_tracks():
     """Get all tracks with their stats"""
     conn = get_connection()
@@ -162,6 +178,58 @@ def get_track_details(track_code: str):
     }
 
 
+def get_theoretical_best_laps(track_code: str):
+    """Get each driver's theoretical best lap (sum of best splits) at a track"""
+    conn = get_connection()
+
+    df = conn.execute("""
+        WITH best_splits AS (
+            SELECT driver_number, split_index, MIN(split_seconds) as best_split
+            FROM lap_splits
+            WHERE track_code = ? AND split_seconds > 0
+            GROUP BY driver_number, split_index
+        ),
+        track_best AS (
+            SELECT split_index, best_seconds FROM split_stats WHERE track_code = ?
+        )
+        SELECT
+            bs.driver_number,
+            SUM(bs.best_split) as theoretical_best_seconds,
+            SUM(bs.best_split - tb.best_seconds) as time_lost_seconds
+        FROM best_splits bs
+        JOIN track_best tb ON bs.split_index = tb.split_index
+        GROUP BY bs.driver_number
+        HAVING COUNT(*) = (SELECT COUNT(*) FROM track_best)
+        ORDER BY theoretical_best_seconds
+    """, [track_code, track_code]).df()
+
+    conn.close()
+    return df
+
+
+def get_corner_comparison(track_code: str, race_num: int, corner_id: int):
+    """Compare drivers' braking point, apex speed and exit throttle at one corner"""
+    conn = get_connection()
+
+    df = conn.execute("""
+        SELECT
+            driver_number,
+            COUNT(*) as laps,
+            MEDIAN(brake_start_m) as brake_start_m,
+            MAX(apex_speed) as best_apex_speed,
+            AVG(apex_speed) as avg_apex_speed,
+            AVG(exit_throttle) as avg_exit_throttle,
+            MIN(corner_seconds) as best_corner_seconds
+        FROM corner_events
+        WHERE track_code = ? AND race_num = ? AND corner_id = ?
+        GROUP BY driver_number
+        ORDER BY best_apex_speed DESC
+    """, [track_code, race_num, corner_id]).df()
+
+    conn.close()
+    return df
+
+
 def get_database_summary():
     """Get summary statistics for the database"""
     conn = get_connection()
@@ -0,0 +1,5 @@
+"""Synthetic data generation and performance benchmarks"""
+
+from .synthetic_season import generate_season, generate_race
+
+__all__ = ["generate_season", "generate_race"]
@@ -0,0 +1,453 @@
+"""
+Golden-output equivalence harness for GR Cup Data Pipeline
+
+Runs a reference and a candidate pipeline on the same input files (each
+cold, in its own processed directory) and diffs every output table. Rows
+are matched on each table's natural key, never on the surrogate id, and
+float columns are compared with a tolerance.
+
+By default the reference is the baseline pipeline: ingest_data.py as of
+the repository's first commit (or --baseline REV), extracted with git
+archive and run on the same inputs. That is what catches drift from the
+original output. Tables the baseline does not have or never filled are
+skipped, as are CHANGED_SINCE_BASELINE columns, whose output changed on
+purpose. Columns the baseline stored under the wrong name are compared
+under their actual name (BASELINE_COLUMNS).
+--reference compares against another configuration of the current code
+instead, and --golden against an existing database.
+
+Usage:
+    python src/benchmarks/equivalence.py --candidate "--workers 4 --telemetry-engine duckdb"
+    python src/benchmarks/equivalence.py --baseline v1.0 --candidate "--threads 8"
+    python src/benchmarks/equivalence.py --golden golden.db --candidate "--threads 8"
+    python src/benchmarks/equivalence.py --reference "" --candidate "--workers 4"
+    python src/benchmarks/equivalence.py --data-dir data/processed/benchmarks/scale_5/raw
+"""
+
+import argparse
+import io
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tarfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.config import DATA_DIR, PROCESSED_DATA_DIR, PROJECT_ROOT, TRACKS
+from src.benchmarks.run_benchmarks import run_pipeline
+
+
+# Natural key of each compared table
+TABLE_KEYS = {
+    'race_results': ['track_code', 'race_num', 'driver_number'],
+    'lap_times': ['track_code', 'race_num', 'driver_number', 'lap_number'],
+    'lap_splits': ['track_code', 'race_num', 'driver_number', 'lap_number', 'split_index'],
+    'best_laps': ['track_code', 'race_num', 'driver_number'],
+    'best_laps_long': ['track_code', 'race_num', 'driver_number', 'rank'],
+    'weather': ['track_code', 'race_num', 'timestamp_utc'],
+    'lap_boundaries': ['track_code', 'race_num', 'vehicle_id', 'lap_number'],
+    'telemetry_aggregates': ['track_code', 'race_num', 'driver_number', 'lap_number'],
+    'corner_events': ['track_code', 'race_num', 'driver_number', 'lap_number', 'corner_id'],
+    'drivers': ['driver_number'],
+    'driver_stats': ['driver_number'],
+    'track_stats': ['track_code'],
+    'split_stats': ['track_code', 'split_index'],
+    'driver_race_partials': ['track_code', 'race_num', 'driver_number'],
+    'track_race_partials': ['track_code', 'race_num'],
+}
+
+# Columns that differ between runs by design
+IGNORED_COLUMNS = {'id'}
+
+# Baseline columns whose output changed on purpose, by table
+CHANGED_SINCE_BASELINE = {
+    'driver_stats': {
+        'qualifying_score': 'computed score replaces the 75.0 placeholder',
+        'braking_score': 'computed score replaces the 75.0 placeholder',
+        'cornering_score': 'computed score replaces the 75.0 placeholder',
+        'throttle_score': 'computed score replaces the 75.0 placeholder',
+        'racecraft_score': 'computed score replaces the 75.0 placeholder',
+        'overall_rating': 'averages the computed scores',
+    },
+}
+
+# Baseline columns that hold another column's values (stored -> actual), by
+# table. The baseline inserted track_stats positionally from a frame whose
+# columns were in a different order; INTEGER columns kept rounded values.
+BASELINE_COLUMNS = {
+    'track_stats': {
+        'lap_record_driver': 'avg_lap_time_seconds',
+        'avg_speed_kph': 'top_speed_kph',
+        'top_speed_kph': 'total_laps',
+        'total_laps': 'lap_record_driver',
+        'avg_lap_time_seconds': 'avg_speed_kph',
+    },
+}
+
+DEFAULT_WORK_DIR = PROCESSED_DATA_DIR / "equivalence"
+
+
+@dataclass
+class TableDiff:
+    """Differences between one table in the reference and candidate outputs"""
+    table: str
+    reference_rows: int = 0
+    candidate_rows: int = 0
+    missing_rows: int = 0
+    extra_rows: int = 0
+    column_mismatches: Dict[str, Tuple[int, Optional[float]]] = field(default_factory=dict)
+    missing_columns: List[str] = field(default_factory=list)
+    added_columns: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def equal(self) -> bool:
+        """Added columns are allowed (e.g. against a golden file from an older schema)"""
+        return (self.error is None and not self.missing_rows and not self.extra_rows
+                and not self.column_mismatches and not self.missing_columns)
+
+    def describe(self) -> str:
+        if self.error:
+            return f"  - {self.table}: {self.error}"
+        if self.equal:
+            added = f" (new columns: {', '.join(self.added_columns)})" if self.added_columns else ""
+            return f"  = {self.table}: {self.reference_rows:,} rows identical{added}"
+
+        lines = [f"  - {self.table}: {self.reference_rows:,} reference rows, {self.candidate_rows:,} candidate rows"]
+        if self.missing_columns:
+            lines.append(f"      columns missing from candidate: {', '.join(self.missing_columns)}")
+        if self.missing_rows:
+            lines.append(f"      {self.missing_rows:,} rows missing from candidate")
+        if self.extra_rows:
+            lines.append(f"      {self.extra_rows:,} extra rows in candidate")
+        for column, (count, max_diff) in sorted(self.column_mismatches.items()):
+            detail = f" (max abs diff {max_diff:.6g})" if max_diff is not None else ""
+            lines.append(f"      {column}: {count:,} values differ{detail}")
+        return "\n".join(lines)
+
+
+def _with_occurrence(df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """Number rows that share a key so duplicate keys still pair up deterministically"""
+    df = df.sort_values(list(df.columns), na_position='last', kind='mergesort').reset_index(drop=True)
+    df['_occurrence'] = df.groupby(keys, dropna=False, sort=False).cumcount()
+    return df
+
+
+def compare_frames(table: str, reference: pd.DataFrame, candidate: pd.DataFrame,
+                   rtol: float = 1e-9, atol: float = 1e-9) -> TableDiff:
+    """
+    Diff two versions of a table
+
+    Args:
+        table: Table name (selects the key from TABLE_KEYS)
+        reference: Reference rows
+        candidate: Candidate rows
+        rtol: Relative tolerance for float columns
+        atol: Absolute tolerance for float columns
+
+    Returns:
+        TableDiff
+    """
+    diff = TableDiff(table, reference_rows=len(reference), candidate_rows=len(candidate))
+
+    diff.missing_columns = [c for c in reference.columns if c not in candidate.columns]
+    diff.added_columns = [c for c in candidate.columns if c not in reference.columns]
+    columns = [c for c in reference.columns if c in candidate.columns and c not in IGNORED_COLUMNS]
+
+    keys = TABLE_KEYS.get(table) or columns
+    merged = _with_occurrence(reference[columns], keys).merge(
+        _with_occurrence(candidate[columns], keys),
+        on=keys + ['_occurrence'], how='outer', suffixes=('_ref', '_cand'), indicator=True
+    )
+
+    diff.missing_rows = int((merged['_merge'] == 'left_only').sum())
+    diff.extra_rows = int((merged['_merge'] == 'right_only').sum())
+    both = merged[merged['_merge'] == 'both']
+
+    for column in columns:
+        if column in keys:
+            continue
+
+        ref_values, cand_values = both[f'{column}_ref'], both[f'{column}_cand']
+        ref_numeric = pd.api.types.is_numeric_dtype(ref_values) and not pd.api.types.is_bool_dtype(ref_values)
+        cand_numeric = pd.api.types.is_numeric_dtype(cand_values) and not pd.api.types.is_bool_dtype(cand_values)
+
+        if ref_numeric and cand_numeric:
+            a = ref_values.to_numpy(dtype=float, na_value=np.nan)
+            b = cand_values.to_numpy(dtype=float, na_value=np.nan)
+            differs = ~np.isclose(a, b, rtol=rtol, atol=atol, equal_nan=True)
+            max_diff = float(np.nanmax(np.abs(a - b)[differs])) if differs.any() else None
+        else:
+            a, b = ref_values.astype(object), cand_values.astype(object)
+            differs = ~((a == b) | (a.isna() & b.isna())).to_numpy(dtype=bool)
+            max_diff = None
+
+        if differs.any():
+            diff.column_mismatches[column] = (int(differs.sum()), max_diff)
+
+    return diff
+
+
+def align_baseline(table: str, reference: pd.DataFrame,
+                   candidate: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Make a baseline table comparable with the candidate's, column by column
+
+    Renames BASELINE_COLUMNS to the column they actually hold, rounds
+    candidate values the baseline could only store as integers, and drops
+    CHANGED_SINCE_BASELINE columns from both sides.
+
+    Args:
+        table: Table name
+        reference: Baseline rows
+        candidate: Candidate rows
+
+    Returns:
+        Tuple of (reference, candidate)
+    """
+    renames = BASELINE_COLUMNS.get(table, {})
+    if renames:
+        reference = reference.rename(columns=renames)
+        candidate = candidate.copy()
+        for column in renames.values():
+            if (column in candidate.columns and pd.api.types.is_integer_dtype(reference[column])
+                    and pd.api.types.is_float_dtype(candidate[column])):
+                candidate[column] = candidate[column].round()
+
+    changed = list(CHANGED_SINCE_BASELINE.get(table, {}))
+    return reference.drop(columns=changed, errors='ignore'), candidate.drop(columns=changed, errors='ignore')
+
+
+def compare_databases(reference_db: Path, candidate_db: Path, tables: Optional[List[str]] = None,
+                      rtol: float = 1e-9, atol: float = 1e-9, baseline: bool = False) -> List[TableDiff]:
+    """
+    Diff every table of two pipeline databases
+
+    Args:
+        reference_db: Golden database
+        candidate_db: Database produced by the path under test
+        tables: Tables to compare (defaults to TABLE_KEYS)
+        rtol: Relative tolerance for float columns
+        atol: Absolute tolerance for float columns
+        baseline: Reference is the baseline pipeline (see align_baseline)
+
+    Returns:
+        One TableDiff per table
+    """
+    reference = duckdb.connect(str(reference_db), read_only=True)
+    candidate = duckdb.connect(str(candidate_db), read_only=True)
+    diffs = []
+
+    try:
+        for table in tables or list(TABLE_KEYS):
+            try:
+                ref_df = reference.execute(f"SELECT * FROM {table}").df()
+                cand_df = candidate.execute(f"SELECT * FROM {table}").df()
+            except duckdb.Error as e:
+                diffs.append(TableDiff(table, error=str(e).splitlines()[0]))
+                continue
+            if baseline:
+                ref_df, cand_df = align_baseline(table, ref_df, cand_df)
+            diffs.append(compare_frames(table, ref_df, cand_df, rtol=rtol, atol=atol))
+    finally:
+        reference.close()
+        candidate.close()
+
+    return diffs
+
+
+def print_speedup(reference: dict, candidate: dict):
+    """
+    Print per-stage and total speedup of candidate over reference
+
+    Totals are only compared when both runs report the same stages; otherwise
+    the speedup is taken over the stages they share. The baseline pipeline
+    writes no run report, so its total is not comparable at all.
+    """
+    print("\n[SPEEDUP] Reference vs candidate (seconds)")
+    shared = [name for name in reference['stages'] if name in candidate['stages']]
+    stages = list(reference['stages']) + list(candidate['stages']) if reference['stages'] else []
+    for name in dict.fromkeys(stages):
+        ref = reference['stages'].get(name, {}).get('wall_seconds')
+        cand = candidate['stages'].get(name, {}).get('wall_seconds')
+        ratio = f"{ref / cand:6.2f}x" if ref and cand else "     -"
+        print(f"  {name:<28} {ref if ref is not None else float('nan'):9.3f} "
+              f"{cand if cand is not None else float('nan'):9.3f} {ratio}")
+
+    total = f"  {'TOTAL':<28} {reference['wall_seconds']:9.3f} {candidate['wall_seconds']:9.3f}"
+    if set(reference['stages']) == set(candidate['stages']):
+        print(f"{total} {reference['wall_seconds'] / candidate['wall_seconds']:6.2f}x")
+        return
+
+    if not reference['stages']:
+        print(f"{total}      -  (not comparable: the baseline runs different stages)")
+        return
+
+    print(f"{total}      -  (not comparable: runs have different stages)")
+    ref = sum(reference['stages'][name]['wall_seconds'] for name in shared)
+    cand = sum(candidate['stages'][name]['wall_seconds'] for name in shared)
+    ratio = f"{ref / cand:6.2f}x" if ref and cand else "     -"
+    print(f"  {'SHARED STAGES':<28} {ref:9.3f} {cand:9.3f} {ratio}")
+
+
+def _git(*args: str) -> bytes:
+    return subprocess.run(["git", *args], check=True, cwd=PROJECT_ROOT, capture_output=True).stdout
+
+
+def build_baseline(data_dir: Path, work_dir: Path, revision: Optional[str] = None) -> Tuple[Path, dict]:
+    """
+    Run the baseline pipeline on the given inputs
+
+    The baseline reads its track folders from its own project root and
+    writes to data/processed below it, so src/ is extracted from git into
+    work_dir and the track folders of data_dir are linked next to it.
+
+    Args:
+        data_dir: Input data root
+        work_dir: Directory to extract and run the baseline in
+        revision: Git revision of the baseline (the repository's first commit if None)
+
+    Returns:
+        Tuple of (baseline database, run summary with wall_seconds)
+    """
+    revision = revision or _git("rev-list", "--max-parents=0", "HEAD").split()[-1].decode()
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    work_dir.mkdir(parents=True)
+    with tarfile.open(fileobj=io.BytesIO(_git("archive", "--format=tar", revision, "src"))) as archive:
+        archive.extractall(work_dir)
+
+    for folder in {track['directory'].split('/')[0] for track in TRACKS.values()}:
+        if (data_dir / folder).exists():
+            (work_dir / folder).symlink_to((data_dir / folder).resolve(), target_is_directory=True)
+
+    env = {key: value for key, value in os.environ.items() if not key.startswith("GRCUP_")}
+    env["PYTHONPATH"] = str(work_dir)
+
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(work_dir / "src" / "pipeline" / "ingest_data.py")],
+        check=True, cwd=work_dir, env=env, stdout=subprocess.DEVNULL
+    )
+    wall = time.perf_counter() - started
+
+    return work_dir / "data" / "processed" / "driver_stats.db", {'wall_seconds': wall, 'stages': {}}
+
+
+def _table_rows(db_path: Path) -> Dict[str, int]:
+    conn = duckdb.connect(str(db_path), read_only=True)
+    try:
+        tables = [row[0] for row in conn.execute("SELECT table_name FROM duckdb_tables()").fetchall()]
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+    finally:
+        conn.close()
+
+
+def run_equivalence(candidate_args: List[str], reference_args: Optional[List[str]] = None,
+                    data_dir: Path = DATA_DIR, work_dir: Path = DEFAULT_WORK_DIR,
+                    golden_db: Optional[Path] = None, baseline: Optional[str] = None,
+                    tables: Optional[List[str]] = None,
+                    rtol: float = 1e-9, atol: float = 1e-9) -> bool:
+    """
+    Run reference and candidate pipelines on the same inputs and diff their output
+
+    Args:
+        candidate_args: ingest_data.py options for the path under test
+        reference_args: Compare against the current ingest_data.py run with these
+            options instead of the baseline pipeline
+        data_dir: Input data root
+        work_dir: Where both runs' processed directories are created
+        golden_db: Compare against this database instead of running a reference
+        baseline: Git revision of the baseline pipeline (the first commit if None)
+        tables: Tables to compare (every TABLE_KEYS table in the reference,
+            less those the baseline never filled, if None)
+        rtol: Relative tolerance for float columns
+        atol: Absolute tolerance for float columns
+
+    Returns:
+        True if every table matches
+    """
+    reference = None
+    skipped = {}
+    against_baseline = golden_db is None and reference_args is None
+    if golden_db is None and reference_args is None:
+        print(f"\n[EQUIVALENCE] Reference: baseline pipeline ({baseline or 'first commit'})")
+        golden_db, reference = build_baseline(data_dir, work_dir / "baseline", baseline)
+        print(f"  + {reference['wall_seconds']:.2f}s")
+    elif golden_db is None:
+        print(f"\n[EQUIVALENCE] Reference: ingest_data.py {' '.join(reference_args)}")
+        reference = run_pipeline(data_dir, work_dir / "reference", list(reference_args))
+        golden_db = work_dir / "reference" / "driver_stats.db"
+        print(f"  + {reference['wall_seconds']:.2f}s")
+
+    print(f"\n[EQUIVALENCE] Candidate: ingest_data.py {' '.join(candidate_args)}")
+    candidate = run_pipeline(data_dir, work_dir / "candidate", list(candidate_args))
+    print(f"  + {candidate['wall_seconds']:.2f}s")
+
+    if tables is None:
+        rows = _table_rows(golden_db)
+        for table in TABLE_KEYS:
+            if table not in rows:
+                skipped[table] = "not in the reference"
+            elif against_baseline and not rows[table]:
+                skipped[table] = "the baseline never filled it"
+        tables = [table for table in TABLE_KEYS if table not in skipped]
+
+    print(f"\n[EQUIVALENCE] Comparing tables (rtol={rtol:g}, atol={atol:g})...")
+    diffs = compare_databases(golden_db, work_dir / "candidate" / "driver_stats.db", tables=tables,
+                              rtol=rtol, atol=atol, baseline=against_baseline)
+    for diff in diffs:
+        print(diff.describe())
+    for table, reason in skipped.items():
+        print(f"  ~ {table}: skipped, {reason}")
+    if against_baseline:
+        for table in tables:
+            for column, reason in CHANGED_SINCE_BASELINE.get(table, {}).items():
+                print(f"  ~ {table}.{column}: skipped, {reason}")
+
+    if reference is not None:
+        print_speedup(reference, candidate)
+
+    equal = all(diff.equal for diff in diffs)
+    print("\n[OK] Outputs are equivalent" if equal else "\n[FAIL] Outputs differ")
+    return equal
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Check a pipeline configuration against the reference output")
+    parser.add_argument("--candidate", default="--workers 4 --telemetry-engine duckdb",
+                        help="ingest_data.py options for the path under test (one quoted string)")
+    parser.add_argument("--reference",
+                        help="Compare against the current ingest_data.py with these options "
+                             "(one quoted string, \"\" for defaults) instead of the baseline pipeline")
+    parser.add_argument("--baseline", metavar="REV",
+                        help="Git revision of the baseline pipeline (default: the first commit)")
+    parser.add_argument("--golden", type=Path, help="Existing reference database (skips the reference run)")
+    parser.add_argument("--tables", nargs="+", help="Tables to compare (default: every table in the reference)")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR, help="Input data root")
+    parser.add_argument("--work-dir", type=Path, default=DEFAULT_WORK_DIR)
+    parser.add_argument("--rtol", type=float, default=1e-9)
+    parser.add_argument("--atol", type=float, default=1e-9)
+    args = parser.parse_args(argv)
+
+    equal = run_equivalence(
+        shlex.split(args.candidate), None if args.reference is None else shlex.split(args.reference),
+        data_dir=args.data_dir, work_dir=args.work_dir, golden_db=args.golden,
+        baseline=args.baseline, tables=args.tables, rtol=args.rtol, atol=args.atol
+    )
+    sys.exit(0 if equal else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Scale benchmarks for GR Cup Data Pipeline
+
+For each scale factor a synthetic season is generated (once, then reused),
+the ingest pipeline is run against it in a fresh process, and the
+src/app/database.py queries are timed against the resulting database.
+
+Stage timings come from the pipeline's own JSON run report, so they match
+what the pipeline_runs table records in production.
+
+Usage:
+    python src/benchmarks/run_benchmarks.py --scales 1 5 20 --telemetry-rows 200000
+    python src/benchmarks/run_benchmarks.py --scales 1 -- --workers 4
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.config import PROJECT_ROOT, PROCESSED_DATA_DIR, TRACKS
+
+
+BENCHMARKS_DIR = Path(__file__).parent
+
+DEFAULT_SCALES = [1, 5, 20]
+DEFAULT_WORK_DIR = PROCESSED_DATA_DIR / "benchmarks"
+
+# Marker written after a season is generated, so it can be reused safely
+SEASON_MARKER = "_season.json"
+
+
+def _environment(data_dir: Path, processed_dir: Path) -> Dict[str, str]:
+    env = os.environ.copy()
+    env["GRCUP_DATA_DIR"] = str(data_dir)
+    env["GRCUP_PROCESSED_DIR"] = str(processed_dir)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def ensure_season(data_dir: Path, scale: int, telemetry_rows: int, seed: int = 0) -> float:
+    """
+    Generate a synthetic season unless an identical one already exists
+
+    Args:
+        data_dir: Directory to write the track folders into
+        scale: Multiplier on field size
+        telemetry_rows: Approximate telemetry rows per race at scale 1
+        seed: Random seed
+
+    Returns:
+        Seconds spent generating (0 if reused)
+    """
+    settings = {'scale': scale, 'telemetry_rows': telemetry_rows, 'seed': seed}
+    marker = data_dir / SEASON_MARKER
+
+    if marker.exists() and json.loads(marker.read_text()) == settings:
+        print(f"  = Scale {scale}: Reusing season in {data_dir}")
+        return 0.0
+
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(BENCHMARKS_DIR / "synthetic_season.py"), str(data_dir),
+         "--scale", str(scale), "--telemetry-rows", str(telemetry_rows), "--seed", str(seed)],
+        check=True, cwd=PROJECT_ROOT, env=_environment(data_dir, data_dir)
+    )
+    marker.write_text(json.dumps(settings))
+    return time.perf_counter() - started
+
+
+def run_pipeline(data_dir: Path, processed_dir: Path, pipeline_args: List[str]) -> dict:
+    """
+    Run the ingest pipeline in a fresh process and read back its run report
+
+    Args:
+        data_dir: Synthetic season root
+        processed_dir: Processed data directory (database, store, reports)
+        pipeline_args: Extra ingest_data.py options
+
+    Returns:
+        Dictionary with total wall time and per-stage metrics
+    """
+    # Start cold: no database, telemetry store or lap caches from a previous run
+    for name in ("driver_stats.db", "telemetry", "telemetry_cache", "telemetry_pyramid", "resampled"):
+        path = processed_dir / name
+        if path.is_dir():
+            shutil.rmtree(path)
+        elif path.exists():
+            path.unlink()
+
+    reports_dir = processed_dir / "run_reports"
+    before = set(reports_dir.glob("run_*.json")) if reports_dir.exists() else set()
+
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(PROJECT_ROOT / "src" / "pipeline" / "ingest_data.py"), *pipeline_args],
+        check=True, cwd=PROJECT_ROOT, env=_environment(data_dir, processed_dir),
+        stdout=subprocess.DEVNULL
+    )
+    wall = time.perf_counter() - started
+
+    new_reports = sorted(set(reports_dir.glob("run_*.json")) - before)
+    report = json.loads(new_reports[-1].read_text()) if new_reports else {'stages': []}
+
+    return {
+        'wall_seconds': wall,
+        'peak_rss_mb': report.get('peak_rss_mb'),
+        'stages': {stage['stage']: stage for stage in report['stages']}
+    }
+
+
+def time_app_queries(repeat: int = 3) -> Dict[str, float]:
+    """
+    Time every src/app/database.py query against the configured database
+
+    Args:
+        repeat: Runs per query (the best time is kept)
+
+    Returns:
+        Dictionary of query name -> best seconds
+    """
+    from src.app import database as app_db
+
+    drivers = app_db.get_all_drivers()
+    driver_number = int(drivers['driver_number'].iloc[0]) if len(drivers) else 0
+    track_code = next(iter(TRACKS))
+
+    queries = {
+        'get_all_drivers': app_db.get_all_drivers,
+        'get_driver_details': lambda: app_db.get_driver_details(driver_number),
+        'get_all_tracks': app_db.get_all_tracks,
+        'get_track_details': lambda: app_db.get_track_details(track_code),
+        'get_database_summary': app_db.get_database_summary,
+    }
+
+    timings = {}
+    for name, query in queries.items():
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            query()
+            best = min(best, time.perf_counter() - started)
+        timings[name] = best
+
+    return timings
+
+
+def run_app_queries(data_dir: Path, processed_dir: Path, repeat: int) -> Dict[str, float]:
+    """Time the app queries in a fresh process pointed at processed_dir"""
+    result = subprocess.run(
+        [sys.executable, str(BENCHMARKS_DIR / "run_benchmarks.py"), "--app-queries", "--repeat", str(repeat)],
+        check=True, cwd=PROJECT_ROOT, env=_environment(data_dir, processed_dir),
+        capture_output=True, text=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def print_results(results: List[dict]):
+    """Print one table of stage times and one of query times across scales"""
+    scales = [r['scale'] for r in results]
+    header = f"  {'':<28}" + "".join(f"{f'{s}x':>12}" for s in scales)
+
+    print("\n[BENCHMARK] Pipeline stages (seconds)")
+    print(header)
+    stages = []
+    for r in results:
+        stages += [name for name in r['pipeline']['stages'] if name not in stages]
+    for name in stages + ['TOTAL']:
+        cells = []
+        for r in results:
+            if name == 'TOTAL':
+                cells.append(r['pipeline']['wall_seconds'])
+            else:
+                cells.append(r['pipeline']['stages'].get(name, {}).get('wall_seconds', float('nan')))
+        print(f"  {name:<28}" + "".join(f"{c:12.3f}" for c in cells))
+
+    print("\n[BENCHMARK] App queries (milliseconds, best of runs)")
+    print(header)
+    for name in results[0]['queries']:
+        print(f"  {name:<28}" + "".join(f"{r['queries'][name] * 1000:12.2f}" for r in results))
+
+
+def run_benchmarks(scales: List[int], telemetry_rows: int, work_dir: Path,
+                   pipeline_args: Optional[List[str]] = None, repeat: int = 3) -> Path:
+    """
+    Generate, ingest and query a synthetic season at every scale
+
+    Args:
+        scales: Field size multipliers (e.g. [1, 5, 20])
+        telemetry_rows: Approximate telemetry rows per race at scale 1
+        work_dir: Where seasons, databases and results are written
+        pipeline_args: Extra ingest_data.py options
+        repeat: Runs per app query
+
+    Returns:
+        Path of the JSON results file
+    """
+    pipeline_args = list(pipeline_args or [])
+    results = []
+
+    for scale in scales:
+        data_dir = work_dir / f"scale_{scale}" / "raw"
+        processed_dir = work_dir / f"scale_{scale}" / "processed"
+
+        print(f"\n[BENCHMARK] Scale {scale}x")
+        generate_seconds = ensure_season(data_dir, scale, telemetry_rows)
+        pipeline = run_pipeline(data_dir, processed_dir, pipeline_args)
+        print(f"  + Pipeline: {pipeline['wall_seconds']:.2f}s")
+        queries = run_app_queries(data_dir, processed_dir, repeat)
+        print(f"  + App queries: {sum(queries.values()) * 1000:.1f} ms")
+
+        results.append({
+            'scale': scale,
+            'telemetry_rows_per_race': telemetry_rows * scale,
+            'generate_seconds': generate_seconds,
+            'pipeline': pipeline,
+            'queries': queries
+        })
+
+    print_results(results)
+
+    work_dir.mkdir(parents=True, exist_ok=True)
+    results_path = work_dir / f"benchmark_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(results_path, 'w') as f:
+        json.dump({'pipeline_args': pipeline_args, 'results': results}, f, indent=2)
+
+    print(f"\n[OK] Results written to {results_path}")
+    return results_path
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point; options after '--' are passed to ingest_data.py"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    pipeline_args = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, pipeline_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description="GR Cup pipeline scale benchmarks")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--telemetry-rows", type=int, default=200_000,
+                        help="Approximate telemetry rows per race at scale 1")
+    parser.add_argument("--work-dir", type=Path, default=DEFAULT_WORK_DIR)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per app query")
+    parser.add_argument("--app-queries", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.app_queries:
+        print(json.dumps(time_app_queries(args.repeat)))
+        return
+
+    run_benchmarks(args.scales, args.telemetry_rows, args.work_dir, pipeline_args, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Synthetic season generator for GR Cup Data Pipeline benchmarks
+
+Writes a full season (every track in TRACKS, races 1 and 2) using the file
+names in FILE_PATTERNS and the column layouts of the real timing exports, so
+the ingest pipeline can be exercised and timed without the private data set.
+"""
+
+import argparse
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.config import TRACKS, FILE_PATTERNS, TELEMETRY_SAMPLE_RATE
+
+
+BASE_DRIVERS = 22
+BASE_LAPS = 20
+RACE_START = pd.Timestamp("2025-05-03T15:00:00Z")
+SPLIT_NAMES = ['IM1a', 'IM1', 'IM2a', 'IM2', 'IM3a', 'FL']
+SPLIT_FRACTIONS = [0.15, 0.3, 0.45, 0.6, 0.8, 1.0]
+
+
+def format_lap_time(seconds: float) -> str:
+    """Format seconds as the timing exports do ('M:SS.mmm')"""
+    minutes = int(seconds // 60)
+    return f"{minutes}:{seconds - minutes * 60:06.3f}"
+
+
+def _lap_times(rng, base: float, drivers: int, laps: int) -> np.ndarray:
+    pace = base * (1 + rng.normal(0.01, 0.008, size=(drivers, 1)))
+    times = pace + rng.normal(0, 0.6, size=(drivers, laps))
+    times[:, 0] += 8.0
+    return np.round(times, 3)
+
+
+def _write(df: pd.DataFrame, path: Path, sep: str = ';'):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, sep=sep, index=False)
+
+
+def generate_race(root: Path, track_code: str, race_num: int, scale: int,
+                  telemetry_rows: int, seed: int = 0):
+    """
+    Write every file for one race
+
+    Args:
+        root: Data root (stands in for DATA_DIR)
+        track_code: Track code from TRACKS
+        race_num: Race number (1 or 2)
+        scale: Multiplier on field size (drivers per race)
+        telemetry_rows: Approximate telemetry rows per race at scale 1
+        seed: Random seed (the same seed always writes the same files)
+    """
+    rng = np.random.default_rng(zlib.crc32(f"{track_code}-{race_num}-{seed}".encode()))
+    track = TRACKS[track_code]
+    race_dir = root / track["directory"] / f"Race {race_num}"
+    prefix = track["telemetry_prefix"]
+
+    drivers = BASE_DRIVERS * scale
+    laps = BASE_LAPS
+    numbers = np.arange(2, 2 + drivers) * 3 % 997 + 1
+    base_lap = track["length_miles"] * 3600 / 85.0
+    times = _lap_times(rng, base_lap, drivers, laps)
+    lap_numbers = np.arange(1, laps + 1)
+
+    # Lap analysis with sectors and intermediate splits
+    fractions = np.array([0.32, 0.35, 0.33])
+    sectors = np.round(times[..., None] * fractions, 3)
+    sectors[..., 2] = np.round(times - sectors[..., 0] - sectors[..., 1], 3)
+    cumulative = np.cumsum(times, axis=1)
+    analysis = {
+        'NUMBER': np.repeat(numbers, laps),
+        ' DRIVER_NUMBER': np.repeat(numbers, laps),
+        ' LAP_NUMBER': np.tile(lap_numbers, drivers),
+        ' LAP_TIME': [format_lap_time(t) for t in times.ravel()],
+        ' LAP_IMPROVEMENT': 0,
+        ' S1_SECONDS': sectors[..., 0].ravel(),
+        ' S2_SECONDS': sectors[..., 1].ravel(),
+        ' S3_SECONDS': sectors[..., 2].ravel(),
+        ' ELAPSED': [format_lap_time(t) for t in cumulative.ravel()],
+        ' TOP_SPEED': np.round(rng.normal(190, 4, size=drivers * laps), 1),
+        ' FLAG_AT_FL': np.where(np.tile(lap_numbers, drivers) == 1, 'FCY', 'GF'),
+    }
+    previous = np.zeros_like(times)
+    for name, fraction in zip(SPLIT_NAMES, SPLIT_FRACTIONS):
+        split = np.round(times * fraction - previous, 3)
+        previous = previous + split
+        elapsed = cumulative - times + previous
+        analysis[f'{name}_time'] = [format_lap_time(t) if t >= 60 else f"{t:.3f}" for t in split.ravel()]
+        analysis[f'{name}_elapsed'] = [format_lap_time(t) for t in elapsed.ravel()]
+    _write(pd.DataFrame(analysis),
+           race_dir / FILE_PATTERNS["lap_analysis"].format(race_num=race_num))
+
+    # Provisional results
+    total = cumulative[:, -1]
+    order = np.argsort(total)
+    best = times.min(axis=1)
+    best_lap = times.argmin(axis=1) + 1
+    gap_first = total[order] - total[order][0]
+    gap_prev = np.diff(total[order], prepend=total[order][0])
+    results = pd.DataFrame({
+        'POSITION': np.arange(1, drivers + 1),
+        'NUMBER': numbers[order],
+        'STATUS': 'Classified',
+        'LAPS': laps,
+        'TOTAL_TIME': [format_lap_time(t) for t in total[order]],
+        'GAP_FIRST': ['-'] + [f"+{g:.3f}" for g in gap_first[1:]],
+        'GAP_PREVIOUS': ['-'] + [f"+{g:.3f}" for g in gap_prev[1:]],
+        'FL_LAPNUM': best_lap[order],
+        'FL_TIME': [format_lap_time(t) for t in best[order]],
+        'FL_KPH': np.round(track["length_miles"] * 1.60934 * 3600 / best[order], 1),
+        'CLASS': 'Am',
+    })
+    _write(results, race_dir / FILE_PATTERNS["results"].format(race_num=race_num))
+
+    # Best 10 laps by driver
+    ranked = np.argsort(times, axis=1)[:, :10]
+    best_laps = {'NUMBER': numbers, 'VEHICLE': 'Toyota GR86', 'CLASS': 'Am',
+                 'TOTAL_DRIVER_LAPS': laps}
+    for rank in range(10):
+        lap_idx = ranked[:, rank]
+        best_laps[f'BESTLAP_{rank + 1}'] = [format_lap_time(t) for t in times[np.arange(drivers), lap_idx]]
+        best_laps[f'BESTLAP_{rank + 1}_LAPNUM'] = lap_idx + 1
+    best_laps['AVERAGE'] = [format_lap_time(t) for t in np.take_along_axis(times, ranked, 1).mean(axis=1)]
+    _write(pd.DataFrame(best_laps), race_dir / FILE_PATTERNS["best_laps"].format(race_num=race_num))
+
+    # Weather, one sample per minute
+    minutes = 45
+    start = int(RACE_START.timestamp()) + (race_num - 1) * 86400
+    weather = pd.DataFrame({
+        'TIME_UTC_SECONDS': start + 60 * np.arange(minutes),
+        'AIR_TEMP': np.round(25 + rng.normal(0, 0.3, minutes), 1),
+        'TRACK_TEMP': np.round(38 + rng.normal(0, 0.5, minutes), 1),
+        'HUMIDITY': np.round(55 + rng.normal(0, 1, minutes), 1),
+        'PRESSURE': np.round(1010 + rng.normal(0, 0.5, minutes), 1),
+        'WIND_SPEED': np.round(np.abs(rng.normal(8, 2, minutes)), 1),
+        'WIND_DIRECTION': rng.integers(0, 360, minutes),
+        'RAIN': 0,
+    })
+    _write(weather, race_dir / FILE_PATTERNS["weather"].format(race_num=race_num))
+
+    # Lap boundaries and telemetry
+    vehicle_ids = [f"GR86-{i:03d}-{n}" for i, n in enumerate(numbers)]
+    start_ms = (RACE_START.value // 10**6) + (race_num - 1) * 86400 * 1000
+    lap_start = start_ms + np.round((cumulative - times) * 1000).astype(np.int64)
+    lap_end = start_ms + np.round(cumulative * 1000).astype(np.int64)
+
+    boundary = {
+        'lap': np.tile(lap_numbers, drivers),
+        'vehicle_id': np.repeat(vehicle_ids, laps),
+        'vehicle_number': np.repeat(numbers, laps),
+        'outing': 0,
+    }
+    for key, stamps, values in [("lap_start", lap_start, ''),
+                                ("lap_end", lap_end, ''),
+                                ("lap_time", lap_end, (times * 1000).astype(int).ravel())]:
+        frame = pd.DataFrame({**boundary,
+                              'timestamp': pd.to_datetime(stamps.ravel(), unit='ms', utc=True)
+                              .strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3] + 'Z',
+                              'value': values})
+        _write(frame, race_dir / FILE_PATTERNS[key].format(track=prefix, race_num=race_num), sep=',')
+
+    _write_telemetry(rng, race_dir / FILE_PATTERNS["telemetry"][0].format(track=prefix, race_num=race_num),
+                     track, race_num, vehicle_ids, numbers, times, lap_start, telemetry_rows * scale)
+
+
+CHANNELS = ['accx_can', 'accy_can', 'vcar', 'gear', 'aps', 'pbrake_f', 'pbrake_r',
+            'steer_ang', 'nmot', 'VBOX_Long_Minutes', 'VBOX_Lat_Min', 'Laptrigger_lapdist_dls']
+
+
+def _write_telemetry(rng, path: Path, track: dict, race_num: int, vehicle_ids, numbers, times,
+                     lap_start, target_rows: int):
+    drivers, laps = times.shape
+    samples = max(20, target_rows // (drivers * laps * len(CHANNELS)))
+    length_m = track["length_miles"] * 1609.34
+    corners = 6 + len(track["name"]) % 6
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = True
+    for d in range(drivers):
+        n = samples * laps
+        phase = np.linspace(0, 1, samples, endpoint=False)
+        dist = np.tile(phase * length_m, laps)
+
+        # Speed peaks on the straights (wave = 1) and dips at each corner
+        wave = np.tile(np.cos(2 * np.pi * corners * phase), laps)
+        slowing = np.tile(np.sin(2 * np.pi * corners * phase), laps) > 0
+        speed = 150 + 50 * wave + rng.normal(0, 1.5, n)
+
+        # Brake (bar) from the end of each straight into the corner, throttle elsewhere
+        braking = slowing & (wave > -0.2)
+        brake = np.where(braking, 20 + 80 * np.clip(wave + 0.2, 0, 1), 0.0)
+        throttle = np.where(braking, 0.0, np.clip(60 + 40 * (1 - np.abs(wave)) + rng.normal(0, 2, n), 0, 100))
+
+        # Longitudinal g: about -1.3 g under full braking, up to +0.4 g on throttle
+        accx = np.where(braking, -1.3 * brake / 100, 0.4 * throttle / 100) + rng.normal(0, 0.03, n)
+        lat = np.tile(1.3 * np.sin(2 * np.pi * corners * phase), laps)
+        values = {
+            'accx_can': accx, 'accy_can': lat, 'vcar': speed,
+            'gear': np.clip(np.round(speed / 40), 1, 6), 'aps': throttle,
+            'pbrake_f': brake, 'pbrake_r': brake * 0.8, 'steer_ang': lat * 60,
+            'nmot': 4000 + speed * 15, 'VBOX_Long_Minutes': -97.6 + dist * 1e-6,
+            'VBOX_Lat_Min': 30.1 + dist * 1e-6, 'Laptrigger_lapdist_dls': dist,
+        }
+        offsets = (np.arange(samples) / samples)[None, :] * times[d][:, None] * 1000
+        stamps = (lap_start[d][:, None] + offsets.astype(np.int64)).ravel()
+        stamp_str = (pd.to_datetime(stamps, unit='ms', utc=True)
+                     .strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3] + 'Z')
+        lap_col = np.repeat(np.arange(1, laps + 1), samples)
+
+        frame = pd.DataFrame({
+            'expire_at': '',
+            'lap': np.tile(lap_col, len(CHANNELS)),
+            'meta_event': 'I_R06_2025-05-03',
+            'meta_session': f'R{race_num}',
+            'meta_source': 'kafka:gr-raw',
+            'meta_time': np.tile(stamp_str, len(CHANNELS)),
+            'original_vehicle_id': vehicle_ids[d],
+            'outing': 0,
+            'telemetry_name': np.repeat(CHANNELS, n),
+            'telemetry_value': np.round(np.concatenate([values[c] for c in CHANNELS]), 3),
+            'timestamp': np.tile(stamp_str, len(CHANNELS)),
+            'vehicle_id': vehicle_ids[d],
+            'vehicle_number': numbers[d],
+        })
+        frame.to_csv(path, mode='w' if header else 'a', header=header, index=False)
+        header = False
+
+
+def generate_season(root: Path, scale: int = 1, telemetry_rows: int = 1_000_000, seed: int = 0):
+    """
+    Write a synthetic season for every track and race
+
+    Args:
+        root: Data root (stands in for DATA_DIR)
+        scale: Multiplier on field size
+        telemetry_rows: Approximate telemetry rows per race at scale 1
+        seed: Random seed
+    """
+    for track_code in TRACKS:
+        for race_num in [1, 2]:
+            generate_race(root, track_code, race_num, scale, telemetry_rows, seed)
+            print(f"  + {track_code} Race {race_num}")
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate a synthetic GR Cup season")
+    parser.add_argument("root", type=Path, help="Data root to write track folders into")
+    parser.add_argument("--scale", type=int, default=1, help="Multiplier on field size")
+    parser.add_argument("--telemetry-rows", type=int, default=1_000_000,
+                        help="Approximate telemetry rows per race at scale 1 (real races hold 8M-18M)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"[SYNTHETIC] Writing season (scale {args.scale}) to {args.root}...")
+    generate_season(args.root, args.scale, args.telemetry_rows, args.seed)
+
+
+if __name__ == "__main__":
+    main()
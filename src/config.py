@@ -8,9 +8,14 @@ from pathlib import Path
 # Project root directory
 PROJECT_ROOT = Path(__file__).parent.parent
 
-# Data directories
-DATA_DIR = PROJECT_ROOT  # Track folders are in project root
-PROCESSED_DATA_DIR = PROJECT_ROOT / "data" / "processed"
+# Data directories (GRCUP_DATA_DIR / GRCUP_PROCESSED_DIR override them, e.g. for benchmarks)
+DATA_DIR = Path(os.environ.get("GRCUP_DATA_DIR", PROJECT_ROOT))  # Track folders are in project root
+PROCESSED_DATA_DIR = Path(os.environ.get("GRCUP_PROCESSED_DIR", PROJECT_ROOT / "data" / "processed"))
+TELEMETRY_STORE_DIR = PROCESSED_DATA_DIR / "telemetry"  # Hive-partitioned Parquet
+TELEMETRY_CACHE_DIR = PROCESSED_DATA_DIR / "telemetry_cache"  # Memory-mapped lap traces
+RESAMPLED_DIR = PROCESSED_DATA_DIR / "resampled"  # Distance-indexed lap traces (npz)
+TELEMETRY_PYRAMID_DIR = PROCESSED_DATA_DIR / "telemetry_pyramid"  # Min/max downsampled levels
+RUN_REPORTS_DIR = PROCESSED_DATA_DIR / "run_reports"  # Per-run stage metrics (JSON)
 
 # Track configurations
 TRACKS = {
@@ -74,11 +79,95 @@ FILE_PATTERNS = {
     "lap_end": "{track}_lap_end_time_R{race_num}.csv"
 }
 
+# Lap start/end/time exports share one layout
+LAP_BOUNDARY_SCHEMA = {
+    "sep": ",",
+    "dtypes": {
+        "lap": "int64",
+        "vehicle_id": "str",
+        "vehicle_number": "int64",
+        "outing": "int64",
+        "timestamp": "str",
+        "value": "float64"
+    }
+}
+
+# Column dtypes of the CSV exports, by FILE_PATTERNS key. Columns are matched
+# after stripping header whitespace; the pyarrow CSV engine reads only these.
+# Nullable Int64 is kept to the small files and to key columns that can be
+# blank: it parses slower than int64, but a blank int64 cell re-reads the file
+CSV_SCHEMAS = {
+    "results": {
+        "sep": ";",
+        "dtypes": {
+            "POSITION": "Int64",
+            "NUMBER": "Int64",
+            "STATUS": "str",
+            "LAPS": "Int64",
+            "TOTAL_TIME": "str",
+            "GAP_FIRST": "str",
+            "GAP_PREVIOUS": "str",
+            "FL_LAPNUM": "Int64",
+            "FL_TIME": "str",
+            "FL_KPH": "float64",
+            "CLASS": "str"
+        }
+    },
+    "lap_analysis": {
+        "sep": ";",
+        "dtypes": {
+            "DRIVER_NUMBER": "Int64",
+            "LAP_NUMBER": "Int64",
+            "LAP_TIME": "str",
+            "LAP_IMPROVEMENT": "str",
+            "S1_SECONDS": "float64",
+            "S2_SECONDS": "float64",
+            "S3_SECONDS": "float64",
+            "TOP_SPEED": "float64",
+            "FLAG_AT_FL": "str",
+            **{f"{split}_{kind}": "str" for split in ["IM1a", "IM1", "IM2a", "IM2", "IM3a", "FL"]
+               for kind in ["time", "elapsed"]}
+        }
+    },
+    "best_laps": {
+        "sep": ";",
+        "dtypes": {
+            "NUMBER": "Int64",
+            **{f"BESTLAP_{n}": "str" for n in range(1, 11)},
+            **{f"BESTLAP_{n}_LAPNUM": "Int64" for n in range(1, 11)},
+            "AVERAGE": "str"
+        }
+    },
+    "weather": {
+        "sep": ";",
+        "dtypes": {
+            "TIME_UTC_SECONDS": "int64",
+            "AIR_TEMP": "float64",
+            "TRACK_TEMP": "float64",
+            "HUMIDITY": "float64",
+            "PRESSURE": "float64",
+            "WIND_SPEED": "float64",
+            "WIND_DIRECTION": "int64",
+            "RAIN": "int64"
+        }
+    },
+    "lap_time": LAP_BOUNDARY_SCHEMA,
+    "lap_start": LAP_BOUNDARY_SCHEMA,
+    "lap_end": LAP_BOUNDARY_SCHEMA
+}
+
+# CSV parsers for the timing exports: pandas' C parser (every column) or the
+# multithreaded Arrow parser (schema columns only)
+CSV_ENGINES = ["pandas", "pyarrow"]
+
 # Database configuration
 DATABASE_PATH = PROCESSED_DATA_DIR / "driver_stats.db"
 
 # Data processing parameters
 TELEMETRY_SAMPLE_RATE = 100  # Hz
+TELEMETRY_CHUNK_ROWS = 1_000_000  # Rows per chunk when streaming telemetry CSVs
+RESAMPLE_STEP_M = 5.0  # Distance grid step (metres) for resampled lap traces
+PYRAMID_FACTORS = [4, 16, 64]  # Samples per min/max bucket at each downsampled level
 LAP_AGGREGATION_METRICS = [
     "speed_max",
     "speed_avg",
@@ -75,7 +75,11 @@ def create_tables(conn: duckdb.DuckDBPyConnection):
             fastest_lap_num INTEGER,
             fastest_lap_time VARCHAR,
             fastest_lap_kph DOUBLE,
-            class VARCHAR
+            class VARCHAR,
+            total_time_seconds DOUBLE,
+            gap_first_seconds DOUBLE,
+            gap_previous_seconds DOUBLE,
+            fastest_lap_time_seconds DOUBLE
         )
     """)
 
@@ -162,6 +166,96 @@ def create_tables(conn: duckdb.DuckDBPyConnection):
                     )
     """)
 
+    # Best laps per driver in long format (one numeric row per ranked lap)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS best_laps_long (
+            id INTEGER PRIMARY KEY,
+            track_code VARCHAR,
+            race_num INTEGER,
+            driver_number INTEGER,
+            rank INTEGER,
+            lap_number INTEGER,
+            lap_time_seconds DOUBLE
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_best_laps_long_driver
+        ON best_laps_long (driver_number, lap_time_seconds)
+    """)
+
+    # Intermediate timing splits (one row per lap and timing point)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS lap_splits (
+            id INTEGER PRIMARY KEY,
+            track_code VARCHAR,
+            race_num INTEGER,
+            driver_number INTEGER,
+            lap_number INTEGER,
+            split_index INTEGER,
+            split_name VARCHAR,
+            split_seconds DOUBLE,
+            elapsed_seconds DOUBLE
+        )
+    """)
+
+    # Best and median time per (track, split)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS split_stats (
+            track_code VARCHAR,
+            split_index INTEGER,
+            split_name VARCHAR,
+            best_seconds DOUBLE,
+            best_driver INTEGER,
+            median_seconds DOUBLE,
+            total_laps INTEGER,
+            PRIMARY KEY (track_code, split_index)
+        )
+    """)
+
+    # Lap time windows from the lap start/end/time exports
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS lap_boundaries (
+            id INTEGER PRIMARY KEY,
+            track_code VARCHAR,
+            race_num INTEGER,
+            vehicle_id VARCHAR,
+            driver_number INTEGER,
+            lap_number INTEGER,
+            start_time TIMESTAMP,
+            end_time TIMESTAMP,
+            lap_time_seconds DOUBLE
+        )
+    """)
+
+    # Brake zone and corner events per lap, from the pivoted telemetry
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS corner_events (
+            id INTEGER PRIMARY KEY,
+            track_code VARCHAR,
+            race_num INTEGER,
+            vehicle_id VARCHAR,
+            driver_number INTEGER,
+            lap_number INTEGER,
+            corner_id INTEGER,
+            corner_distance_m DOUBLE,
+            brake_start_m DOUBLE,
+            brake_speed DOUBLE,
+            peak_brake_bar DOUBLE,
+            apex_m DOUBLE,
+            apex_speed DOUBLE,
+            peak_lateral_g DOUBLE,
+            exit_speed DOUBLE,
+            exit_throttle DOUBLE,
+            corner_seconds DOUBLE,
+            brake_release_seconds DOUBLE,
+            throttle_pickup_seconds DOUBLE
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_corner_events_key
+        ON corner_events (track_code, race_num, driver_number, lap_number, corner_id)
+    """)
+
     # Driver statistics (computed metrics for Phase 1)
     conn.execute("""
         CREATE TABLE IF NOT EXISTS driver_stats (
@@ -193,9 +287,97 @@ def create_tables(conn: duckdb.DuckDBPyConnection):
                     )
     """)
 
+    # Mergeable per-race partial aggregates behind drivers, driver_stats and track_stats
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS driver_race_partials (
+            track_code VARCHAR,
+            race_num INTEGER,
+            driver_number INTEGER,
+            result_rows INTEGER,
+            position_count INTEGER,
+            position_sum BIGINT,
+            position_min INTEGER,
+            race_laps BIGINT,
+            podiums INTEGER,
+            lap_count INTEGER,
+            lap_time_sum DOUBLE,
+            lap_time_sumsq DOUBLE,
+            lap_time_min DOUBLE
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_driver_race_partials_key
+        ON driver_race_partials (track_code, race_num, driver_number)
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS track_race_partials (
+            track_code VARCHAR,
+            race_num INTEGER,
+            lap_count INTEGER,
+            lap_time_sum DOUBLE,
+            lap_time_min DOUBLE,
+            lap_time_min_driver INTEGER,
+            top_speed_max DOUBLE,
+            PRIMARY KEY (track_code, race_num)
+        )
+    """)
+
+    # Source file manifest (drives incremental ingestion)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ingest_manifest (
+            file_path VARCHAR PRIMARY KEY,
+            track_code VARCHAR,
+            race_num INTEGER,
+            file_type VARCHAR,
+            file_size BIGINT,
+            file_mtime DOUBLE,
+            content_hash VARCHAR,
+            ingested_at TIMESTAMP
+        )
+    """)
+
+    # Per-stage metrics of every pipeline run
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pipeline_runs (
+            run_id VARCHAR,
+            stage VARCHAR,
+            started_at TIMESTAMP,
+            wall_seconds DOUBLE,
+            cpu_seconds DOUBLE,
+            rows_in BIGINT,
+            rows_out BIGINT,
+            bytes_read BIGINT,
+            peak_rss_mb DOUBLE,
+            status VARCHAR
+        )
+    """)
+
+    migrate_tables(conn)
+
     print("[OK] Database schema created successfully")
 
 
+# Columns added after the first release, as (table, column, type).
+# New columns are always appended so INSERT ... SELECT * keeps its column order.
+ADDED_COLUMNS = [
+    ("race_results", "total_time_seconds", "DOUBLE"),
+    ("race_results", "gap_first_seconds", "DOUBLE"),
+    ("race_results", "gap_previous_seconds", "DOUBLE"),
+    ("race_results", "fastest_lap_time_seconds", "DOUBLE"),
+]
+
+
+def migrate_tables(conn: duckdb.DuckDBPyConnection):
+    """
+    Bring tables created by an older schema up to date
+
+    Args:
+        conn: DuckDB connection
+    """
+    for table, column, column_type in ADDED_COLUMNS:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {column_type}")
+
+
 def get_connection(db_path: Path) -> duckdb.DuckDBPyConnection:
     """
     Get a connection to an existing database
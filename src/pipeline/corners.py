@@ -0,0 +1,253 @@
+"""
+Vectorized brake-zone and corner detection for GR Cup Data Pipeline
+
+A corner is a run of samples with lateral acceleration above
+CORNER_LATERAL_G in one direction; a brake zone is a run of front brake
+pressure above BRAKE_ON_BAR. Runs are found for a whole race at once with
+edge detection on the pivoted arrays (a run starts wherever the state
+changes or a new lap begins), and per-run minima and maxima come from
+ufunc.reduceat, so no Python loop touches individual samples.
+
+Corner apexes from every lap are then clustered by lap distance, so the
+same physical corner gets the same corner_id for every driver and lap of
+the race. A cluster never spans more than CORNER_MERGE_M from its first
+apex, so scatter across many laps cannot chain neighbouring corners
+(chicanes, esses) into one.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline.telemetry import driver_number_from_vehicle_id
+from src.pipeline.telemetry_cache import race_lap_samples
+
+
+# Column order of the corner_events table (without id)
+CORNER_EVENT_COLUMNS = [
+    'track_code', 'race_num', 'vehicle_id', 'driver_number', 'lap_number', 'corner_id',
+    'corner_distance_m', 'brake_start_m', 'brake_speed', 'peak_brake_bar',
+    'apex_m', 'apex_speed', 'peak_lateral_g', 'exit_speed', 'exit_throttle', 'corner_seconds',
+    'brake_release_seconds', 'throttle_pickup_seconds'
+]
+
+CORNER_CHANNELS = ['pbrake_f', 'vcar', 'accy_can', 'aps', 'Laptrigger_lapdist_dls']
+
+CORNER_LATERAL_G = 0.5  # |accy_can| above this is cornering
+BRAKE_ON_BAR = 5.0  # pbrake_f above this is braking
+FULL_THROTTLE = 90.0  # aps at or above this is full throttle
+CORNER_MIN_SECONDS = 0.3  # Shorter lateral runs are kerb strikes or noise
+CORNER_MERGE_M = 50.0  # A corner's apexes lie within this distance of its first one
+MIN_CORNER_SHARE = 0.3  # A corner must be seen on this share of laps
+
+
+def find_runs(state: np.ndarray, lap_index: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Runs of equal, non-zero state that never cross a lap boundary
+
+    Args:
+        state: Integer state of every sample (0 = outside any run)
+        lap_index: Lap row of every sample (samples grouped by lap)
+
+    Returns:
+        Tuple of (start, end) sample positions of every run, end exclusive
+    """
+    if not len(state):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    edge = np.r_[True, (state[1:] != state[:-1]) | (lap_index[1:] != lap_index[:-1])]
+    bounds = np.r_[np.flatnonzero(edge), len(state)]
+    starts, ends = bounds[:-1], bounds[1:]
+
+    active = state[starts] != 0
+    return starts[active], ends[active]
+
+
+def _run_reduce(ufunc: np.ufunc, values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """ufunc.reduceat over [start, end) runs (runs must not overlap)"""
+    if not len(starts):
+        return np.zeros(0, dtype=values.dtype)
+    # Interleave starts and ends; even slots reduce each run, odd ones the gaps between
+    bounds = np.column_stack([starts, ends]).ravel()
+    padded = np.r_[values, values[-1:]]
+    return ufunc.reduceat(padded, bounds)[::2]
+
+
+def _following(ends: np.ndarray, lap_index: np.ndarray) -> np.ndarray:
+    """Sample after each run in the same lap, or the run's own last sample"""
+    last = ends - 1
+    after = np.clip(ends, 0, len(lap_index) - 1)
+    return np.where((ends < len(lap_index)) & (lap_index[after] == lap_index[last]), ends, last)
+
+
+def _run_argmin(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Position of the first minimum of every run (-1 for all-NaN runs)"""
+    minimum = _run_reduce(np.fmin, values, starts, ends)
+    run_id = np.full(len(values), -1)
+    run_id[starts] = np.arange(len(starts))
+    # Carry each run id forward to the run's end, then clear the gaps
+    run_id = np.maximum.accumulate(run_id)
+    inside = np.zeros(len(values) + 1, dtype=np.int64)
+    np.add.at(inside, starts, 1)
+    np.add.at(inside, ends, -1)
+    run_id[np.cumsum(inside[:-1]) == 0] = -1
+
+    candidate = (run_id >= 0) & (values == minimum[np.clip(run_id, 0, None)])
+    first = np.full(len(starts), len(values))
+    np.minimum.at(first, run_id[candidate], np.flatnonzero(candidate))
+    return np.where(first < len(values), first, -1)
+
+
+def detect_corners(lap_index: np.ndarray, time_ms: np.ndarray, channels: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Find every corner and the brake zone leading into it
+
+    The brake zone of a corner is the last braking run that starts after
+    the previous corner's apex (or the lap start) and before this apex.
+
+    Args:
+        lap_index: Lap row of every sample (samples grouped by lap, in time order)
+        time_ms: Epoch milliseconds of every sample
+        channels: CORNER_CHANNELS -> per-sample values
+
+    Returns:
+        DataFrame with one row per corner: lap_row, apex_m, brake_start_m,
+        brake_speed, peak_brake_bar, apex_speed, peak_lateral_g, exit_speed,
+        exit_throttle, corner_seconds, brake_release_seconds,
+        throttle_pickup_seconds
+    """
+    lap_index = np.asarray(lap_index, dtype=np.int64)
+    time_ms = np.asarray(time_ms, dtype=np.int64)
+    brake = np.asarray(channels['pbrake_f'], dtype=np.float64)
+    speed = np.asarray(channels['vcar'], dtype=np.float64)
+    lateral = np.asarray(channels['accy_can'], dtype=np.float64)
+    throttle = np.asarray(channels['aps'], dtype=np.float64)
+    distance = np.asarray(channels['Laptrigger_lapdist_dls'], dtype=np.float64)
+
+    # Left and right turns are separate runs even when they follow each other
+    cornering = np.where(np.abs(lateral) >= CORNER_LATERAL_G, np.sign(lateral), 0).astype(np.int8)
+    starts, ends = find_runs(cornering, lap_index)
+
+    # A run lasts until the next sample of the same lap (or its own last sample)
+    last = ends - 1
+    seconds = (time_ms[_following(ends, lap_index)] - time_ms[starts]) / 1000.0 if len(starts) else np.zeros(0)
+    long_enough = seconds >= CORNER_MIN_SECONDS
+    starts, ends, last, seconds = starts[long_enough], ends[long_enough], last[long_enough], seconds[long_enough]
+
+    apex = _run_argmin(speed, starts, ends)
+    found = apex >= 0
+    starts, ends, last, seconds, apex = starts[found], ends[found], last[found], seconds[found], apex[found]
+    corner_lap = lap_index[apex]
+
+    # Brake zones: last one starting between the previous apex of the lap and this apex
+    brake_starts, brake_ends = find_runs((brake >= BRAKE_ON_BAR).astype(np.int8), lap_index)
+    zone = np.searchsorted(brake_starts, apex, side='right') - 1
+    safe_zone = np.clip(zone, 0, None)
+    previous_apex = np.r_[-1, apex[:-1]]
+    previous_apex = np.where(np.r_[False, corner_lap[1:] == corner_lap[:-1]], previous_apex, -1)
+    has_brake = (zone >= 0) & (len(brake_starts) > 0)
+    if len(brake_starts):
+        has_brake &= (lap_index[brake_starts[safe_zone]] == corner_lap) & (brake_starts[safe_zone] > previous_apex)
+    peak_brake = _run_reduce(np.fmax, brake, brake_starts, brake_ends)
+
+    # Release: from peak pressure until the brakes are off; a long, progressive release is trail braking
+    release_seconds = np.zeros(0)
+    if len(brake_starts):
+        peak_at = _run_argmin(-brake, brake_starts, brake_ends)
+        release_seconds = (time_ms[_following(brake_ends, lap_index)] - time_ms[peak_at]) / 1000.0
+
+    # Pickup: from the apex to the first full-throttle sample of the same lap
+    full = np.flatnonzero(throttle >= FULL_THROTTLE)
+    pickup_seconds = np.full(len(apex), np.nan)
+    if len(full):
+        pickup = full[np.clip(np.searchsorted(full, apex), 0, len(full) - 1)]
+        reached = (pickup >= apex) & (lap_index[pickup] == corner_lap)
+        pickup_seconds[reached] = (time_ms[pickup[reached]] - time_ms[apex[reached]]) / 1000.0
+
+    def at_brake(values: np.ndarray) -> np.ndarray:
+        if not len(brake_starts):
+            return np.full(len(apex), np.nan)
+        return np.where(has_brake, values[safe_zone], np.nan)
+
+    return pd.DataFrame({
+        'lap_row': corner_lap,
+        'apex_m': distance[apex],
+        'brake_start_m': at_brake(distance[brake_starts]),
+        'brake_speed': at_brake(speed[brake_starts]),
+        'peak_brake_bar': at_brake(peak_brake),
+        'apex_speed': speed[apex],
+        'peak_lateral_g': _run_reduce(np.fmax, np.abs(lateral), starts, ends),
+        'exit_speed': speed[last],
+        'exit_throttle': throttle[last],
+        'corner_seconds': seconds,
+        'brake_release_seconds': at_brake(release_seconds),
+        'throttle_pickup_seconds': pickup_seconds
+    })
+
+
+def _cluster_by_width(positions: np.ndarray, width: float) -> np.ndarray:
+    """Cluster of every sorted position; each cluster spans at most width from its first"""
+    cluster = np.zeros(len(positions), dtype=np.int64)
+    start, k = 0, 0
+    # One binary search per cluster, not per position
+    while start < len(positions):
+        end = np.searchsorted(positions, positions[start] + width, side='right')
+        cluster[start:end] = k
+        start, k = end, k + 1
+    return cluster
+
+
+def assign_corner_ids(events: pd.DataFrame, n_laps: int) -> pd.DataFrame:
+    """
+    Cluster apexes by lap distance and number the corners in lap order
+
+    Clusters seen on fewer than MIN_CORNER_SHARE of laps are dropped, and a
+    lap keeps only its strongest (highest lateral G) event per corner.
+
+    Args:
+        events: Output of detect_corners()
+        n_laps: Number of laps the events were detected on
+
+    Returns:
+        events with corner_id and corner_distance_m added
+    """
+    events = events[events['apex_m'].notna()].sort_values('apex_m').reset_index(drop=True)
+    if events.empty:
+        return events.assign(corner_id=pd.Series(dtype=int), corner_distance_m=pd.Series(dtype=float))
+
+    events['cluster'] = _cluster_by_width(events['apex_m'].to_numpy(), CORNER_MERGE_M)
+    support = events.groupby('cluster')['lap_row'].nunique()
+    kept = support.index[support >= max(1, MIN_CORNER_SHARE * n_laps)]
+
+    events = events[events['cluster'].isin(kept)]
+    events['corner_id'] = events['cluster'].map(pd.Series(np.arange(1, len(kept) + 1), index=kept))
+    events['corner_distance_m'] = events.groupby('cluster')['apex_m'].transform('median')
+
+    events = events.sort_values(['lap_row', 'corner_id', 'peak_lateral_g'], ascending=[True, True, False])
+    return events.drop_duplicates(['lap_row', 'corner_id']).drop(columns='cluster')
+
+
+def race_corner_events(track_code: str, race_num: int) -> pd.DataFrame:
+    """
+    Detect the corner events of every lap of a race
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+
+    Returns:
+        DataFrame with CORNER_EVENT_COLUMNS
+    """
+    laps, lap_index, time_ms, channels = race_lap_samples(track_code, race_num, CORNER_CHANNELS)
+    events = assign_corner_ids(detect_corners(lap_index, time_ms, channels), len(laps))
+
+    lap_rows = laps.iloc[events['lap_row'].to_numpy()]
+    events['track_code'] = track_code
+    events['race_num'] = race_num
+    events['vehicle_id'] = lap_rows['vehicle_id'].astype(str).to_numpy()
+    events['driver_number'] = driver_number_from_vehicle_id(events['vehicle_id']).to_numpy()
+    events['lap_number'] = lap_rows['lap'].to_numpy()
+
+    events = events.sort_values(['vehicle_id', 'lap_number', 'corner_id'])
+    return events[CORNER_EVENT_COLUMNS].reset_index(drop=True)
@@ -6,6 +6,8 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple
 
+from src.config import TRACKS
+
 
 class DataQualityReport:
     """Track data quality metrics during ingestion"""
@@ -78,6 +80,50 @@ class DataQualityReport:
 quality_report = DataQualityReport()
 
 
+# Plausible average-speed band (mph) used to derive lap time ranges from track length
+LAP_SPEED_RANGE_MPH = (40, 100)
+
+# Fallback range for track codes not in TRACKS
+DEFAULT_LAP_TIME_RANGE = (60, 300)
+
+# Track-specific reasonable lap time ranges (based on track length and expected speeds)
+LAP_TIME_RANGE_OVERRIDES = {
+    'BMP': (140, 200),    # Barber: 2.38 miles, technical
+    'COTA': (145, 210),   # COTA: 3.41 miles, fast
+    'RA': (130, 200),     # Road America: 4.05 miles, very fast
+    'SEB': (140, 220),    # Sebring: 3.74 miles, bumpy
+    'SON': (90, 160),     # Sonoma: 2.52 miles, technical
+    'VIR': (100, 180)     # VIR: 3.27 miles, flowing
+}
+
+
+def build_lap_time_ranges(tracks: Dict = TRACKS,
+                          overrides: Dict[str, Tuple[float, float]] = LAP_TIME_RANGE_OVERRIDES) -> Dict[str, Tuple[float, float]]:
+    """
+    Build the (min, max) lap time lookup for every track
+
+    Ranges are derived from each track's length and LAP_SPEED_RANGE_MPH,
+    then replaced by any per-track override.
+
+    Args:
+        tracks: Track configuration (defaults to TRACKS)
+        overrides: Explicit ranges that take precedence
+
+    Returns:
+        Dictionary of track_code -> (min_seconds, max_seconds)
+    """
+    min_mph, max_mph = LAP_SPEED_RANGE_MPH
+    ranges = {
+        track_code: (info['length_miles'] * 3600 / max_mph, info['length_miles'] * 3600 / min_mph)
+        for track_code, info in tracks.items()
+    }
+    ranges.update(overrides)
+    return ranges
+
+
+LAP_TIME_RANGES = build_lap_time_ranges()
+
+
 def validate_lap_time(lap_time_seconds: float, track_code: str) -> bool:
     """
     Check if lap time is reasonable for the track
@@ -92,76 +138,117 @@ def validate_lap_time(lap_time_seconds: float, track_code: str) -> bool:
     if pd.isna(lap_time_seconds):
         return False
 
-    # Track-specific reasonable lap time ranges (based on track length and expected speeds)
-    track_ranges = {
-        'BMP': (140, 200),    # Barber: 2.38 miles, technical
-        'COTA': (145, 210),   # COTA: 3.41 miles, fast
-        'RA': (130, 200),     # Road America: 4.05 miles, very fast
-        'SEB': (140, 220),    # Sebring: 3.74 miles, bumpy
-        'SON': (90, 160),     # Sonoma: 2.52 miles, technical
-        'VIR': (100, 180)     # VIR: 3.27 miles, flowing
-    }
-
-    min_time, max_time = track_ranges.get(track_code, (60, 300))
+    min_time, max_time = LAP_TIME_RANGES.get(track_code, DEFAULT_LAP_TIME_RANGE)
     return min_time <= lap_time_seconds <= max_time
 
 
-def clean_lap_times(df: pd.DataFrame, track_code: str) -> Tuple[pd.DataFrame, Dict]:
+def lap_time_bounds(track_codes: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Clean lap times data and remove outliers
+    Look up (min, max) lap times for a whole column of track codes
 
     Args:
-        df: DataFrame with lap times
-        track_code: Track identifier
+        track_codes: Track identifier per row
 
     Returns:
-        Tuple of (cleaned DataFrame, stats dict)
+        Tuple of (min seconds array, max seconds array)
+    """
+    track_codes = pd.Series(track_codes)
+    min_times = track_codes.map({k: v[0] for k, v in LAP_TIME_RANGES.items()})
+    max_times = track_codes.map({k: v[1] for k, v in LAP_TIME_RANGES.items()})
+
+    return (
+        min_times.astype(float).fillna(DEFAULT_LAP_TIME_RANGE[0]).to_numpy(),
+        max_times.astype(float).fillna(DEFAULT_LAP_TIME_RANGE[1]).to_numpy()
+    )
+
+
+def validate_lap_times(lap_times: pd.Series, track_codes: pd.Series) -> np.ndarray:
+    """
+    Check a whole multi-track column of lap times in one vectorized pass
+
+    Args:
+        lap_times: Lap times in seconds
+        track_codes: Track identifier for each lap (aligned with lap_times)
+
+    Returns:
+        Boolean array, True where the lap time is within its track's range
+    """
+    min_times, max_times = lap_time_bounds(track_codes)
+    values = pd.to_numeric(pd.Series(lap_times), errors='coerce').to_numpy(dtype=float)
+
+    return (values >= min_times) & (values <= max_times)
+
+
+def check_lap_times(df: pd.DataFrame, track_code: str = None) -> Dict:
     """
+    Record lap time quality issues without modifying the data
+
+    Args:
+        df: DataFrame with lap_time_seconds (and track_code unless given)
+        track_code: Track identifier to use when df has no track_code column
+
+    Returns:
+        Stats dict with per-track outlier counts and the valid row mask
+    """
+    track_codes = df['track_code'] if 'track_code' in df.columns else pd.Series(track_code, index=df.index)
+    lap_times = df['lap_time_seconds']
+
+    values = pd.to_numeric(lap_times, errors='coerce').to_numpy(dtype=float)
+    min_times, max_times = lap_time_bounds(track_codes)
+
+    null_mask = np.isnan(values)
+    negative_mask = values <= 0
+    checked = ~null_mask & ~negative_mask
+    fast_mask = checked & (values < min_times)
+    slow_mask = checked & (values > max_times)
+    outlier_mask = fast_mask | slow_mask
+
     stats = {
         'total_laps': len(df),
-        'null_laps': 0,
-        'outliers_removed': 0,
-        'negative_times': 0,
-        'extremely_slow': 0,
-        'extremely_fast': 0
+        'null_laps': int(null_mask.sum()),
+        'outliers_removed': int(outlier_mask.sum()),
+        'negative_times': int(negative_mask.sum()),
+        'extremely_slow': int(slow_mask.sum()),
+        'extremely_fast': int(fast_mask.sum()),
+        'outliers_by_track': track_codes[outlier_mask].value_counts().to_dict(),
+        'negative_by_track': track_codes[negative_mask].value_counts().to_dict(),
+        'valid_mask': checked & ~outlier_mask
     }
 
-    # Check for nulls
-    stats['null_laps'] = df['lap_time_seconds'].isna().sum()
     quality_report.add_nulls('lap_times', 'lap_time_seconds', stats['null_laps'])
 
-    # Remove null lap times
-    df_clean = df[df['lap_time_seconds'].notna()].copy()
+    # Log outliers removed
+    for track, count in sorted(stats['outliers_by_track'].items()):
+        if count == 0:
+            continue
+        quality_report.add_outliers('lap_times', f'{track} invalid lap times', count)
 
-    # Remove negative or zero times (data errors)
-    negative_mask = df_clean['lap_time_seconds'] <= 0
-    stats['negative_times'] = negative_mask.sum()
-    df_clean = df_clean[~negative_mask]
+    for track, count in sorted(stats['negative_by_track'].items()):
+        if count == 0:
+            continue
+        quality_report.add_invalid('lap_times', f'{track} negative/zero times', count)
 
-    # Track-specific outlier detection
-    valid_mask = df_clean['lap_time_seconds'].apply(
-        lambda x: validate_lap_time(x, track_code)
-    )
+    return stats
 
-    stats['outliers_removed'] = (~valid_mask).sum()
-    df_clean = df_clean[valid_mask]
 
-    # Log outliers removed
-    if stats['outliers_removed'] > 0:
-        quality_report.add_outliers(
-            'lap_times',
-            f'{track_code} invalid lap times',
-            stats['outliers_removed']
-        )
+def clean_lap_times(df: pd.DataFrame, track_code: str = None) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Clean lap times data and remove outliers
 
-    if stats['negative_times'] > 0:
-        quality_report.add_invalid(
-            'lap_times',
-            f'{track_code} negative/zero times',
-            stats['negative_times']
-        )
+    Works on a single track (track_code given) or on a multi-track frame
+    with a track_code column.
 
-    return df_clean, stats
+    Args:
+        df: DataFrame with lap times
+        track_code: Track identifier (optional when df has a track_code column)
+
+    Returns:
+        Tuple of (cleaned DataFrame, stats dict)
+    """
+    stats = check_lap_times(df, track_code)
+    valid_mask = stats.pop('valid_mask')
+
+    return df[valid_mask].copy(), stats
 
 
 def clean_race_results(df: pd.DataFrame, track_code: str, race_num: int) -> Tuple[pd.DataFrame, Dict]:
@@ -0,0 +1,310 @@
+"""
+Multi-resolution min/max telemetry pyramid for GR Cup Data Pipeline
+
+A 100 Hz lap is tens of thousands of points per channel, far more than a
+chart can draw. Each cached race gets downsampled levels in which every
+bucket of PYRAMID_FACTORS[i] samples keeps its minimum and maximum, so
+spikes such as brake pressure peaks survive at every zoom level:
+
+    TELEMETRY_PYRAMID_DIR/COTA/R1/
+        meta.json              factors, channels, laps, cache source signature
+        L4/time_ms.bin         int64 time of each bucket's first sample
+        L4/vcar.min.bin, ...   float32
+        L4/vcar.max.bin
+        L16/..., L64/...
+
+Buckets never straddle two laps, and each level is reduced from the one
+below it. TelemetryPyramid.window() picks the finest level that fits the
+requested pixel width, so a chart gets at most two points per pixel
+whether the window is one lap or a whole stint.
+"""
+
+import json
+import shutil
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import TELEMETRY_PYRAMID_DIR, PYRAMID_FACTORS
+from src.utils import RaceBundle
+from src.pipeline.telemetry_cache import (
+    CHANNEL_DTYPE, TIME_DTYPE, build_cache, has_cache, open_cache
+)
+
+
+DEFAULT_WIDTH_PX = 1000
+
+
+def pyramid_race_path(track_code: str, race_num: int) -> Path:
+    """Directory holding one race's downsampled levels"""
+    return TELEMETRY_PYRAMID_DIR / track_code / f"R{race_num}"
+
+
+def has_pyramid(track_code: str, race_num: int) -> bool:
+    """
+    Check whether a race's pyramid exists and matches its lap cache
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+
+    Returns:
+        True if the pyramid and the cache it was built from are up to date
+    """
+    meta_path = pyramid_race_path(track_code, race_num) / "meta.json"
+    if not meta_path.exists() or not has_cache(track_code, race_num):
+        return False
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    return meta.get('source') == open_cache(track_code, race_num).meta.get('source')
+
+
+def _bucket_starts(first: np.ndarray, lengths: np.ndarray, ratio: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Start of every ratio-sized bucket within each lap, and the bucket count of each lap"""
+    counts = -(-lengths // ratio)
+    within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(first, counts) + within * ratio, counts
+
+
+def _level_counts(lengths: np.ndarray, factors: List[int]) -> Dict[int, np.ndarray]:
+    """Samples (factor 1) or buckets per lap at every level"""
+    counts = {1: lengths}
+    for factor in factors:
+        counts[factor] = -(-lengths // factor)
+    return counts
+
+
+def build_pyramid(track_code: str, race_num: int, factors: Optional[List[int]] = None) -> int:
+    """
+    Build the min/max pyramid for one race from its lap cache
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+        factors: Samples per bucket at each level (defaults to PYRAMID_FACTORS);
+            each must divide the next
+
+    Returns:
+        Number of levels written
+    """
+    factors = sorted(factors or PYRAMID_FACTORS)
+    cache = open_cache(track_code, race_num)
+
+    laps = cache.laps().sort_values('start').reset_index(drop=True)
+    first = laps['start'].to_numpy(dtype=np.int64)
+    lengths = (laps['stop'] - laps['start']).to_numpy(dtype=np.int64)
+
+    race_path = pyramid_race_path(track_code, race_num)
+    staging = race_path.parent / f"_staging_R{race_num}"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    time_ms = cache.channel('time_ms')
+    mins = {name: cache.channel(name) for name in cache.channels}
+    maxs = dict(mins)
+    previous = 1
+
+    for factor in factors:
+        if factor % previous:
+            raise ValueError(f"Pyramid factor {factor} is not a multiple of {previous}")
+
+        # Each level is reduced from the one below: min of mins, max of maxes
+        starts, lengths = _bucket_starts(first, lengths, factor // previous)
+        first = np.cumsum(lengths) - lengths
+        previous = factor
+
+        level_path = staging / f"L{factor}"
+        level_path.mkdir()
+        time_ms = time_ms[starts]
+        time_ms.astype(TIME_DTYPE).tofile(level_path / "time_ms.bin")
+
+        for name in cache.channels:
+            if len(starts):
+                mins[name] = np.fmin.reduceat(mins[name], starts)
+                maxs[name] = np.fmax.reduceat(maxs[name], starts)
+            else:
+                mins[name] = maxs[name] = np.empty(0, dtype=CHANNEL_DTYPE)
+            mins[name].astype(CHANNEL_DTYPE).tofile(level_path / f"{name}.min.bin")
+            maxs[name].astype(CHANNEL_DTYPE).tofile(level_path / f"{name}.max.bin")
+
+    with open(staging / "meta.json", 'w') as f:
+        json.dump({
+            'factors': factors,
+            'channels': cache.channels,
+            'laps': laps[['vehicle_id', 'lap', 'start', 'stop']].values.tolist(),
+            'channel_dtype': np.dtype(CHANNEL_DTYPE).str,
+            'time_dtype': np.dtype(TIME_DTYPE).str,
+            'source': cache.meta.get('source')
+        }, f)
+
+    shutil.rmtree(race_path, ignore_errors=True)
+    staging.rename(race_path)
+
+    return len(factors)
+
+
+@dataclass
+class TraceWindow:
+    """
+    Chart-ready points for one channel
+
+    At factor 1 these are the raw samples; above it every bucket of factor
+    samples contributes its minimum and maximum at the bucket's start time.
+    """
+    time_ms: np.ndarray
+    values: np.ndarray
+    factor: int
+
+    def __len__(self) -> int:
+        return len(self.time_ms)
+
+
+class TelemetryPyramid:
+    """Read-only, memory-mapped view of one race's downsampled levels"""
+
+    def __init__(self, track_code: str, race_num: int):
+        self.track_code = track_code
+        self.race_num = race_num
+        self.path = pyramid_race_path(track_code, race_num)
+
+        meta_path = self.path / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"No telemetry pyramid for {track_code} Race {race_num}")
+
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+
+        self.factors = self.meta['factors']
+        self.channels = self.meta['channels']
+        self.laps = pd.DataFrame(self.meta['laps'], columns=['vehicle_id', 'lap', 'start', 'stop'])
+
+        # Offset of each lap's first sample or bucket at every level (laps are contiguous)
+        lengths = (self.laps['stop'] - self.laps['start']).to_numpy(dtype=np.int64)
+        self._offsets = {
+            factor: np.r_[0, np.cumsum(counts)]
+            for factor, counts in _level_counts(lengths, self.factors).items()
+        }
+        self._offsets[1] += int(self.laps['start'].iloc[0]) if len(self.laps) else 0
+        self._arrays: Dict[Tuple[int, str], np.ndarray] = {}
+
+    def _array(self, factor: int, name: str) -> np.ndarray:
+        key = (factor, name)
+        if key not in self._arrays:
+            dtype = self.meta['time_dtype'] if name == 'time_ms' else self.meta['channel_dtype']
+            file_path = self.path / f"L{factor}" / f"{name}.bin"
+            size = file_path.stat().st_size // np.dtype(dtype).itemsize
+            self._arrays[key] = np.memmap(file_path, dtype=dtype, mode='r', shape=(size,)) \
+                if size else np.empty(0, dtype=dtype)
+        return self._arrays[key]
+
+    def window(self, vehicle_id: str, channel: str, lap_from: Optional[int] = None,
+               lap_to: Optional[int] = None, width_px: int = DEFAULT_WIDTH_PX) -> TraceWindow:
+        """
+        Get one channel for a run of laps at a resolution that fits the chart
+
+        Uses the raw samples when they fit in two points per pixel, else the
+        finest level that does. Windows too long even for the coarsest level
+        are merged further on the fly, so the result never exceeds
+        2 * width_px points.
+
+        Args:
+            vehicle_id: Vehicle identifier (e.g. 'GR86-004-78')
+            channel: Channel name
+            lap_from: First lap (the vehicle's first lap if None)
+            lap_to: Last lap, inclusive (lap_from, or the last lap if both are None)
+            width_px: Chart width in pixels
+
+        Returns:
+            TraceWindow with time-ordered points
+        """
+        if channel not in self.channels:
+            raise KeyError(f"Channel {channel} is not in the pyramid")
+
+        laps = self.laps['lap'].to_numpy()
+        selected = self.laps['vehicle_id'].to_numpy() == vehicle_id
+        if lap_from is not None:
+            selected &= laps >= lap_from
+            selected &= laps <= (lap_to if lap_to is not None else lap_from)
+        elif lap_to is not None:
+            selected &= laps <= lap_to
+
+        rows = np.flatnonzero(selected)
+        if not len(rows):
+            raise KeyError(f"No telemetry for vehicle {vehicle_id} laps {lap_from}-{lap_to}")
+        first, last = rows.min(), rows.max() + 1
+
+        max_points = 2 * width_px
+        start, stop = self._offsets[1][first], self._offsets[1][last]
+        if stop - start <= max_points or not self.factors:
+            cache = open_cache(self.track_code, self.race_num)
+            return TraceWindow(np.asarray(cache.channel('time_ms')[start:stop]),
+                               np.asarray(cache.channel(channel)[start:stop]), 1)
+
+        for factor in self.factors:
+            start, stop = self._offsets[factor][first], self._offsets[factor][last]
+            if 2 * (stop - start) <= max_points:
+                break
+
+        time_ms = np.asarray(self._array(factor, 'time_ms')[start:stop])
+        low = np.asarray(self._array(factor, f"{channel}.min")[start:stop])
+        high = np.asarray(self._array(factor, f"{channel}.max")[start:stop])
+
+        merge = -(-2 * len(time_ms) // max_points)
+        if merge > 1:
+            groups = np.arange(0, len(time_ms), merge)
+            time_ms, low, high = time_ms[groups], np.fmin.reduceat(low, groups), np.fmax.reduceat(high, groups)
+            factor *= merge
+
+        return TraceWindow(np.repeat(time_ms, 2), np.column_stack([low, high]).ravel(), factor)
+
+
+@lru_cache(maxsize=16)
+def open_pyramid(track_code: str, race_num: int) -> TelemetryPyramid:
+    """Open (and keep open) the telemetry pyramid for a race"""
+    return TelemetryPyramid(track_code, race_num)
+
+
+def build_telemetry_pyramids(bundles: List[RaceBundle]) -> int:
+    """
+    Build pyramids for every race with telemetry that is missing or stale
+
+    Races without an up-to-date lap cache get one built first.
+
+    Args:
+        bundles: Races from get_race_bundles()
+
+    Returns:
+        Number of races downsampled
+    """
+    built = 0
+
+    for bundle in bundles:
+        track_code = bundle.track_code
+        race_num = bundle.race_num
+
+        if not bundle.has_telemetry:
+            continue
+
+        if has_pyramid(track_code, race_num):
+            print(f"  = {track_code} Race {race_num}: Up to date")
+            continue
+
+        try:
+            if not has_cache(track_code, race_num):
+                build_cache(track_code, race_num)
+                open_cache.cache_clear()
+            levels = build_pyramid(track_code, race_num)
+            built += 1
+            print(f"  + {track_code} Race {race_num}: {levels} levels")
+
+        except Exception as e:
+            print(f"  - {track_code} Race {race_num}: Error - {e}")
+
+    open_pyramid.cache_clear()
+    return built
@@ -13,21 +13,34 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import sys
-from typing import Dict, List
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Set, Tuple
 import time
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from src.config import DATABASE_PATH, TRACKS
+from src.config import (
+    DATABASE_PATH, TRACKS, TELEMETRY_STORE_DIR, TELEMETRY_CACHE_DIR, TELEMETRY_PYRAMID_DIR, RESAMPLED_DIR,
+    RUN_REPORTS_DIR, CSV_ENGINES
+)
 from src.database import create_database
-from src.utils import (
-    get_all_races,
-    load_lap_analysis,
-    load_race_results,
-    load_best_laps,
-    load_weather,
-    get_telemetry_file_path
+from src.utils import RaceBundle, get_race_bundles, time_column_to_seconds
+from src.utils.file_utils import HAS_PYARROW
+from src.utils.instrumentation import run_recorder, add_rows_out
+from src.pipeline import telemetry_store, telemetry_cache, downsample, resample, manifest, stat_partials
+from src.pipeline.scheduler import Stage, StageGraph
+from src.pipeline.data_quality import check_lap_times
+from src.pipeline.lap_segmentation import LAP_BOUNDARIES_COLUMNS, build_lap_boundaries, race_lap_boundaries
+from src.pipeline.corners import CORNER_EVENT_COLUMNS, race_corner_events
+from src.pipeline.scoring import (
+    TECHNIQUE_METRICS, RESULT_METRICS, NEUTRAL_SCORE, technique_scores, result_scores
+)
+from src.pipeline.telemetry import (
+    aggregate_race_telemetry,
+    aggregate_race_telemetry_sql,
+    TELEMETRY_AGGREGATE_COLUMNS
 )
 
 
@@ -90,318 +103,896 @@ def ingest_tracks(conn):
     df_tracks = pd.DataFrame(tracks_data)
     conn.execute("DELETE FROM tracks")
     conn.execute("INSERT INTO tracks SELECT * FROM df_tracks")
+    add_rows_out(len(df_tracks))
 
     print(f"[OK] Loaded {len(df_tracks)} tracks")
 
 
-def ingest_race_results(conn):
+# Table column orders (without id), matching the schema
+RACE_RESULTS_COLUMNS = [
+    'track_code', 'race_num', 'driver_number', 'position',
+    'status', 'laps', 'total_time', 'gap_first', 'gap_previous',
+    'fastest_lap_num', 'fastest_lap_time', 'fastest_lap_kph', 'class',
+    'total_time_seconds', 'gap_first_seconds', 'gap_previous_seconds',
+    'fastest_lap_time_seconds'
+]
+
+LAP_TIMES_COLUMNS = [
+    'track_code', 'race_num', 'driver_number', 'lap_number',
+    'lap_time_seconds', 'lap_time_str', 's1_time', 's2_time', 's3_time',
+    'top_speed', 'flag_at_fl', 'improvement_flag'
+]
+
+BEST_LAPS_COLUMNS = [
+    'track_code', 'race_num', 'driver_number',
+    'best_lap_1', 'best_lap_2', 'best_lap_3', 'best_lap_4', 'best_lap_5',
+    'best_lap_6', 'best_lap_7', 'best_lap_8', 'best_lap_9', 'best_lap_10',
+    'average_best_laps'
+]
+
+BEST_LAPS_LONG_COLUMNS = [
+    'track_code', 'race_num', 'driver_number', 'rank', 'lap_number', 'lap_time_seconds'
+]
+
+# Ranked laps in the best laps export (BESTLAP_n / BESTLAP_n_LAPNUM)
+BEST_LAP_RANKS = list(range(1, 11))
+
+LAP_SPLITS_COLUMNS = [
+    'track_code', 'race_num', 'driver_number', 'lap_number',
+    'split_index', 'split_name', 'split_seconds', 'elapsed_seconds'
+]
+
+# Intermediate timing points in lap order (<name>_time / <name>_elapsed columns)
+LAP_SPLITS = ['IM1a', 'IM1', 'IM2a', 'IM2', 'IM3a', 'FL']
+
+WEATHER_COLUMNS = [
+    'track_code', 'race_num', 'timestamp_utc',
+    'air_temp', 'track_temp', 'humidity', 'pressure',
+    'wind_speed', 'wind_direction', 'rain'
+]
+
+
+def prepare_race_results(bundle: RaceBundle) -> pd.DataFrame:
     """
-    Populate race_results table from all races
+    Load and clean race results for one race
 
     Args:
-        conn: DuckDB connection
+        bundle: Files for the race
+
+    Returns:
+        DataFrame with RACE_RESULTS_COLUMNS
     """
-    print("\\n[RESULTS] Ingesting race results...")
+    track_code, race_num = bundle.track_code, bundle.race_num
+    df = bundle.load_race_results()
+
+    # Clean and rename columns
+    return pd.DataFrame({
+        'track_code': track_code,
+        'race_num': race_num,
+        'driver_number': pd.to_numeric(df['NUMBER'], errors='coerce').fillna(0).astype(int),
+        'position': pd.to_numeric(df['POSITION'], errors='coerce').fillna(0).astype(int),
+        'status': df['STATUS'].astype(str),
+        'laps': pd.to_numeric(df['LAPS'], errors='coerce').fillna(0).astype(int),
+        'total_time': df['TOTAL_TIME'].astype(str),
+        'gap_first': df['GAP_FIRST'].astype(str),
+        'gap_previous': df['GAP_PREVIOUS'].astype(str),
+        'fastest_lap_num': pd.to_numeric(df['FL_LAPNUM'], errors='coerce').fillna(0).astype(int) if 'FL_LAPNUM' in df.columns else 0,
+        'fastest_lap_time': df['FL_TIME'].astype(str) if 'FL_TIME' in df.columns else '',
+        'fastest_lap_kph': pd.to_numeric(df['FL_KPH'], errors='coerce').fillna(0.0) if 'FL_KPH' in df.columns else 0.0,
+        'class': df['CLASS'].astype(str),
+        'total_time_seconds': time_column_to_seconds(df['TOTAL_TIME']),
+        'gap_first_seconds': time_column_to_seconds(df['GAP_FIRST']),
+        'gap_previous_seconds': time_column_to_seconds(df['GAP_PREVIOUS']),
+        'fastest_lap_time_seconds': time_column_to_seconds(df['FL_TIME']) if 'FL_TIME' in df.columns else np.nan
+    })
+
+
+def prepare_lap_times(bundle: RaceBundle) -> pd.DataFrame:
+    """
+    Load and clean lap times for one race
+
+    Args:
+        bundle: Files for the race
+
+    Returns:
+        DataFrame with LAP_TIMES_COLUMNS
+    """
+    track_code, race_num = bundle.track_code, bundle.race_num
+    df = bundle.load_lap_analysis()
+
+    # Clean and rename columns
+    df_clean = pd.DataFrame({
+        'track_code': track_code,
+        'race_num': race_num,
+        'driver_number': pd.to_numeric(df['DRIVER_NUMBER'], errors='coerce').fillna(0).astype(int),
+        'lap_number': pd.to_numeric(df['LAP_NUMBER'], errors='coerce').fillna(0).astype(int),
+        'lap_time_str': df['LAP_TIME'].astype(str),
+        'lap_time_seconds': time_column_to_seconds(df['LAP_TIME']),
+        's1_time': pd.to_numeric(df['S1_SECONDS'], errors='coerce') if 'S1_SECONDS' in df.columns else np.nan,
+        's2_time': pd.to_numeric(df['S2_SECONDS'], errors='coerce') if 'S2_SECONDS' in df.columns else np.nan,
+        's3_time': pd.to_numeric(df['S3_SECONDS'], errors='coerce') if 'S3_SECONDS' in df.columns else np.nan,
+        'top_speed': pd.to_numeric(df['TOP_SPEED'], errors='coerce') if 'TOP_SPEED' in df.columns else np.nan,
+        'flag_at_fl': df['FLAG_AT_FL'].astype(str) if 'FLAG_AT_FL' in df.columns else '',
+        'improvement_flag': df['LAP_IMPROVEMENT'].astype(str) if 'LAP_IMPROVEMENT' in df.columns else ''
+    })
+
+    # Filter out invalid laps (extremely slow or outliers)
+    return df_clean[df_clean['lap_time_seconds'] < 600]  # Less than 10 minutes
+
+
+def prepare_lap_splits(bundle: RaceBundle) -> pd.DataFrame:
+    """
+    Load one race's intermediate splits as one numeric row per (lap, split)
+
+    Laps are filtered like prepare_lap_times. Split and elapsed columns are
+    flattened row-major and parsed in one vectorized pass.
+
+    Args:
+        bundle: Files for the race
+
+    Returns:
+        DataFrame with LAP_SPLITS_COLUMNS (splits without a time are dropped)
+    """
+    df = bundle.load_lap_analysis()
+    df = df[time_column_to_seconds(df['LAP_TIME']) < 600]
+    splits = [split for split in LAP_SPLITS if f'{split}_time' in df.columns]
+
+    times = df.reindex(columns=[f'{split}_time' for split in splits]).to_numpy(dtype=object).ravel()
+    elapsed = df.reindex(columns=[f'{split}_elapsed' for split in splits]).to_numpy(dtype=object).ravel()
+    seconds = time_column_to_seconds(pd.Series(np.concatenate([times, elapsed]))).to_numpy()
+    driver_numbers = pd.to_numeric(df['DRIVER_NUMBER'], errors='coerce').fillna(0).astype(int).to_numpy()
+    lap_numbers = pd.to_numeric(df['LAP_NUMBER'], errors='coerce').fillna(0).astype(int).to_numpy()
+
+    df_long = pd.DataFrame({
+        'track_code': bundle.track_code,
+        'race_num': bundle.race_num,
+        'driver_number': np.repeat(driver_numbers, len(splits)),
+        'lap_number': np.repeat(lap_numbers, len(splits)),
+        'split_index': np.tile(np.array([LAP_SPLITS.index(split) + 1 for split in splits], dtype=int), len(df)),
+        'split_name': np.tile(np.array(splits, dtype=object), len(df)),
+        'split_seconds': seconds[:len(times)],
+        'elapsed_seconds': seconds[len(times):]
+    })
+
+    return df_long[df_long['split_seconds'].notna()]
+
+
+def prepare_best_laps(bundle: RaceBundle) -> pd.DataFrame:
+    """
+    Load and clean best laps for one race
+
+    Args:
+        bundle: Files for the race
+
+    Returns:
+        DataFrame with BEST_LAPS_COLUMNS
+    """
+    track_code, race_num = bundle.track_code, bundle.race_num
+    df = bundle.load_best_laps()
+
+    # The best laps file has columns like BESTLAP_1, BESTLAP_2, etc.
+    return pd.DataFrame({
+        'track_code': track_code,
+        'race_num': race_num,
+        'driver_number': pd.to_numeric(df['NUMBER'], errors='coerce').fillna(0).astype(int),
+        'best_lap_1': df['BESTLAP_1'].astype(str) if 'BESTLAP_1' in df.columns else '',
+        'best_lap_2': df['BESTLAP_2'].astype(str) if 'BESTLAP_2' in df.columns else '',
+        'best_lap_3': df['BESTLAP_3'].astype(str) if 'BESTLAP_3' in df.columns else '',
+        'best_lap_4': df['BESTLAP_4'].astype(str) if 'BESTLAP_4' in df.columns else '',
+        'best_lap_5': df['BESTLAP_5'].astype(str) if 'BESTLAP_5' in df.columns else '',
+        'best_lap_6': df['BESTLAP_6'].astype(str) if 'BESTLAP_6' in df.columns else '',
+        'best_lap_7': df['BESTLAP_7'].astype(str) if 'BESTLAP_7' in df.columns else '',
+        'best_lap_8': df['BESTLAP_8'].astype(str) if 'BESTLAP_8' in df.columns else '',
+        'best_lap_9': df['BESTLAP_9'].astype(str) if 'BESTLAP_9' in df.columns else '',
+        'best_lap_10': df['BESTLAP_10'].astype(str) if 'BESTLAP_10' in df.columns else '',
+        'average_best_laps': df['AVERAGE'].astype(str) if 'AVERAGE' in df.columns else ''
+    })
+
+
+def prepare_best_laps_long(bundle: RaceBundle) -> pd.DataFrame:
+    """
+    Load one race's best laps as one numeric row per (driver, rank)
+
+    The BESTLAP_n / BESTLAP_n_LAPNUM columns are flattened row-major, so all
+    lap times are parsed in a single vectorized pass.
 
-    all_results = []
-    races = get_all_races()
+    Args:
+        bundle: Files for the race
+
+    Returns:
+        DataFrame with BEST_LAPS_LONG_COLUMNS (ranks without a lap are dropped)
+    """
+    df = bundle.load_best_laps()
+    ranks = [rank for rank in BEST_LAP_RANKS if f'BESTLAP_{rank}' in df.columns]
+
+    times = df.reindex(columns=[f'BESTLAP_{rank}' for rank in ranks]).to_numpy(dtype=object).ravel()
+    laps = df.reindex(columns=[f'BESTLAP_{rank}_LAPNUM' for rank in ranks]).to_numpy(dtype=object).ravel()
+    driver_numbers = pd.to_numeric(df['NUMBER'], errors='coerce').fillna(0).astype(int).to_numpy()
+
+    df_long = pd.DataFrame({
+        'track_code': bundle.track_code,
+        'race_num': bundle.race_num,
+        'driver_number': np.repeat(driver_numbers, len(ranks)),
+        'rank': np.tile(np.array(ranks, dtype=int), len(df)),
+        'lap_number': pd.to_numeric(pd.Series(laps), errors='coerce').astype('Int64'),
+        'lap_time_seconds': time_column_to_seconds(pd.Series(times))
+    })
+
+    return df_long[df_long['lap_time_seconds'].notna()]
+
+
+def prepare_weather(bundle: RaceBundle) -> pd.DataFrame:
+    """
+    Load and clean weather for one race
 
-    for race_info in races:
-        track_code = race_info['track_code']
-        race_num = race_info['race_num']
+    Args:
+        bundle: Files for the race
+
+    Returns:
+        DataFrame with WEATHER_COLUMNS (empty if the race has no weather file)
+    """
+    track_code, race_num = bundle.track_code, bundle.race_num
+    df = bundle.load_weather()
+
+    if df.empty:
+        return df
+
+    return pd.DataFrame({
+        'track_code': track_code,
+        'race_num': race_num,
+        'timestamp_utc': df['TIME_UTC_SECONDS'].astype(int),
+        'air_temp': df['AIR_TEMP'].astype(float),
+        'track_temp': df['TRACK_TEMP'].astype(float),
+        'humidity': df['HUMIDITY'].astype(float),
+        'pressure': df['PRESSURE'].astype(float),
+        'wind_speed': df['WIND_SPEED'].astype(float),
+        'wind_direction': df['WIND_DIRECTION'].astype(int),
+        'rain': df['RAIN'].astype(int) > 0
+    })
+
+
+def prepare_lap_boundaries(bundle: RaceBundle) -> pd.DataFrame:
+    """
+    Load one race's lap start/end/time exports as one window per lap
+
+    Args:
+        bundle: Files for the race
+
+    Returns:
+        DataFrame with LAP_BOUNDARIES_COLUMNS (empty if the race has no boundary files)
+    """
+    return build_lap_boundaries(bundle.load_lap_boundaries(), bundle.track_code, bundle.race_num)
+
+
+def prepare_telemetry(bundle: RaceBundle) -> pd.DataFrame:
+    """
+    Aggregate one race's telemetry to lap level (chunked pandas engine)
+
+    Args:
+        bundle: Files for the race
+
+    Returns:
+        DataFrame with TELEMETRY_AGGREGATE_COLUMNS
+    """
+    return aggregate_race_telemetry(bundle.track_code, bundle.race_num,
+                                    lap_boundaries=race_lap_boundaries(bundle))
+
+
+def prepare_corner_events(bundle: RaceBundle) -> pd.DataFrame:
+    """
+    Detect one race's brake zones and corners from its pivoted telemetry
+
+    Args:
+        bundle: Files for the race
+
+    Returns:
+        DataFrame with CORNER_EVENT_COLUMNS (empty if the race has no telemetry)
+    """
+    if not bundle.has_telemetry:
+        return pd.DataFrame(columns=CORNER_EVENT_COLUMNS)
+    return race_corner_events(bundle.track_code, bundle.race_num)
+
+
+# Per-race loaders that can run in worker processes, keyed by target table
+RACE_PREPARERS = {
+    'race_results': prepare_race_results,
+    'lap_times': prepare_lap_times,
+    'lap_splits': prepare_lap_splits,
+    'best_laps': prepare_best_laps,
+    'best_laps_long': prepare_best_laps_long,
+    'weather': prepare_weather,
+    'lap_boundaries': prepare_lap_boundaries,
+    'telemetry_aggregates': prepare_telemetry,
+    'corner_events': prepare_corner_events
+}
+
+
+def prepare_race(bundle: RaceBundle, tables: List[str]) -> Tuple[Dict[str, object], Dict]:
+    """
+    Run the per-race loaders for one race (process pool entry point)
 
+    Args:
+        bundle: Files for the race
+        tables: Keys of RACE_PREPARERS to run
+
+    Returns:
+        Tuple of (table -> DataFrame or the exception raised while loading it,
+        loader metrics recorded in this process)
+    """
+    prepared = {}
+
+    for table in tables:
         try:
-            df = load_race_results(track_code, race_num)
-
-            # Clean and rename columns
-            df_clean = pd.DataFrame({
-                'track_code': track_code,
-                'race_num': race_num,
-                'driver_number': pd.to_numeric(df['NUMBER'], errors='coerce').fillna(0).astype(int),
-                'position': pd.to_numeric(df['POSITION'], errors='coerce').fillna(0).astype(int),
-                'status': df['STATUS'].astype(str),
-                'laps': pd.to_numeric(df['LAPS'], errors='coerce').fillna(0).astype(int),
-                'total_time': df['TOTAL_TIME'].astype(str),
-                'gap_first': df['GAP_FIRST'].astype(str),
-                'gap_previous': df['GAP_PREVIOUS'].astype(str),
-                'fastest_lap_num': pd.to_numeric(df['FL_LAPNUM'], errors='coerce').fillna(0).astype(int) if 'FL_LAPNUM' in df.columns else 0,
-                'fastest_lap_time': df['FL_TIME'].astype(str) if 'FL_TIME' in df.columns else '',
-                'fastest_lap_kph': pd.to_numeric(df['FL_KPH'], errors='coerce').fillna(0.0) if 'FL_KPH' in df.columns else 0.0,
-                'class': df['CLASS'].astype(str)
-            })
-
-            all_results.append(df_clean)
-            print(f"  + {track_code} Race {race_num}: {len(df_clean)} drivers")
+            prepared[table] = RACE_PREPARERS[table](bundle)
+        except Exception as e:
+            prepared[table] = e
+
+    return prepared, run_recorder.drain_loaders()
+
+
+def prepare_all_races(bundles: List[RaceBundle], tables: List[str], workers: int) -> Dict[str, Dict]:
+    """
+    Load and clean every race in parallel, one race per worker process
+
+    Args:
+        bundles: Races from get_race_bundles()
+        tables: Keys of RACE_PREPARERS to run for each race
+        workers: Number of worker processes
+
+    Returns:
+        Dictionary of table -> {(track_code, race_num): DataFrame or exception}
+    """
+    prepared = {table: {} for table in tables}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for bundle in bundles:
+            race_tables = [
+                table for table in tables
+                if table != 'telemetry_aggregates' or bundle.has_telemetry
+            ]
+            key = (bundle.track_code, bundle.race_num)
+            futures[pool.submit(prepare_race, bundle, race_tables)] = key
+
+        for future in as_completed(futures):
+            key = futures[future]
+            results, loaders = future.result()
+            run_recorder.merge_loaders(loaders)
+            for table, result in results.items():
+                prepared[table][key] = result
+
+    return prepared
+
+
+def _collect_races(prepare, bundles: List[RaceBundle], prepared: Optional[Dict], unit: str,
+                   error_label: str = "Error",
+                   skip_empty: bool = False) -> Tuple[List[pd.DataFrame], List[Tuple[str, int]]]:
+    """
+    Gather one cleaned frame per race, from worker results or by loading inline
+
+    Args:
+        prepare: Per-race loader, called when prepared is None
+        bundles: Races from get_race_bundles()
+        prepared: {(track_code, race_num): DataFrame or exception} from prepare_all_races
+        unit: Noun used in the per-race progress line
+        error_label: Word used in the per-race failure line
+        skip_empty: Silently skip races whose frame is empty
+
+    Returns:
+        Tuple of (per-race DataFrames, (track_code, race_num) of races that failed to load)
+    """
+    frames = []
+    failed = []
+
+    for bundle in bundles:
+        track_code = bundle.track_code
+        race_num = bundle.race_num
+
+        try:
+            if prepared is not None:
+                df_clean = prepared[(track_code, race_num)]
+                if isinstance(df_clean, Exception):
+                    raise df_clean
+            else:
+                df_clean = prepare(bundle)
+
+            if skip_empty and df_clean.empty:
+                continue
+
+            frames.append(df_clean)
+            print(f"  + {track_code} Race {race_num}: {len(df_clean)} {unit}")
 
         except Exception as e:
-            print(f"  - {track_code} Race {race_num}: Error - {e}")
+            failed.append((track_code, race_num))
+            print(f"  - {track_code} Race {race_num}: {error_label} - {e}")
+
+    return frames, failed
 
-    if all_results:
-        df_all = pd.concat(all_results, ignore_index=True)
-        df_all['id'] = range(1, len(df_all) + 1)
 
-        # Reorder columns to match table schema
-        df_all = df_all[[
-            'id', 'track_code', 'race_num', 'driver_number', 'position',
-            'status', 'laps', 'total_time', 'gap_first', 'gap_previous',
-            'fastest_lap_num', 'fastest_lap_time', 'fastest_lap_kph', 'class'
-        ]]
+def _replace_table(conn, table: str, frames: List[pd.DataFrame], columns: List[str],
+                   races: Optional[List[Tuple[str, int]]] = None) -> int:
+    """
+    Replace a table's contents with the concatenated per-race frames
 
-        conn.execute("DELETE FROM race_results")
-        conn.execute("INSERT INTO race_results SELECT * FROM df_all")
+    Args:
+        conn: DuckDB connection
+        table: Target table name
+        frames: Per-race DataFrames
+        columns: Column order of the table (without id)
+        races: Only replace these (track_code, race_num) rows, keeping the
+            rest of the table (whole table if None)
 
-        print(f"\\n[OK] Loaded {len(df_all)} race results from {len(all_results)} races")
+    Returns:
+        Number of rows written
+    """
+    df_all = pd.concat(frames, ignore_index=True)
+
+    if races is None:
+        conn.execute(f"DELETE FROM {table}")
+        first_id = 1
+    else:
+        manifest.delete_races(conn, table, races)
+        first_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+
+    df_all['id'] = range(first_id, first_id + len(df_all))
+
+    # Reorder columns to match table schema
+    df_all = df_all[['id'] + columns]
+
+    conn.execute(f"INSERT INTO {table} SELECT * FROM df_all")
+    add_rows_out(len(df_all))
+
+    return len(df_all)
+
+
+def _race_keys(bundles: List[RaceBundle], incremental: bool) -> Optional[List[Tuple[str, int]]]:
+    """Races whose rows a stage replaces (None = the whole table)"""
+    if not incremental:
+        return None
+    return [(bundle.track_code, bundle.race_num) for bundle in bundles]
+
+
+def ingest_race_results(conn, bundles: Optional[List[RaceBundle]] = None, prepared: Optional[Dict] = None,
+                        incremental: bool = False) -> List[Tuple[str, int]]:
+    """
+    Populate race_results table from all races
+
+    Args:
+        conn: DuckDB connection
+        bundles: Races from get_race_bundles() (discovered if None)
+        prepared: Per-race frames from prepare_all_races (loaded inline if None)
+        incremental: Only replace the rows of the given races
+
+    Returns:
+        (track_code, race_num) of races that failed to load
+    """
+    print("\\n[RESULTS] Ingesting race results...")
+
+    bundles = bundles if bundles is not None else get_race_bundles()
+    all_results, failed = _collect_races(prepare_race_results, bundles, prepared, "drivers")
+
+    if all_results:
+        count = _replace_table(conn, 'race_results', all_results, RACE_RESULTS_COLUMNS,
+                               _race_keys(bundles, incremental))
+        print(f"\\n[OK] Loaded {count} race results from {len(all_results)} races")
     else:
         print("\\n[WARN] No race results loaded")
 
+    return failed
 
-def ingest_lap_times(conn):
+
+def ingest_lap_times(conn, bundles: Optional[List[RaceBundle]] = None, prepared: Optional[Dict] = None,
+                     incremental: bool = False) -> List[Tuple[str, int]]:
     """
     Populate lap_times table from lap analysis files
 
     Args:
         conn: DuckDB connection
+        bundles: Races from get_race_bundles() (discovered if None)
+        prepared: Per-race frames from prepare_all_races (loaded inline if None)
+        incremental: Only replace the rows of the given races
+
+    Returns:
+        (track_code, race_num) of races that failed to load
     """
     print("\\n[LAP TIMES] Ingesting lap times...")
 
-    all_laps = []
-    races = get_all_races()
+    bundles = bundles if bundles is not None else get_race_bundles()
+    all_laps, failed = _collect_races(prepare_lap_times, bundles, prepared, "laps")
 
-    for race_info in races:
-        track_code = race_info['track_code']
-        race_num = race_info['race_num']
+    if all_laps:
+        df_all = pd.concat(all_laps, ignore_index=True)
 
-        try:
-            df = load_lap_analysis(track_code, race_num)
-
-            # Clean and rename columns
-            df_clean = pd.DataFrame({
-                'track_code': track_code,
-                'race_num': race_num,
-                'driver_number': pd.to_numeric(df['DRIVER_NUMBER'], errors='coerce').fillna(0).astype(int),
-                'lap_number': pd.to_numeric(df['LAP_NUMBER'], errors='coerce').fillna(0).astype(int),
-                'lap_time_str': df['LAP_TIME'].astype(str),
-                'lap_time_seconds': df['LAP_TIME'].apply(time_to_seconds),
-                's1_time': pd.to_numeric(df['S1_SECONDS'], errors='coerce') if 'S1_SECONDS' in df.columns else np.nan,
-                's2_time': pd.to_numeric(df['S2_SECONDS'], errors='coerce') if 'S2_SECONDS' in df.columns else np.nan,
-                's3_time': pd.to_numeric(df['S3_SECONDS'], errors='coerce') if 'S3_SECONDS' in df.columns else np.nan,
-                'top_speed': pd.to_numeric(df['TOP_SPEED'], errors='coerce') if 'TOP_SPEED' in df.columns else np.nan,
-                'flag_at_fl': df['FLAG_AT_FL'].astype(str) if 'FLAG_AT_FL' in df.columns else '',
-                'improvement_flag': df['LAP_IMPROVEMENT'].astype(str) if 'LAP_IMPROVEMENT' in df.columns else ''
-            })
-
-            # Filter out invalid laps (extremely slow or outliers)
-            df_clean = df_clean[df_clean['lap_time_seconds'] < 600]  # Less than 10 minutes
-
-            all_laps.append(df_clean)
-            print(f"  + {track_code} Race {race_num}: {len(df_clean)} laps")
+        # Report-only: laps outside their track's range are counted, not dropped
+        stats = check_lap_times(df_all)
+        count = _replace_table(conn, 'lap_times', [df_all], LAP_TIMES_COLUMNS,
+                               _race_keys(bundles, incremental))
+        print(f"\\n[OK] Loaded {count} lap times")
+        if stats['outliers_removed']:
+            by_track = ", ".join(f"{t}: {n}" for t, n in sorted(stats['outliers_by_track'].items()) if n)
+            print(f"[WARN] {stats['outliers_removed']} laps outside track ranges ({by_track})")
+    else:
+        print("\\n[WARN] No lap times loaded")
 
-        except Exception as e:
-            print(f"  - {track_code} Race {race_num}: Error - {e}")
+    return failed
 
-    if all_laps:
-        df_all = pd.concat(all_laps, ignore_index=True)
-        df_all['id'] = range(1, len(df_all) + 1)
 
-        # Reorder columns to match table schema
-        df_all = df_all[[
-            'id', 'track_code', 'race_num', 'driver_number', 'lap_number',
-            'lap_time_seconds', 'lap_time_str', 's1_time', 's2_time', 's3_time',
-            'top_speed', 'flag_at_fl', 'improvement_flag'
-        ]]
+def ingest_lap_splits(conn, bundles: Optional[List[RaceBundle]] = None, prepared: Optional[Dict] = None,
+                      incremental: bool = False) -> List[Tuple[str, int]]:
+    """
+    Populate lap_splits table (intermediate timing points)
+
+    Args:
+        conn: DuckDB connection
+        bundles: Races from get_race_bundles() (discovered if None)
+        prepared: Per-race frames from prepare_all_races (loaded inline if None)
+        incremental: Only replace the rows of the given races
+
+    Returns:
+        (track_code, race_num) of races that failed to load
+    """
+    print("\\n[SPLITS] Ingesting intermediate splits...")
 
-        conn.execute("DELETE FROM lap_times")
-        conn.execute("INSERT INTO lap_times SELECT * FROM df_all")
+    bundles = bundles if bundles is not None else get_race_bundles()
+    all_splits, failed = _collect_races(prepare_lap_splits, bundles, prepared, "splits")
 
-        print(f"\\n[OK] Loaded {len(df_all)} lap times")
+    if all_splits:
+        count = _replace_table(conn, 'lap_splits', all_splits, LAP_SPLITS_COLUMNS,
+                               _race_keys(bundles, incremental))
+        print(f"\\n[OK] Loaded {count} splits")
     else:
-        print("\\n[WARN] No lap times loaded")
+        print("\\n[WARN] No splits loaded")
+
+    return failed
 
 
-def ingest_best_laps(conn):
+def ingest_best_laps(conn, bundles: Optional[List[RaceBundle]] = None, prepared: Optional[Dict] = None,
+                     incremental: bool = False) -> List[Tuple[str, int]]:
     """
     Populate best_laps table
 
     Args:
         conn: DuckDB connection
+        bundles: Races from get_race_bundles() (discovered if None)
+        prepared: Per-race frames from prepare_all_races (loaded inline if None)
+        incremental: Only replace the rows of the given races
+
+    Returns:
+        (track_code, race_num) of races that failed to load
     """
     print("\\n[BEST LAPS] Ingesting best laps...")
 
-    all_best_laps = []
-    races = get_all_races()
+    bundles = bundles if bundles is not None else get_race_bundles()
+    all_best_laps, failed = _collect_races(prepare_best_laps, bundles, prepared, "drivers")
 
-    for race_info in races:
-        track_code = race_info['track_code']
-        race_num = race_info['race_num']
+    if all_best_laps:
+        count = _replace_table(conn, 'best_laps', all_best_laps, BEST_LAPS_COLUMNS,
+                               _race_keys(bundles, incremental))
+        print(f"\\n[OK] Loaded {count} best lap records")
+    else:
+        print("\\n[WARN] No best laps loaded")
 
-        try:
-            df = load_best_laps(track_code, race_num)
-
-            # The best laps file has columns like BESTLAP_1, BESTLAP_2, etc.
-            df_clean = pd.DataFrame({
-                'track_code': track_code,
-                'race_num': race_num,
-                'driver_number': pd.to_numeric(df['NUMBER'], errors='coerce').fillna(0).astype(int),
-                'best_lap_1': df['BESTLAP_1'].astype(str) if 'BESTLAP_1' in df.columns else '',
-                'best_lap_2': df['BESTLAP_2'].astype(str) if 'BESTLAP_2' in df.columns else '',
-                'best_lap_3': df['BESTLAP_3'].astype(str) if 'BESTLAP_3' in df.columns else '',
-                'best_lap_4': df['BESTLAP_4'].astype(str) if 'BESTLAP_4' in df.columns else '',
-                'best_lap_5': df['BESTLAP_5'].astype(str) if 'BESTLAP_5' in df.columns else '',
-                'best_lap_6': df['BESTLAP_6'].astype(str) if 'BESTLAP_6' in df.columns else '',
-                'best_lap_7': df['BESTLAP_7'].astype(str) if 'BESTLAP_7' in df.columns else '',
-                'best_lap_8': df['BESTLAP_8'].astype(str) if 'BESTLAP_8' in df.columns else '',
-                'best_lap_9': df['BESTLAP_9'].astype(str) if 'BESTLAP_9' in df.columns else '',
-                'best_lap_10': df['BESTLAP_10'].astype(str) if 'BESTLAP_10' in df.columns else '',
-                'average_best_laps': df['AVERAGE'].astype(str) if 'AVERAGE' in df.columns else ''
-            })
-
-            all_best_laps.append(df_clean)
-            print(f"  + {track_code} Race {race_num}: {len(df_clean)} drivers")
+    return failed
 
-        except Exception as e:
-            print(f"  - {track_code} Race {race_num}: Error - {e}")
 
-    if all_best_laps:
-        df_all = pd.concat(all_best_laps, ignore_index=True)
-        df_all['id'] = range(1, len(df_all) + 1)
+def ingest_best_laps_long(conn, bundles: Optional[List[RaceBundle]] = None, prepared: Optional[Dict] = None,
+                          incremental: bool = False) -> List[Tuple[str, int]]:
+    """
+    Populate best_laps_long table (numeric best laps, one row per rank)
 
-        # Reorder columns to match table schema
-        df_all = df_all[[
-            'id', 'track_code', 'race_num', 'driver_number',
-            'best_lap_1', 'best_lap_2', 'best_lap_3', 'best_lap_4', 'best_lap_5',
-            'best_lap_6', 'best_lap_7', 'best_lap_8', 'best_lap_9', 'best_lap_10',
-            'average_best_laps'
-        ]]
+    Args:
+        conn: DuckDB connection
+        bundles: Races from get_race_bundles() (discovered if None)
+        prepared: Per-race frames from prepare_all_races (loaded inline if None)
+        incremental: Only replace the rows of the given races
 
-        conn.execute("DELETE FROM best_laps")
-        conn.execute("INSERT INTO best_laps SELECT * FROM df_all")
+    Returns:
+        (track_code, race_num) of races that failed to load
+    """
+    print("\\n[BEST LAPS] Ingesting ranked best laps...")
 
-        print(f"\\n[OK] Loaded {len(df_all)} best lap records")
+    bundles = bundles if bundles is not None else get_race_bundles()
+    all_best_laps, failed = _collect_races(prepare_best_laps_long, bundles, prepared, "ranked laps")
+
+    if all_best_laps:
+        count = _replace_table(conn, 'best_laps_long', all_best_laps, BEST_LAPS_LONG_COLUMNS,
+                               _race_keys(bundles, incremental))
+        print(f"\\n[OK] Loaded {count} ranked best laps")
     else:
-        print("\\n[WARN] No best laps loaded")
+        print("\\n[WARN] No ranked best laps loaded")
+
+    return failed
 
 
-def ingest_weather(conn):
+def ingest_weather(conn, bundles: Optional[List[RaceBundle]] = None, prepared: Optional[Dict] = None,
+                   incremental: bool = False) -> List[Tuple[str, int]]:
     """
     Populate weather table
 
     Args:
         conn: DuckDB connection
+        bundles: Races from get_race_bundles() (discovered if None)
+        prepared: Per-race frames from prepare_all_races (loaded inline if None)
+        incremental: Only replace the rows of the given races
+
+    Returns:
+        (track_code, race_num) of races that failed to load
     """
     print("\\n[WEATHER] Ingesting weather data...")
 
-    all_weather = []
-    races = get_all_races()
+    bundles = bundles if bundles is not None else get_race_bundles()
+    all_weather, failed = _collect_races(prepare_weather, bundles, prepared, "weather records",
+                                 error_label="Skipped", skip_empty=True)
 
-    for race_info in races:
-        track_code = race_info['track_code']
-        race_num = race_info['race_num']
+    if all_weather:
+        count = _replace_table(conn, 'weather', all_weather, WEATHER_COLUMNS,
+                               _race_keys(bundles, incremental))
+        print(f"\\n[OK] Loaded {count} weather records")
+    else:
+        print("\\n[WARN] No weather data loaded")
 
-        try:
-            df = load_weather(track_code, race_num)
+    return failed
 
-            if df.empty:
-                continue
 
-            df_clean = pd.DataFrame({
-                'track_code': track_code,
-                'race_num': race_num,
-                'timestamp_utc': df['TIME_UTC_SECONDS'].astype(int),
-                'air_temp': df['AIR_TEMP'].astype(float),
-                'track_temp': df['TRACK_TEMP'].astype(float),
-                'humidity': df['HUMIDITY'].astype(float),
-                'pressure': df['PRESSURE'].astype(float),
-                'wind_speed': df['WIND_SPEED'].astype(float),
-                'wind_direction': df['WIND_DIRECTION'].astype(int),
-                'rain': df['RAIN'].astype(int) > 0
-            })
-
-            all_weather.append(df_clean)
-            print(f"  + {track_code} Race {race_num}: {len(df_clean)} weather records")
+def convert_telemetry(bundles: Optional[List[RaceBundle]] = None):
+    """
+    Convert raw telemetry CSVs into the partitioned Parquet store
 
-        except Exception as e:
-            print(f"  - {track_code} Race {race_num}: Skipped - {e}")
+    Races already converted from an unchanged CSV are skipped. Every
+    telemetry reader prefers the store once a race is in it.
 
-    if all_weather:
-        df_all = pd.concat(all_weather, ignore_index=True)
-        df_all['id'] = range(1, len(df_all) + 1)
+    Args:
+        bundles: Races from get_race_bundles() (discovered if None)
+    """
+    print("\\n[STORE] Converting telemetry to Parquet...")
+
+    if not telemetry_store.HAS_PYARROW:
+        print("[WARN] pyarrow not installed, telemetry will be read from CSV")
+        return
+
+    converted = telemetry_store.build_telemetry_store(bundles if bundles is not None else get_race_bundles())
+
+    print(f"\\n[OK] Converted {converted} races into {TELEMETRY_STORE_DIR}")
+
+
+def cache_telemetry(bundles: Optional[List[RaceBundle]] = None):
+    """
+    Build memory-mapped per-channel lap caches for fast single-lap access
 
-        # Reorder columns to match table schema
-        df_all = df_all[[
-            'id', 'track_code', 'race_num', 'timestamp_utc',
-            'air_temp', 'track_temp', 'humidity', 'pressure',
-            'wind_speed', 'wind_direction', 'rain'
-        ]]
+    Args:
+        bundles: Races from get_race_bundles() (discovered if None)
+    """
+    print("\\n[CACHE] Building telemetry lap cache...")
+
+    built = telemetry_cache.build_telemetry_cache(bundles if bundles is not None else get_race_bundles())
+
+    print(f"\\n[OK] Cached {built} races into {TELEMETRY_CACHE_DIR}")
+
+
+def downsample_telemetry(bundles: Optional[List[RaceBundle]] = None):
+    """
+    Build min/max downsampled levels of every cached race for charting
+
+    Args:
+        bundles: Races from get_race_bundles() (discovered if None)
+    """
+    print("\\n[PYRAMID] Downsampling telemetry for charts...")
+
+    built = downsample.build_telemetry_pyramids(bundles if bundles is not None else get_race_bundles())
+
+    print(f"\\n[OK] Downsampled {built} races into {TELEMETRY_PYRAMID_DIR}")
+
+
+def resample_telemetry(bundles: Optional[List[RaceBundle]] = None):
+    """
+    Resample every lap onto a fixed-step lap distance grid for overlays
+
+    Args:
+        bundles: Races from get_race_bundles() (discovered if None)
+    """
+    print("\\n[RESAMPLE] Resampling lap traces by distance...")
+
+    built = resample.build_resampled(bundles if bundles is not None else get_race_bundles())
 
-        conn.execute("DELETE FROM weather")
-        conn.execute("INSERT INTO weather SELECT * FROM df_all")
+    print(f"\\n[OK] Resampled {built} races into {RESAMPLED_DIR}")
 
-        print(f"\\n[OK] Loaded {len(df_all)} weather records")
+
+def ingest_lap_boundaries(conn, bundles: Optional[List[RaceBundle]] = None, prepared: Optional[Dict] = None,
+                          incremental: bool = False) -> List[Tuple[str, int]]:
+    """
+    Populate lap_boundaries table from the lap start/end/time exports
+
+    Args:
+        conn: DuckDB connection
+        bundles: Races from get_race_bundles() (discovered if None)
+        prepared: Per-race frames from prepare_all_races (loaded inline if None)
+        incremental: Only replace the rows of the given races
+
+    Returns:
+        (track_code, race_num) of races that failed to load
+    """
+    print("\\n[LAPS] Ingesting lap boundaries...")
+
+    bundles = bundles if bundles is not None else get_race_bundles()
+    all_boundaries, failed = _collect_races(prepare_lap_boundaries, bundles, prepared, "lap windows",
+                                    skip_empty=True)
+
+    if all_boundaries:
+        count = _replace_table(conn, 'lap_boundaries', all_boundaries, LAP_BOUNDARIES_COLUMNS,
+                               _race_keys(bundles, incremental))
+        print(f"\\n[OK] Loaded {count} lap windows")
     else:
-        print("\\n[WARN] No weather data loaded")
+        print("\\n[WARN] No lap boundaries loaded")
+
+    return failed
 
 
-def compute_driver_aggregates(conn):
+def ingest_telemetry(conn, engine: str = 'pandas', bundles: Optional[List[RaceBundle]] = None,
+                     prepared: Optional[Dict] = None, incremental: bool = False) -> List[Tuple[str, int]]:
+    """
+    Populate telemetry_aggregates table by streaming each race's telemetry file
+
+    Args:
+        conn: DuckDB connection
+        engine: 'pandas' streams chunks through LapAggregator, 'duckdb' runs
+            the scan and aggregation inside DuckDB
+        bundles: Races from get_race_bundles() (discovered if None)
+        prepared: Per-race frames from prepare_all_races (pandas engine only)
+        incremental: Only replace the rows of the given races
+
+    Returns:
+        (track_code, race_num) of races that failed to load
+    """
+    print("\\n[TELEMETRY] Aggregating telemetry to lap level...")
+
+    bundles = bundles if bundles is not None else get_race_bundles()
+    telemetry_bundles = []
+    for bundle in bundles:
+        if bundle.has_telemetry:
+            telemetry_bundles.append(bundle)
+        else:
+            print(f"  - {bundle.track_code} Race {bundle.race_num}: No telemetry file")
+
+    if engine == 'duckdb':
+        def prepare(bundle):
+            return aggregate_race_telemetry_sql(conn, bundle.track_code, bundle.race_num,
+                                                lap_boundaries=race_lap_boundaries(bundle))
+    else:
+        prepare = prepare_telemetry
+
+    all_aggregates, failed = _collect_races(prepare, telemetry_bundles, prepared, "vehicle laps")
+
+    # Changed races that lost their telemetry file still drop their old rows
+    races = _race_keys(bundles, incremental)
+    if all_aggregates:
+        count = _replace_table(conn, 'telemetry_aggregates', all_aggregates, TELEMETRY_AGGREGATE_COLUMNS, races)
+        print(f"\\n[OK] Loaded {count} lap-level telemetry aggregates")
+    else:
+        if races:
+            manifest.delete_races(conn, 'telemetry_aggregates', races)
+        print("\\n[WARN] No telemetry aggregates loaded")
+
+    return failed
+
+
+def ingest_corner_events(conn, bundles: Optional[List[RaceBundle]] = None, prepared: Optional[Dict] = None,
+                         incremental: bool = False) -> List[Tuple[str, int]]:
+    """
+    Populate corner_events table with every lap's brake zones and corners
+
+    Args:
+        conn: DuckDB connection
+        bundles: Races from get_race_bundles() (discovered if None)
+        prepared: Per-race frames from prepare_all_races (detected inline if None)
+        incremental: Only replace the rows of the given races
+
+    Returns:
+        (track_code, race_num) of races that failed to load
+    """
+    print("\\n[CORNERS] Detecting brake zones and corners...")
+
+    bundles = bundles if bundles is not None else get_race_bundles()
+    telemetry_bundles = [bundle for bundle in bundles if bundle.has_telemetry]
+    all_events, failed = _collect_races(prepare_corner_events, telemetry_bundles, prepared, "corner events")
+
+    # Changed races that lost their telemetry file still drop their old rows
+    races = _race_keys(bundles, incremental)
+    if all_events:
+        count = _replace_table(conn, 'corner_events', all_events, CORNER_EVENT_COLUMNS, races)
+        print(f"\\n[OK] Loaded {count} corner events")
+    else:
+        if races:
+            manifest.delete_races(conn, 'corner_events', races)
+        print("\\n[WARN] No corner events loaded")
+
+    return failed
+
+
+def compute_driver_aggregates(conn, drivers: Optional[Set[int]] = None):
     """
     Compute driver-level aggregates from race results and lap times
 
     Args:
         conn: DuckDB connection
+        drivers: Only recompute these drivers from the stored partials
+            (every driver, straight from the race tables, if None)
     """
     print("\\n[DRIVERS] Computing driver aggregates...")
 
-    # Get unique drivers from race results
-    df_drivers = conn.execute("""
+    # Merge per-race partials of every driver with race results
+    source = stat_partials.partials_source('driver_race_partials', stored=drivers is not None)
+    selected = stat_partials.key_filter('driver_number', None if drivers is None else list(drivers))
+    df_drivers = conn.execute(f"""
         SELECT
             driver_number,
-            COUNT(DISTINCT track_code || '_' || race_num) as total_races,
-            MIN(position) as best_finish,
-            SUM(laps) as total_laps,
-            AVG(position) as avg_position
-        FROM race_results
+            COUNT(*) FILTER (WHERE result_rows > 0) as total_races,
+            MIN(position_min) as best_finish,
+            SUM(race_laps) as total_laps,
+            SUM(position_sum) / NULLIF(SUM(position_count), 0) as avg_position
+        FROM {source}
+        WHERE {selected}
         GROUP BY driver_number
+        HAVING SUM(result_rows) > 0
     """).df()
 
     # Add placeholder for points (can be calculated later)
     df_drivers['total_points'] = 0.0
 
-    conn.execute("DELETE FROM drivers")
+    conn.execute(f"DELETE FROM drivers WHERE {selected}")
     conn.execute("INSERT INTO drivers SELECT * FROM df_drivers")
+    add_rows_out(len(df_drivers))
 
     print(f"[OK] Loaded {len(df_drivers)} drivers")
 
 
-def compute_driver_stats(conn):
+def compute_driver_stats(conn, drivers: Optional[Set[int]] = None, tracks: Optional[Set[str]] = None):
     """
     Compute driver statistics for Phase 1 (FIFA-style ratings)
 
     Args:
         conn: DuckDB connection
+        drivers: Only recompute these drivers from the stored partials
+            (every driver, straight from the race tables, if None)
+        tracks: Tracks with changed races; every driver there is rescored,
+            since scores are normalized against the field
     """
     print("\\n[STATS] Computing driver statistics...")
 
-    # Get lap time statistics per driver
-    df_stats = conn.execute("""
+    if drivers is not None:
+        drivers = drivers | stat_partials.drivers_at_tracks(conn, tracks or set())
+
+    # Merge per-race lap time sums, sums of squares and podiums per driver
+    source = stat_partials.partials_source('driver_race_partials', stored=drivers is not None)
+    selected = stat_partials.key_filter('driver_number', None if drivers is None else list(drivers))
+    df_stats = conn.execute(f"""
         SELECT
             driver_number,
-            AVG(lap_time_seconds) as avg_lap_time_seconds,
-            MIN(lap_time_seconds) as best_lap_time_seconds,
-            STDDEV(lap_time_seconds) as lap_time_stddev,
-            COUNT(*) as total_laps
-        FROM lap_times
-        WHERE lap_time_seconds IS NOT NULL
-          AND lap_time_seconds > 0
+            SUM(lap_time_sum) / SUM(lap_count) as avg_lap_time_seconds,
+            MIN(lap_time_min) as best_lap_time_seconds,
+            SQRT(GREATEST(SUM(lap_time_sumsq) - SUM(lap_time_sum) ^ 2 / SUM(lap_count), 0)
+                 / NULLIF(SUM(lap_count) - 1, 0)) as lap_time_stddev,
+            SUM(lap_count) as total_laps,
+            SUM(podiums) as total_podiums
+        FROM {source}
+        WHERE {selected}
         GROUP BY driver_number
+        HAVING SUM(lap_count) > 0
     """).df()
 
     # Normalize scores to 0-100 scale (will be refined in Phase 1)
     # For now, use placeholder calculations
     df_stats['consistency_score'] = 100 - (df_stats['lap_time_stddev'] * 10).clip(0, 100)
-    df_stats['qualifying_score'] = 75.0  # Placeholder
-    df_stats['braking_score'] = 75.0  # Placeholder (requires telemetry)
-    df_stats['cornering_score'] = 75.0  # Placeholder (requires telemetry)
-    df_stats['throttle_score'] = 75.0  # Placeholder (requires telemetry)
-    df_stats['racecraft_score'] = 75.0  # Placeholder (requires results analysis)
+
+    # Braking, cornering and throttle from lap aggregates and corner events, normalized per track
+    df_technique = technique_scores(conn, drivers)
+    # Racecraft and qualifying from results, lap times and best laps, normalized per race
+    df_results = result_scores(conn, drivers)
+
+    score_columns = list(TECHNIQUE_METRICS) + list(RESULT_METRICS)
+    df_stats = df_stats.merge(df_technique, on='driver_number', how='left')
+    df_stats = df_stats.merge(df_results, on='driver_number', how='left')
+    df_stats[score_columns] = df_stats[score_columns].fillna(NEUTRAL_SCORE)
+    print(f"[OK] Telemetry scores for {len(df_technique)} drivers, results scores for {len(df_results)}")
 
     # Overall rating (average of sub-scores)
     df_stats['overall_rating'] = df_stats[[
@@ -409,15 +1000,6 @@ def compute_driver_stats(conn):
         'consistency_score', 'racecraft_score', 'qualifying_score'
     ]].mean(axis=1)
 
-    # Count podiums
-    df_podiums = conn.execute("""
-        SELECT driver_number, COUNT(*) as total_podiums
-        FROM race_results
-        WHERE position <= 3
-        GROUP BY driver_number
-    """).df()
-
-    df_stats = df_stats.merge(df_podiums, on='driver_number', how='left')
     df_stats['total_podiums'] = df_stats['total_podiums'].fillna(0).astype(int)
 
     # Select only columns that exist in driver_stats table
@@ -427,46 +1009,40 @@ def compute_driver_stats(conn):
         'avg_lap_time_seconds', 'best_lap_time_seconds', 'total_podiums'
     ]]
 
-    conn.execute("DELETE FROM driver_stats")
+    conn.execute(f"DELETE FROM driver_stats WHERE {selected}")
     conn.execute("INSERT INTO driver_stats SELECT * FROM df_final")
+    add_rows_out(len(df_final))
 
     print(f"[OK] Computed stats for {len(df_stats)} drivers")
 
 
-def compute_track_stats(conn):
+def compute_track_stats(conn, tracks: Optional[Set[str]] = None):
     """
     Compute track-level statistics for Phase 1
 
     Args:
         conn: DuckDB connection
+        tracks: Only recompute these tracks from the stored partials
+            (every track, straight from lap_times, if None)
     """
     print("\\n[RESULTS] Computing track statistics...")
 
-    df_stats = conn.execute("""
+    # Merge per-race lap counts, sums, records and top speeds per track
+    source = stat_partials.partials_source('track_race_partials', stored=tracks is not None)
+    selected = stat_partials.key_filter('track_code', None if tracks is None else list(tracks))
+    df_stats = conn.execute(f"""
         SELECT
-            lt.track_code,
-            MIN(lt.lap_time_seconds) as lap_record_seconds,
-            AVG(lt.lap_time_seconds) as avg_lap_time_seconds,
-            MAX(lt.top_speed) as top_speed_kph,
-            COUNT(*) as total_laps
-        FROM lap_times lt
-        WHERE lt.lap_time_seconds IS NOT NULL
-          AND lt.lap_time_seconds > 0
-        GROUP BY lt.track_code
+            track_code,
+            MIN(lap_time_min) as lap_record_seconds,
+            ARG_MIN(lap_time_min_driver, (lap_time_min, lap_time_min_driver)) as lap_record_driver,
+            SUM(lap_time_sum) / SUM(lap_count) as avg_lap_time_seconds,
+            MAX(top_speed_max) as top_speed_kph,
+            SUM(lap_count) as total_laps
+        FROM {source}
+        WHERE {selected}
+        GROUP BY track_code
     """).df()
 
-    # Find lap record holder
-    df_record_holders = conn.execute("""
-        SELECT DISTINCT ON (lt.track_code)
-            lt.track_code,
-            lt.driver_number as lap_record_driver
-        FROM lap_times lt
-        WHERE lt.lap_time_seconds IS NOT NULL
-        ORDER BY lt.track_code, lt.lap_time_seconds ASC
-    """).df()
-
-    df_stats = df_stats.merge(df_record_holders, on='track_code', how='left')
-
     # Calculate average speed (track_length / lap_time)
     df_tracks = conn.execute("SELECT track_code, length_miles FROM tracks").df()
     df_stats = df_stats.merge(df_tracks, on='track_code', how='left')
@@ -476,16 +1052,278 @@ def compute_track_stats(conn):
     # Difficulty score (placeholder - will refine in Phase 1)
     df_stats['track_difficulty_score'] = 75.0
 
-    df_stats = df_stats.drop(columns=['length_miles'])
+    # Select columns in track_stats table order
+    df_stats = df_stats[[
+        'track_code', 'lap_record_seconds', 'lap_record_driver', 'avg_speed_kph',
+        'top_speed_kph', 'total_laps', 'avg_lap_time_seconds', 'track_difficulty_score'
+    ]]
 
-    conn.execute("DELETE FROM track_stats")
+    conn.execute(f"DELETE FROM track_stats WHERE {selected}")
     conn.execute("INSERT INTO track_stats SELECT * FROM df_stats")
+    add_rows_out(len(df_stats))
 
     print(f"[OK] Computed stats for {len(df_stats)} tracks")
 
 
-def main():
+def compute_split_stats(conn, tracks: Optional[Set[str]] = None):
+    """
+    Compute best and median time per (track, split)
+
+    Args:
+        conn: DuckDB connection
+        tracks: Only recompute these tracks (every track if None)
+    """
+    print("\\n[RESULTS] Computing split statistics...")
+
+    selected = stat_partials.key_filter('track_code', None if tracks is None else list(tracks))
+    conn.execute(f"DELETE FROM split_stats WHERE {selected}")
+    count = conn.execute(f"""
+        INSERT INTO split_stats
+        SELECT
+            track_code,
+            split_index,
+            ANY_VALUE(split_name) as split_name,
+            MIN(split_seconds) as best_seconds,
+            ARG_MIN(driver_number, (split_seconds, driver_number)) as best_driver,
+            MEDIAN(split_seconds) as median_seconds,
+            COUNT(*) as total_laps
+        FROM lap_splits
+        WHERE split_seconds > 0
+          AND {selected}
+        GROUP BY track_code, split_index
+    """).fetchone()[0]
+    add_rows_out(count)
+
+    print(f"[OK] Computed stats for {count} track splits")
+
+
+def refresh_stat_partials(conn, races: Optional[List[Tuple[str, int]]] = None) -> Tuple[Set[int], Set[str]]:
+    """
+    Recompute the stored per-race partials behind driver and track stats
+
+    Args:
+        conn: DuckDB connection
+        races: Changed or removed (track_code, race_num) pairs (every race if None)
+
+    Returns:
+        Tuple of (driver_numbers, track_codes) whose stats need recomputing
+    """
+    print("\\n[STATS] Refreshing per-race partial aggregates...")
+
+    drivers, tracks = stat_partials.refresh_partials(conn, races)
+    count = conn.execute("SELECT COUNT(*) FROM driver_race_partials").fetchone()[0]
+    add_rows_out(count)
+
+    scope = "all" if races is None else str(len(races))
+    print(f"[OK] Refreshed {scope} races: {len(drivers)} drivers and {len(tracks)} tracks affected")
+    return drivers, tracks
+
+
+def build_stages(bundles: List[RaceBundle], args: argparse.Namespace,
+                 plan: manifest.IngestPlan) -> StageGraph:
+    """
+    Declare every pipeline stage with the tables it reads and writes
+
+    Args:
+        bundles: Races to ingest
+        args: Parsed command line options
+        plan: Manifest comparison from manifest.plan_ingest()
+
+    Returns:
+        StageGraph ready to run
+    """
+    incremental = args.incremental
+    prepared = {}
+    # Races that failed to load in any ingest stage; left out of the manifest so they are retried
+    failed = set()
+    # Drivers and tracks touched by an incremental run; empty means recompute everything
+    affected = {}
+
+    def prepare_races(conn):
+        tables = ['race_results', 'lap_times', 'lap_splits', 'best_laps', 'best_laps_long',
+                  'weather', 'lap_boundaries', 'corner_events']
+        if args.telemetry_engine == 'pandas':
+            tables.append('telemetry_aggregates')
+
+        print(f"\\n[PARALLEL] Preparing races with {args.workers} workers...")
+        prepared.update(prepare_all_races(bundles, tables, args.workers))
+
+    def record_manifest(conn):
+        # Record what was ingested so the next incremental run can skip it
+        for track_code, race_num in sorted(failed):
+            print(f"  - {track_code} Race {race_num}: Not recorded, failed to load")
+        # Forget failed races too: their rows may be partly replaced, so they must not match an old entry
+        manifest.delete_races(conn, 'ingest_manifest', sorted(failed))
+        manifest.record_races(conn, {
+            (bundle.track_code, bundle.race_num): plan.signatures[(bundle.track_code, bundle.race_num)]
+            for bundle in bundles if (bundle.track_code, bundle.race_num) not in failed
+        })
+
+    def ingest_races(ingest, table):
+        # Stage running one per-race ingest step and remembering the races it failed on
+        return lambda conn: failed.update(ingest(conn, bundles, prepared.get(table), incremental))
+
+    def refresh_partials(conn):
+        races = None
+        if incremental:
+            races = sorted({(bundle.track_code, bundle.race_num) for bundle in bundles} | set(plan.removed))
+        drivers, tracks = refresh_stat_partials(conn, races)
+        if incremental:
+            affected.update(drivers=drivers, tracks=tracks)
+
+    stages = [Stage('ingest_tracks', ingest_tracks, writes=('tracks',))]
+
+    if bundles:
+        stages.append(Stage('convert_telemetry', lambda conn: convert_telemetry(bundles),
+                            writes=('telemetry_store',)))
+        if args.build_cache:
+            stages.append(Stage('cache_telemetry', lambda conn: cache_telemetry(bundles),
+                                reads=('telemetry_store',), writes=('telemetry_cache',)))
+        if args.build_pyramid:
+            stages.append(Stage('downsample_telemetry', lambda conn: downsample_telemetry(bundles),
+                                reads=('telemetry_store',), writes=('telemetry_cache', 'telemetry_pyramid')))
+        if args.resample:
+            stages.append(Stage('resample_telemetry', lambda conn: resample_telemetry(bundles),
+                                reads=('telemetry_store', 'telemetry_cache'), writes=('resampled',)))
+
+        # Load and clean races in worker processes; DuckDB is written from the stages only
+        if args.workers > 1:
+            # Corner events read the lap cache, so wait for any stage rebuilding it
+            stages.append(Stage('prepare_races', prepare_races,
+                                reads=('telemetry_store', 'telemetry_cache'), writes=('prepared',)))
+
+        stages += [
+            Stage('ingest_race_results',
+                  ingest_races(ingest_race_results, 'race_results'),
+                  reads=('prepared',), writes=('race_results',)),
+            Stage('ingest_lap_times',
+                  ingest_races(ingest_lap_times, 'lap_times'),
+                  reads=('prepared',), writes=('lap_times',)),
+            Stage('ingest_lap_splits',
+                  ingest_races(ingest_lap_splits, 'lap_splits'),
+                  reads=('prepared',), writes=('lap_splits',)),
+            Stage('ingest_best_laps',
+                  ingest_races(ingest_best_laps, 'best_laps'),
+                  reads=('prepared',), writes=('best_laps',)),
+            Stage('ingest_best_laps_long',
+                  ingest_races(ingest_best_laps_long, 'best_laps_long'),
+                  reads=('prepared',), writes=('best_laps_long',)),
+            Stage('ingest_weather',
+                  ingest_races(ingest_weather, 'weather'),
+                  reads=('prepared',), writes=('weather',)),
+            Stage('ingest_lap_boundaries',
+                  ingest_races(ingest_lap_boundaries, 'lap_boundaries'),
+                  reads=('prepared',), writes=('lap_boundaries',)),
+            Stage('ingest_telemetry',
+                  lambda conn: failed.update(ingest_telemetry(
+                      conn, engine=args.telemetry_engine, bundles=bundles,
+                      prepared=prepared.get('telemetry_aggregates'), incremental=incremental)),
+                  reads=('prepared', 'telemetry_store'), writes=('telemetry_aggregates',)),
+            Stage('ingest_corner_events',
+                  ingest_races(ingest_corner_events, 'corner_events'),
+                  reads=('prepared', 'telemetry_store', 'telemetry_cache'), writes=('corner_events',)),
+            Stage('record_manifest', record_manifest,
+                  reads=tuple(manifest.RACE_TABLES), writes=('ingest_manifest',)),
+        ]
+    else:
+        print("\\n[OK] No changed races to ingest")
+
+    stages += [
+        Stage('refresh_stat_partials', refresh_partials,
+              reads=('race_results', 'lap_times'), writes=('stat_partials',)),
+        Stage('compute_driver_aggregates',
+              lambda conn: compute_driver_aggregates(conn, affected.get('drivers')),
+              reads=('race_results', 'stat_partials'), writes=('drivers',)),
+        Stage('compute_driver_stats',
+              lambda conn: compute_driver_stats(conn, affected.get('drivers'), affected.get('tracks')),
+              reads=('lap_times', 'race_results', 'best_laps_long', 'telemetry_aggregates', 'corner_events',
+                     'stat_partials'),
+              writes=('driver_stats',)),
+        Stage('compute_track_stats',
+              lambda conn: compute_track_stats(conn, affected.get('tracks')),
+              reads=('lap_times', 'tracks', 'stat_partials'), writes=('track_stats',)),
+        Stage('compute_split_stats',
+              lambda conn: compute_split_stats(conn, affected.get('tracks')),
+              reads=('lap_splits', 'stat_partials'), writes=('split_stats',)),
+    ]
+
+    return StageGraph(stages)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse pipeline command line options"""
+    parser = argparse.ArgumentParser(description="GR Cup data ingestion pipeline")
+    parser.add_argument(
+        "--telemetry-engine",
+        choices=["pandas", "duckdb"],
+        default="pandas",
+        help="Aggregate telemetry with chunked pandas or DuckDB's native scanners"
+    )
+    parser.add_argument(
+        "--csv-engine",
+        choices=CSV_ENGINES,
+        default="pandas",
+        help="Parse timing exports with pandas' C parser or the multithreaded Arrow parser"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Load and clean races in N worker processes (1 = serial)"
+    )
+    parser.add_argument(
+        "--build-cache",
+        action="store_true",
+        help="Also build the memory-mapped telemetry lap cache"
+    )
+    parser.add_argument(
+        "--build-pyramid",
+        action="store_true",
+        help="Also build min/max downsampled telemetry levels for charts (builds the lap cache if needed)"
+    )
+    parser.add_argument(
+        "--resample",
+        action="store_true",
+        help="Also resample every lap onto a fixed-step distance grid"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-ingest races whose source files changed since the last run"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=4,
+        help="Run up to N independent stages concurrently (1 = one stage at a time)"
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        metavar="STAGE",
+        help="Run only these stages (e.g. compute_driver_stats to recompute stats without re-ingesting)"
+    )
+    parser.add_argument(
+        "--from",
+        dest="start",
+        metavar="STAGE",
+        help="Run this stage and every stage that depends on it"
+    )
+    args = parser.parse_args(argv)
+
+    # Check stage names against every stage these options declare (as if a
+    # race changed) before any database work; nothing is run here
+    try:
+        build_stages([None], args, manifest.IngestPlan()).select(only=args.only, start=args.start)
+    except ValueError as e:
+        parser.error(str(e))
+
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
     """Main data ingestion pipeline"""
+    args = parse_args(argv)
 
     print("=" * 70)
     print("GR CUP PERFORMANCE INTELLIGENCE PLATFORM")
@@ -500,16 +1338,40 @@ def main():
     print(f"[OK] Database created at: {DATABASE_PATH}")
 
     # Ingest data
-    ingest_tracks(conn)
-    ingest_race_results(conn)
-    ingest_lap_times(conn)
-    ingest_best_laps(conn)
-    ingest_weather(conn)
-
-    # Compute aggregates
-    compute_driver_aggregates(conn)
-    compute_driver_stats(conn)
-    compute_track_stats(conn)
+    # Discover every race's files once and share them across stages
+    if args.csv_engine == 'pyarrow' and not HAS_PYARROW:
+        print("[WARN] pyarrow not installed, timing exports will be parsed with pandas")
+    bundles = get_race_bundles(csv_engine=args.csv_engine)
+
+    print("\\n[MANIFEST] Checking source files...")
+    plan = manifest.plan_ingest(conn, bundles)
+    manifest.remove_races(conn, plan.removed)
+    if args.incremental:
+        for bundle in plan.unchanged:
+            print(f"  = {bundle.track_code} Race {bundle.race_num}: Unchanged")
+        for bundle in plan.changed:
+            print(f"  + {bundle.track_code} Race {bundle.race_num}: Changed")
+        for track_code, race_num in plan.removed:
+            print(f"  - {track_code} Race {race_num}: Removed")
+        bundles = plan.changed
+    print(f"[OK] {len(plan.changed)} of {len(plan.signatures)} races changed since the last run")
+
+    # Run ingest and compute stages, independent ones concurrently
+    graph = build_stages(bundles, args, plan)
+    only = [name for name in args.only if name in graph] if args.only else None
+    if (args.only and not only) or (args.start and args.start not in graph):
+        # The requested stages are only declared when races changed
+        names = []
+    else:
+        names = graph.select(only=only, start=args.start)
+    try:
+        graph.run(conn, names, max_workers=args.threads)
+    finally:
+        # Keep per-stage metrics even for failed runs
+        run_recorder.print_summary()
+        run_recorder.write_table(conn)
+        report_path = run_recorder.write_json(RUN_REPORTS_DIR)
+        print(f"[OK] Run report written to {report_path}")
 
     # Close connection
     conn.close()
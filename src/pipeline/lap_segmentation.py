@@ -0,0 +1,228 @@
+"""
+Lap boundaries and timestamp-based lap segmentation for GR Cup Data Pipeline
+
+The lap_start / lap_end / lap_time exports give every (vehicle, lap) a
+[start, end) time window. LapSegmenter places telemetry samples in those
+windows with a single binary search over the sorted window starts, so a
+race's n samples are segmented in O(n log m) for m laps without relying
+on the ECU lap counter in the telemetry file. The counter is only used
+for samples outside every window, so a missing, unknown or shifted ECU
+lap never decides the lap of a sample the timing exports cover.
+"""
+
+from functools import reduce
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils import RaceBundle
+
+
+# Column order of the lap_boundaries table (without id)
+LAP_BOUNDARIES_COLUMNS = [
+    'track_code', 'race_num', 'vehicle_id', 'driver_number', 'lap_number',
+    'start_time', 'end_time', 'lap_time_seconds'
+]
+
+# ECU lap counter value used when the lap is unknown
+INVALID_LAP = 32768
+
+# timestamps_to_ms value of a missing timestamp (NaT as int64)
+MISSING_MS = np.iinfo(np.int64).min
+
+
+def timestamps_to_ms(timestamps: pd.Series) -> np.ndarray:
+    """
+    Convert ISO-8601 telemetry timestamps to integer epoch milliseconds
+
+    Every channel of a sample shares its timestamp, so strings are parsed
+    once per distinct value and mapped back.
+
+    Args:
+        timestamps: Series of timestamp strings or datetimes
+
+    Returns:
+        int64 array of milliseconds since the epoch (MISSING_MS where missing)
+    """
+    timestamps = pd.Series(timestamps)
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        codes, uniques = pd.factorize(timestamps)
+        # Missing timestamps (code -1) map to the trailing NaT value
+        return np.r_[_parse_ms(pd.Series(uniques)), MISSING_MS][codes]
+    return _parse_ms(timestamps)
+
+
+def _parse_ms(timestamps: pd.Series) -> np.ndarray:
+    parsed = pd.to_datetime(timestamps, utc=True, format='ISO8601')
+    return parsed.dt.tz_localize(None).to_numpy().astype('datetime64[ms]').astype(np.int64)
+
+
+def _boundary_times(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    """One lap boundary export as (vehicle_id, lap_number)-indexed epoch ms (NaN where blank)"""
+    time_ms = timestamps_to_ms(df['timestamp'])
+    part = pd.DataFrame({
+        'vehicle_id': df['vehicle_id'].astype(str),
+        'lap_number': pd.to_numeric(df['lap'], errors='coerce'),
+        'driver_number': pd.to_numeric(df['vehicle_number'], errors='coerce'),
+        column: np.where(time_ms == MISSING_MS, np.nan, time_ms.astype(float))
+    })
+    if column == 'time_ms':
+        part['duration_ms'] = pd.to_numeric(df['value'], errors='coerce')
+
+    part = part[(part['lap_number'] >= 1) & (part['lap_number'] < INVALID_LAP)]
+    part['lap_number'] = part['lap_number'].astype(int)
+    return part.drop_duplicates(['vehicle_id', 'lap_number']).set_index(['vehicle_id', 'lap_number'])
+
+
+def build_lap_boundaries(frames: Dict[str, pd.DataFrame], track_code: str, race_num: int) -> pd.DataFrame:
+    """
+    Combine lap start/end/time exports into one [start, end) window per lap
+
+    A missing start falls back to the end minus the lap time, then to the
+    previous lap's end; a missing end to the lap_time timestamp, the start
+    plus the lap time, then the next lap's start. Windows are clipped so a
+    vehicle's laps never overlap.
+
+    Args:
+        frames: Dictionary with 'time', 'start', 'end' DataFrames (from load_lap_boundaries)
+        track_code: Track code to stamp on each row
+        race_num: Race number to stamp on each row
+
+    Returns:
+        DataFrame with LAP_BOUNDARIES_COLUMNS (empty if the race has no boundary files)
+    """
+    parts = [
+        _boundary_times(frames[key], column)
+        for key, column in [('start', 'start_ms'), ('end', 'end_ms'), ('time', 'time_ms')]
+        if key in frames and not frames[key].empty
+    ]
+    if not parts:
+        return pd.DataFrame(columns=LAP_BOUNDARIES_COLUMNS)
+
+    laps = reduce(lambda left, right: left.combine_first(right), parts)
+    laps = laps.reindex(columns=['driver_number', 'start_ms', 'end_ms', 'time_ms', 'duration_ms'])
+    laps = laps.sort_index().reset_index()
+
+    end = laps['end_ms'].fillna(laps['time_ms'])
+    start = laps['start_ms'].fillna(end - laps['duration_ms'])
+    start = start.fillna(end.groupby(laps['vehicle_id']).shift(1))
+    end = end.fillna(start + laps['duration_ms'])
+
+    next_start = start.groupby(laps['vehicle_id']).shift(-1)
+    end = end.fillna(next_start).where(~(end > next_start), next_start)
+
+    laps['start_ms'], laps['end_ms'] = start, end
+    laps = laps[laps['start_ms'].notna() & laps['end_ms'].notna() & (laps['end_ms'] > laps['start_ms'])]
+
+    return pd.DataFrame({
+        'track_code': track_code,
+        'race_num': race_num,
+        'vehicle_id': laps['vehicle_id'],
+        'driver_number': laps['driver_number'].fillna(0).astype(int),
+        'lap_number': laps['lap_number'],
+        'start_time': pd.to_datetime(laps['start_ms'].astype(np.int64), unit='ms'),
+        'end_time': pd.to_datetime(laps['end_ms'].astype(np.int64), unit='ms'),
+        'lap_time_seconds': laps['duration_ms'].fillna(laps['end_ms'] - laps['start_ms']) / 1000
+    }).reset_index(drop=True)[LAP_BOUNDARIES_COLUMNS]
+
+
+def race_lap_boundaries(bundle: RaceBundle) -> Optional[pd.DataFrame]:
+    """
+    Lap windows for one race
+
+    Args:
+        bundle: Files for the race
+
+    Returns:
+        DataFrame with LAP_BOUNDARIES_COLUMNS, or None if the race has none
+    """
+    boundaries = build_lap_boundaries(bundle.load_lap_boundaries(), bundle.track_code, bundle.race_num)
+    return boundaries if not boundaries.empty else None
+
+
+class LapSegmenter:
+    """
+    Assign telemetry samples to laps from their timestamps
+
+    Each window is keyed as vehicle_code * span + (start - origin), which
+    sorts windows by vehicle and then time. A sample's key is built the
+    same way, so one np.searchsorted over every window finds its lap.
+    """
+
+    def __init__(self, boundaries: pd.DataFrame):
+        """
+        Args:
+            boundaries: DataFrame with vehicle_id, lap_number, start_time, end_time
+        """
+        start = boundaries['start_time'].to_numpy().astype('datetime64[ms]').astype(np.int64)
+        end = boundaries['end_time'].to_numpy().astype('datetime64[ms]').astype(np.int64)
+
+        self.vehicles = pd.Index(sorted(boundaries['vehicle_id'].astype(str).unique()))
+        codes = self.vehicles.get_indexer(boundaries['vehicle_id'].astype(str)).astype(np.int64)
+
+        self.origin = int(start.min()) if len(start) else 0
+        self.span = int(end.max()) - self.origin + 1 if len(end) else 1
+        if len(self.vehicles) * self.span >= 2 ** 62:
+            raise ValueError("Lap windows span too long a period to segment")
+
+        keys = codes * self.span + (start - self.origin)
+        order = np.argsort(keys, kind='stable')
+        self._starts = keys[order]
+        self._ends = (codes * self.span + (end - self.origin))[order]
+        self._laps = boundaries['lap_number'].to_numpy(dtype=np.int64)[order]
+
+    def __len__(self) -> int:
+        return len(self._laps)
+
+    def _vehicle_codes(self, vehicle_ids) -> np.ndarray:
+        values = pd.Series(vehicle_ids)
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Look up each category once instead of every row
+            lookup = self.vehicles.get_indexer(values.cat.categories.astype(str))
+            codes = values.cat.codes.to_numpy()
+            return np.where(codes >= 0, lookup[codes], -1)
+        return self.vehicles.get_indexer(values.astype(str))
+
+    def assign(self, vehicle_ids, time_ms: np.ndarray) -> np.ndarray:
+        """
+        Lap number of every sample
+
+        Args:
+            vehicle_ids: Vehicle id of each sample (strings or categorical)
+            time_ms: Epoch milliseconds of each sample
+
+        Returns:
+            int64 array of lap numbers (0 where a sample falls in no window)
+        """
+        offset = np.asarray(time_ms, dtype=np.int64) - self.origin
+        if not len(self):
+            return np.zeros(len(offset), dtype=np.int64)
+
+        codes = self._vehicle_codes(vehicle_ids).astype(np.int64)
+        inside = (codes >= 0) & (offset >= 0) & (offset < self.span)
+
+        keys = codes * self.span + offset
+        position = np.searchsorted(self._starts, keys, side='right') - 1
+        found = inside & (position >= 0)
+        position = np.clip(position, 0, None)
+        found &= keys < self._ends[position]
+
+        return np.where(found, self._laps[position], 0)
+
+    def resolve(self, vehicle_ids, time_ms: np.ndarray, ecu_laps) -> np.ndarray:
+        """
+        Lap of every sample: its window's lap, else its ECU lap counter
+
+        Args:
+            vehicle_ids: Vehicle id of each sample (strings or categorical)
+            time_ms: Epoch milliseconds of each sample
+            ecu_laps: ECU lap counter of each sample (may be missing or unknown)
+
+        Returns:
+            float64 array of lap numbers (NaN where neither gives a valid lap)
+        """
+        ecu_laps = pd.to_numeric(pd.Series(ecu_laps), errors='coerce').to_numpy(dtype=np.float64)
+        ecu_laps = np.where((ecu_laps >= 1) & (ecu_laps < INVALID_LAP), ecu_laps, np.nan)
+        assigned = self.assign(vehicle_ids, time_ms)
+        return np.where(assigned > 0, assigned, ecu_laps)
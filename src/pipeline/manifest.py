@@ -0,0 +1,212 @@
+"""
+Source file manifest for incremental ingestion
+
+Every source file of every ingested race is recorded in the
+ingest_manifest table with its size, mtime and a SHA-256 of its contents.
+A race is re-ingested when one of its files is new, missing or changed.
+
+Size and mtime are compared first and the stored hash is reused when they
+match, so only new or touched files are ever hashed. A file that was
+touched but not modified keeps its race unchanged.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from src.utils import RaceBundle
+
+
+HASH_BLOCK_SIZE = 1 << 20
+
+MANIFEST_COLUMNS = [
+    'file_path', 'track_code', 'race_num', 'file_type',
+    'file_size', 'file_mtime', 'content_hash', 'ingested_at'
+]
+
+# Tables holding per-race rows, cleared when a race is re-ingested or removed
+RACE_TABLES = [
+    'race_results', 'lap_times', 'lap_splits', 'best_laps', 'best_laps_long',
+    'weather', 'lap_boundaries', 'telemetry_aggregates', 'corner_events'
+]
+
+RaceKey = Tuple[str, int]
+
+
+@dataclass
+class IngestPlan:
+    """Which races an incremental run has to touch"""
+    changed: List[RaceBundle] = field(default_factory=list)
+    unchanged: List[RaceBundle] = field(default_factory=list)
+    removed: List[RaceKey] = field(default_factory=list)
+    signatures: Dict[RaceKey, List[dict]] = field(default_factory=dict)
+
+
+def file_hash(file_path: Path) -> str:
+    """
+    SHA-256 of a file's contents, read in fixed-size blocks
+
+    Args:
+        file_path: File to hash
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(conn) -> Dict[str, dict]:
+    """
+    Read the recorded manifest
+
+    Args:
+        conn: DuckDB connection
+
+    Returns:
+        Dictionary of file_path -> manifest row
+    """
+    df = conn.execute(f"SELECT {', '.join(MANIFEST_COLUMNS)} FROM ingest_manifest").df()
+    return {row['file_path']: row for row in df.to_dict('records')}
+
+
+def race_signature(bundle: RaceBundle, recorded: Dict[str, dict]) -> List[dict]:
+    """
+    Current manifest rows for one race's files
+
+    Args:
+        bundle: Files for the race
+        recorded: Manifest from load_manifest(), used to skip re-hashing
+
+    Returns:
+        One manifest row per source file
+    """
+    rows = []
+
+    for file_type, file_path in sorted(bundle.files.items()):
+        if file_path is None:
+            continue
+
+        stat = file_path.stat()
+        previous = recorded.get(str(file_path))
+        if previous is not None and previous['file_size'] == stat.st_size \
+                and previous['file_mtime'] == stat.st_mtime:
+            content_hash = previous['content_hash']
+        else:
+            content_hash = file_hash(file_path)
+
+        rows.append({
+            'file_path': str(file_path),
+            'track_code': bundle.track_code,
+            'race_num': bundle.race_num,
+            'file_type': file_type,
+            'file_size': stat.st_size,
+            'file_mtime': stat.st_mtime,
+            'content_hash': content_hash,
+            'ingested_at': None
+        })
+
+    return rows
+
+
+def plan_ingest(conn, bundles: List[RaceBundle]) -> IngestPlan:
+    """
+    Compare every race's files with the manifest
+
+    Args:
+        conn: DuckDB connection
+        bundles: Races from get_race_bundles()
+
+    Returns:
+        IngestPlan with changed, unchanged and removed races
+    """
+    recorded = load_manifest(conn)
+    plan = IngestPlan()
+
+    recorded_by_race: Dict[RaceKey, Dict[str, str]] = {}
+    for row in recorded.values():
+        key = (row['track_code'], int(row['race_num']))
+        recorded_by_race.setdefault(key, {})[row['file_path']] = row['content_hash']
+
+    for bundle in bundles:
+        key = (bundle.track_code, bundle.race_num)
+        rows = race_signature(bundle, recorded)
+        plan.signatures[key] = rows
+
+        current = {row['file_path']: row['content_hash'] for row in rows}
+        if current == recorded_by_race.get(key):
+            plan.unchanged.append(bundle)
+        else:
+            plan.changed.append(bundle)
+
+    present = set(plan.signatures)
+    plan.removed = sorted(key for key in recorded_by_race if key not in present)
+
+    return plan
+
+
+def _races_frame(races: List[RaceKey]) -> pd.DataFrame:
+    return pd.DataFrame(races, columns=['track_code', 'race_num'])
+
+
+def delete_races(conn, table: str, races: List[RaceKey]):
+    """
+    Delete one table's rows for the given races
+
+    Args:
+        conn: DuckDB connection
+        table: Table with track_code and race_num columns
+        races: (track_code, race_num) pairs
+    """
+    if not races:
+        return
+
+    races_df = _races_frame(races)
+    conn.execute(f"""
+        DELETE FROM {table}
+        WHERE EXISTS (
+            SELECT 1 FROM races_df r
+            WHERE r.track_code = {table}.track_code AND r.race_num = {table}.race_num
+        )
+    """)
+
+
+def remove_races(conn, races: List[RaceKey]):
+    """
+    Drop every per-race row and manifest entry for races whose files are gone
+
+    Args:
+        conn: DuckDB connection
+        races: (track_code, race_num) pairs
+    """
+    for table in RACE_TABLES + ['ingest_manifest']:
+        delete_races(conn, table, races)
+
+
+def record_races(conn, signatures: Dict[RaceKey, List[dict]]):
+    """
+    Store the manifest rows for ingested races, replacing their old entries
+
+    Args:
+        conn: DuckDB connection
+        signatures: Output of plan_ingest().signatures (or a subset of it)
+    """
+    if not signatures:
+        return
+
+    delete_races(conn, 'ingest_manifest', list(signatures))
+
+    rows = [row for race_rows in signatures.values() for row in race_rows]
+    if not rows:
+        return
+
+    manifest_df = pd.DataFrame(rows, columns=MANIFEST_COLUMNS)
+    manifest_df['ingested_at'] = datetime.now()
+    conn.execute(f"INSERT INTO ingest_manifest SELECT {', '.join(MANIFEST_COLUMNS)} FROM manifest_df")
@@ -0,0 +1,257 @@
+"""
+Long-to-wide telemetry pivot for GR Cup Data Pipeline
+
+Turns long-format telemetry (one row per channel sample) into one
+contiguous NumPy array per channel, aligned on a shared time axis and
+split by (vehicle, lap). Rows are encoded to integer codes and placed with
+a single sort and scatter, which avoids the memory blow-up of a pandas
+pivot_table over an 18M-row race.
+
+Given the race's lap boundary windows, samples are split into laps by
+timestamp (LapSegmenter), the ECU lap counter only filling in outside
+every window.
+"""
+
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.config import TELEMETRY_FIELDS, TELEMETRY_CHUNK_ROWS
+from src.pipeline.telemetry import iter_telemetry_chunks, INVALID_LAP
+from src.pipeline.lap_segmentation import LapSegmenter, timestamps_to_ms
+
+
+@dataclass
+class LapTraces:
+    """Aligned channel traces for one (vehicle, lap)"""
+    vehicle_id: str
+    lap: int
+    time_ms: np.ndarray
+    channels: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.time_ms)
+
+
+class PivotedTelemetry:
+    """
+    Wide telemetry for many (vehicle, lap) groups
+
+    values holds one C-contiguous row per channel, so every per-lap slice
+    returned by lap() is a contiguous view rather than a copy.
+    """
+
+    def __init__(self, channels: List[str], vehicle_ids: np.ndarray, laps: np.ndarray,
+                 time_ms: np.ndarray, values: np.ndarray):
+        self.channels = list(channels)
+        self.time_ms = time_ms
+        self.values = values
+
+        # One index row per (vehicle, lap) with its [start, stop) sample range
+        if len(time_ms):
+            starts = np.flatnonzero(np.r_[True, (vehicle_ids[1:] != vehicle_ids[:-1]) | (laps[1:] != laps[:-1])])
+        else:
+            starts = np.array([], dtype=np.int64)
+        self.index = pd.DataFrame({
+            'vehicle_id': vehicle_ids[starts],
+            'lap': laps[starts],
+            'start': starts,
+            'stop': np.r_[starts[1:], len(time_ms)].astype(np.int64)
+        })
+        self._positions = {
+            (v, int(l)): i for i, (v, l) in enumerate(zip(self.index['vehicle_id'], self.index['lap']))
+        }
+
+    def channel(self, name: str) -> np.ndarray:
+        """Full contiguous array for one channel across every lap"""
+        return self.values[self.channels.index(name)]
+
+    def lap(self, vehicle_id: str, lap: int, channels: Optional[List[str]] = None) -> LapTraces:
+        """
+        Get aligned traces for a single (vehicle, lap)
+
+        Args:
+            vehicle_id: Vehicle identifier (e.g. 'GR86-004-78')
+            lap: Lap number
+            channels: Subset of channels to return (all if None)
+
+        Returns:
+            LapTraces with views into the pivoted arrays
+        """
+        position = self._positions.get((vehicle_id, int(lap)))
+        if position is None:
+            raise KeyError(f"No telemetry for vehicle {vehicle_id} lap {lap}")
+
+        start, stop = self.index.iloc[position][['start', 'stop']]
+        return LapTraces(
+            vehicle_id=vehicle_id,
+            lap=int(lap),
+            time_ms=self.time_ms[start:stop],
+            channels={
+                name: self.values[self.channels.index(name), start:stop]
+                for name in (channels or self.channels)
+            }
+        )
+
+    def __iter__(self) -> Iterator[LapTraces]:
+        for vehicle_id, lap in self._positions:
+            yield self.lap(vehicle_id, lap)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+def encode_telemetry(df: pd.DataFrame, channels: List[str], vehicle_lookup: Dict[str, int],
+                     segmenter: Optional[LapSegmenter] = None) -> Tuple[np.ndarray, ...]:
+    """
+    Encode long-format telemetry rows as compact integer/float arrays
+
+    Args:
+        df: Long-format telemetry (vehicle_id, lap, timestamp, telemetry_name, telemetry_value)
+        channels: Channels to keep, in output order
+        vehicle_lookup: vehicle_id -> code mapping, extended in place
+        segmenter: Lap windows that place samples by timestamp (ECU lap counter if None)
+
+    Returns:
+        Tuple of (vehicle codes, laps, time_ms, channel codes, values)
+    """
+    channel_codes = pd.Categorical(df['telemetry_name'].astype(str), categories=channels).codes
+    df, channel_codes = df[channel_codes >= 0], channel_codes[channel_codes >= 0]
+    time_ms = timestamps_to_ms(df['timestamp'])
+
+    if segmenter is not None:
+        lap = segmenter.resolve(df['vehicle_id'], time_ms, df['lap'])
+    else:
+        lap = pd.to_numeric(df['lap'], errors='coerce').to_numpy()
+    keep = (lap >= 1) & (lap < INVALID_LAP)
+    df = df[keep]
+
+    vehicles = pd.Categorical(df['vehicle_id'].astype(str))
+    for vehicle_id in vehicles.categories:
+        vehicle_lookup.setdefault(vehicle_id, len(vehicle_lookup))
+    remap = np.array([vehicle_lookup[v] for v in vehicles.categories], dtype=np.int32)
+
+    return (
+        remap[vehicles.codes] if len(remap) else np.array([], dtype=np.int32),
+        lap[keep].astype(np.int32),
+        time_ms[keep],
+        channel_codes[keep].astype(np.int16),
+        df['telemetry_value'].to_numpy(dtype=np.float64)
+    )
+
+
+def pivot_encoded(vehicle_codes: np.ndarray, laps: np.ndarray, time_ms: np.ndarray,
+                  channel_codes: np.ndarray, values: np.ndarray,
+                  channels: List[str], vehicle_ids: List[str],
+                  fill: bool = True, dtype=np.float64) -> PivotedTelemetry:
+    """
+    Pivot encoded telemetry arrays onto a shared time axis per (vehicle, lap)
+
+    Args:
+        vehicle_codes, laps, time_ms, channel_codes, values: Output of encode_telemetry
+        channels: Channel names indexed by channel code
+        vehicle_ids: Vehicle ids indexed by vehicle code
+        fill: Forward-fill channels that were not sampled at a given instant
+            (never across a lap boundary)
+        dtype: Output value dtype
+
+    Returns:
+        PivotedTelemetry
+    """
+    order = np.lexsort((time_ms, laps, vehicle_codes))
+    v, l, t = vehicle_codes[order], laps[order], time_ms[order]
+
+    # Each distinct (vehicle, lap, timestamp) becomes one row of the time axis
+    new_row = np.ones(len(t), dtype=bool)
+    new_row[1:] = (v[1:] != v[:-1]) | (l[1:] != l[:-1]) | (t[1:] != t[:-1])
+    row_ids = np.cumsum(new_row) - 1
+    n_rows = int(row_ids[-1]) + 1 if len(row_ids) else 0
+
+    wide = np.full((len(channels), n_rows), np.nan, dtype=dtype)
+    wide[channel_codes[order], row_ids] = values[order]
+
+    row_vehicle, row_lap, row_time = v[new_row], l[new_row], t[new_row]
+
+    if fill and n_rows:
+        lap_start = np.r_[True, (row_vehicle[1:] != row_vehicle[:-1]) | (row_lap[1:] != row_lap[:-1])]
+        first_row = np.maximum.accumulate(np.where(lap_start, np.arange(n_rows), 0))
+
+        positions = np.where(np.isnan(wide), 0, np.arange(n_rows))
+        last_valid = np.maximum.accumulate(positions, axis=1)
+        filled = np.take_along_axis(wide, last_valid, axis=1)
+        wide = np.where(last_valid >= first_row, filled, np.nan).astype(dtype, copy=False)
+
+    return PivotedTelemetry(
+        channels=channels,
+        vehicle_ids=np.asarray(vehicle_ids, dtype=object)[row_vehicle],
+        laps=row_lap,
+        time_ms=row_time,
+        values=np.ascontiguousarray(wide)
+    )
+
+
+def _segmenter(lap_boundaries: Optional[pd.DataFrame]) -> Optional[LapSegmenter]:
+    return LapSegmenter(lap_boundaries) if lap_boundaries is not None else None
+
+
+def pivot_telemetry(df: pd.DataFrame, channels: Optional[List[str]] = None, fill: bool = True,
+                    lap_boundaries: Optional[pd.DataFrame] = None) -> PivotedTelemetry:
+    """
+    Pivot a long-format telemetry DataFrame
+
+    Args:
+        df: Long-format telemetry (vehicle_id, lap, timestamp, telemetry_name, telemetry_value)
+        channels: Channels to pivot (defaults to TELEMETRY_FIELDS)
+        fill: Forward-fill missing samples within a lap
+        lap_boundaries: Lap windows that place samples by timestamp (ECU lap counter if None)
+
+    Returns:
+        PivotedTelemetry
+    """
+    channels = list(channels or TELEMETRY_FIELDS)
+    vehicle_lookup = {}
+    encoded = encode_telemetry(df, channels, vehicle_lookup, _segmenter(lap_boundaries))
+
+    return pivot_encoded(*encoded, channels=channels,
+                         vehicle_ids=list(vehicle_lookup), fill=fill)
+
+
+def pivot_race(track_code: str, race_num: int, channels: Optional[List[str]] = None,
+               vehicle_id: Optional[str] = None, fill: bool = True,
+               chunk_rows: int = TELEMETRY_CHUNK_ROWS,
+               lap_boundaries: Optional[pd.DataFrame] = None) -> PivotedTelemetry:
+    """
+    Pivot a race's telemetry file, encoding it chunk by chunk
+
+    Only compact numeric arrays are kept between chunks, never the raw
+    string columns.
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+        channels: Channels to pivot (defaults to TELEMETRY_FIELDS)
+        vehicle_id: Only pivot this vehicle (all if None)
+        fill: Forward-fill missing samples within a lap
+        chunk_rows: Rows per CSV chunk
+        lap_boundaries: Lap windows that place samples by timestamp (ECU lap counter if None)
+
+    Returns:
+        PivotedTelemetry
+    """
+    channels = list(channels or TELEMETRY_FIELDS)
+    segmenter = _segmenter(lap_boundaries)
+    vehicle_lookup = {}
+    parts = []
+
+    for chunk in iter_telemetry_chunks(track_code, race_num, channels=channels,
+                                       vehicle_id=vehicle_id, chunk_rows=chunk_rows):
+        parts.append(encode_telemetry(chunk, channels, vehicle_lookup, segmenter))
+
+    if parts:
+        encoded = [np.concatenate(arrays) for arrays in zip(*parts)]
+    else:
+        encoded = [np.array([], dtype=dt) for dt in (np.int32, np.int32, np.int64, np.int16, np.float64)]
+
+    return pivot_encoded(*encoded, channels=channels,
+                         vehicle_ids=list(vehicle_lookup), fill=fill)
@@ -0,0 +1,317 @@
+"""
+Distance-based resampling of lap traces for GR Cup Data Pipeline
+
+Telemetry is sampled in time, but comparing drivers needs every lap on the
+same lap distance axis (Laptrigger_lapdist_dls). Each (vehicle, lap) is
+interpolated onto a fixed-step distance grid, giving one (laps, points)
+array per channel for a whole race:
+
+    RESAMPLED_DIR/COTA/R1_5m.npz
+        distance_m             (points,)
+        vehicle_id, lap        (laps,)
+        vcar, aps, ...         (laps, points) float32
+        elapsed_s              seconds since the lap's first sample
+
+All laps are interpolated with one np.interp call per channel: lap i is
+shifted by i * stride along the distance axis, so the laps sit end to end
+on one increasing axis and never interpolate into each other. Overlays,
+delta-time and microsector analysis are then plain array math over rows.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import RESAMPLED_DIR, RESAMPLE_STEP_M, TELEMETRY_FIELDS, TRACKS
+from src.utils import RaceBundle, get_telemetry_file_path
+from src.pipeline.pivot import LapTraces
+from src.pipeline.telemetry_cache import race_lap_samples
+
+
+DISTANCE_CHANNEL = "Laptrigger_lapdist_dls"
+ELAPSED_CHANNEL = "elapsed_s"
+RESAMPLED_DTYPE = np.float32
+
+# Discrete channels hold the last sample instead of interpolating between gears
+STEP_CHANNELS = {"gear"}
+
+METRES_PER_MILE = 1609.344
+
+
+def distance_grid(track_code: str, step_m: float = RESAMPLE_STEP_M) -> np.ndarray:
+    """
+    Fixed-step lap distance grid for a track
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        step_m: Grid step in metres
+
+    Returns:
+        float64 array 0, step, 2*step, ... up to the track length
+    """
+    return np.arange(0.0, TRACKS[track_code]['length_miles'] * METRES_PER_MILE, step_m)
+
+
+def resampled_path(track_code: str, race_num: int, step_m: float = RESAMPLE_STEP_M) -> Path:
+    """npz file holding one race's resampled laps"""
+    return RESAMPLED_DIR / track_code / f"R{race_num}_{step_m:g}m.npz"
+
+
+def _source_signature(track_code: str, race_num: int) -> Optional[dict]:
+    file_path = get_telemetry_file_path(track_code, race_num)
+    if file_path is None:
+        return None
+    stat = file_path.stat()
+    return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def _cached_meta(path: Path) -> dict:
+    with np.load(path) as data:
+        return json.loads(str(data['meta']))
+
+
+def _interp_channel(values: np.ndarray, xp: np.ndarray, lap_of: np.ndarray, targets: np.ndarray,
+                    step: bool) -> np.ndarray:
+    finite = np.isfinite(values)
+    xp, fp, lap_of = xp[finite], values[finite], lap_of[finite]
+
+    out = np.full(targets.shape, np.nan, dtype=RESAMPLED_DTYPE)
+    if not len(xp):
+        return out
+
+    flat = targets.ravel()
+    if step:
+        held = fp[np.clip(np.searchsorted(xp, flat, side='right') - 1, 0, None)]
+    else:
+        held = np.interp(flat, xp, fp)
+    out[:] = held.reshape(targets.shape)
+
+    # Only fill the distance each lap actually covers for this channel
+    n_laps = targets.shape[0]
+    lo = np.full(n_laps, np.inf)
+    hi = np.full(n_laps, -np.inf)
+    np.minimum.at(lo, lap_of, xp)
+    np.maximum.at(hi, lap_of, xp)
+    out[(targets < lo[:, None]) | (targets > hi[:, None])] = np.nan
+    return out
+
+
+def resample_samples(lap_index: np.ndarray, distance: np.ndarray, time_ms: np.ndarray,
+                     channels: Dict[str, np.ndarray], n_laps: int, grid: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Resample many laps onto a distance grid in one pass per channel
+
+    Samples must be grouped by lap and in time order within a lap. Samples
+    before a lap's distance reset (the tail of the previous lap) are
+    dropped, and the remaining distance is made non-decreasing so brief
+    backwards jitter does not fold the trace.
+
+    Args:
+        lap_index: Lap row (0 .. n_laps - 1) of every sample
+        distance: Lap distance of every sample (metres)
+        time_ms: Epoch milliseconds of every sample
+        channels: Channel name -> per-sample values
+        n_laps: Number of lap rows
+        grid: Distance grid (metres, increasing)
+
+    Returns:
+        Dictionary of channel name -> (n_laps, len(grid)) float32 arrays,
+        plus ELAPSED_CHANNEL; points a lap does not cover are NaN
+    """
+    lap_index = np.asarray(lap_index, dtype=np.int64)
+    distance = np.asarray(distance, dtype=np.float64)
+    positions = np.arange(len(distance))
+
+    # First sample at each lap's minimum distance marks the reset to zero
+    usable = np.isfinite(distance) & (distance >= 0)
+    low = np.full(n_laps, np.inf)
+    np.minimum.at(low, lap_index[usable], distance[usable])
+    at_low = usable & (distance == low[lap_index])
+    reset = np.full(n_laps, len(distance))
+    np.minimum.at(reset, lap_index[at_low], positions[at_low])
+    keep = usable & (positions >= reset[lap_index])
+
+    stride = max(float(distance[keep].max()) if keep.any() else 0.0, float(grid[-1]) if len(grid) else 0.0) + 1.0
+    offsets = np.arange(n_laps) * stride
+    targets = grid[None, :] + offsets[:, None]
+
+    kept = positions[keep]
+    lap_of = lap_index[kept]
+    axis = np.maximum.accumulate(distance[kept] + offsets[lap_of])
+    increasing = np.r_[True, np.diff(axis) > 0] if len(axis) else np.zeros(0, dtype=bool)
+    kept, lap_of, axis = kept[increasing], lap_of[increasing], axis[increasing]
+
+    time_ms = np.asarray(time_ms, dtype=np.int64)
+    lap_start = np.full(n_laps, np.iinfo(np.int64).max)
+    np.minimum.at(lap_start, lap_index, time_ms)
+    elapsed = (time_ms[kept] - lap_start[lap_of]) / 1000.0
+
+    resampled = {
+        name: _interp_channel(np.asarray(values, dtype=np.float64)[kept], axis, lap_of, targets,
+                              name in STEP_CHANNELS)
+        for name, values in channels.items()
+    }
+    resampled[ELAPSED_CHANNEL] = _interp_channel(elapsed, axis, lap_of, targets, False)
+    return resampled
+
+
+def resample_lap(traces: LapTraces, grid: np.ndarray, channels: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Resample one (vehicle, lap) slice onto a distance grid
+
+    Args:
+        traces: Lap traces including DISTANCE_CHANNEL (from pivot or the lap cache)
+        grid: Distance grid (metres, increasing)
+        channels: Channels to resample (all but the distance channel if None)
+
+    Returns:
+        Dictionary of channel name -> len(grid) float32 array, plus ELAPSED_CHANNEL
+    """
+    channels = channels or [name for name in traces.channels if name != DISTANCE_CHANNEL]
+    resampled = resample_samples(
+        np.zeros(len(traces), dtype=np.int64), traces.channels[DISTANCE_CHANNEL], traces.time_ms,
+        {name: traces.channels[name] for name in channels}, 1, grid
+    )
+    return {name: values[0] for name, values in resampled.items()}
+
+
+@dataclass
+class ResampledLaps:
+    """Distance-indexed traces for every lap of a race (row i of each array is laps.iloc[i])"""
+    distance_m: np.ndarray
+    laps: pd.DataFrame
+    channels: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.laps)
+
+    def lap_row(self, vehicle_id: str, lap: int) -> int:
+        """Row of a (vehicle, lap) in the channel arrays"""
+        match = np.flatnonzero((self.laps['vehicle_id'].to_numpy() == vehicle_id)
+                               & (self.laps['lap'].to_numpy() == int(lap)))
+        if not len(match):
+            raise KeyError(f"No resampled telemetry for vehicle {vehicle_id} lap {lap}")
+        return int(match[0])
+
+    def lap(self, vehicle_id: str, lap: int, channels: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Get one lap's distance-indexed traces
+
+        Args:
+            vehicle_id: Vehicle identifier (e.g. 'GR86-004-78')
+            lap: Lap number
+            channels: Channels to return (all resampled channels if None)
+
+        Returns:
+            Dictionary of channel name -> array aligned with distance_m
+        """
+        row = self.lap_row(vehicle_id, lap)
+        return {name: self.channels[name][row] for name in (channels or self.channels)}
+
+    def save(self, path: Path, source: Optional[dict] = None):
+        """Write to a compressed npz file, recording the telemetry file signature"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f"_staging_{path.name}")
+        with open(staging, 'wb') as f:
+            np.savez_compressed(
+                f,
+                distance_m=self.distance_m,
+                vehicle_id=self.laps['vehicle_id'].to_numpy(dtype=str),
+                lap=self.laps['lap'].to_numpy(dtype=np.int64),
+                meta=np.array(json.dumps({'channels': list(self.channels), 'source': source})),
+                **{f"channel_{name}": values for name, values in self.channels.items()}
+            )
+        staging.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Tuple['ResampledLaps', dict]:
+        """Read a file written by save(); returns the laps and their metadata"""
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            resampled = cls(
+                distance_m=data['distance_m'],
+                laps=pd.DataFrame({'vehicle_id': data['vehicle_id'].astype(object), 'lap': data['lap']}),
+                channels={name: data[f"channel_{name}"] for name in meta['channels']}
+            )
+        return resampled, meta
+
+
+def resample_race(track_code: str, race_num: int, channels: Optional[List[str]] = None,
+                  step_m: float = RESAMPLE_STEP_M, use_cache: bool = True) -> ResampledLaps:
+    """
+    Resample every lap of a race onto the track's distance grid
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+        channels: Channels to resample (TELEMETRY_FIELDS except lap distance if None)
+        step_m: Grid step in metres
+        use_cache: Read and write the npz cache under RESAMPLED_DIR
+
+    Returns:
+        ResampledLaps with one row per valid (vehicle, lap)
+    """
+    channels = list(channels or [name for name in TELEMETRY_FIELDS if name != DISTANCE_CHANNEL])
+    path = resampled_path(track_code, race_num, step_m)
+    source = _source_signature(track_code, race_num)
+
+    if use_cache and path.exists():
+        cached, meta = ResampledLaps.load(path)
+        if meta.get('source') == source and all(name in cached.channels for name in channels):
+            keep = channels + [ELAPSED_CHANNEL]
+            return ResampledLaps(cached.distance_m, cached.laps, {name: cached.channels[name] for name in keep})
+
+    laps, lap_index, time_ms, values = race_lap_samples(track_code, race_num, [DISTANCE_CHANNEL] + channels)
+    distance = values.pop(DISTANCE_CHANNEL)
+
+    grid = distance_grid(track_code, step_m)
+    resampled = ResampledLaps(
+        distance_m=grid,
+        laps=laps,
+        channels=resample_samples(lap_index, distance, time_ms, values, len(laps), grid)
+    )
+
+    if use_cache:
+        resampled.save(path, source)
+    return resampled
+
+
+def build_resampled(bundles: List[RaceBundle], step_m: float = RESAMPLE_STEP_M) -> int:
+    """
+    Resample every race with telemetry whose cached grid is missing or stale
+
+    Args:
+        bundles: Races from get_race_bundles()
+        step_m: Grid step in metres
+
+    Returns:
+        Number of races resampled
+    """
+    built = 0
+
+    for bundle in bundles:
+        track_code = bundle.track_code
+        race_num = bundle.race_num
+
+        if not bundle.has_telemetry:
+            continue
+
+        path = resampled_path(track_code, race_num, step_m)
+        if path.exists() and _cached_meta(path).get('source') == _source_signature(track_code, race_num):
+            print(f"  = {track_code} Race {race_num}: Up to date")
+            continue
+
+        try:
+            resampled = resample_race(track_code, race_num, step_m=step_m, use_cache=False)
+            resampled.save(path, _source_signature(track_code, race_num))
+            built += 1
+            print(f"  + {track_code} Race {race_num}: {len(resampled)} laps x {len(resampled.distance_m)} points")
+
+        except Exception as e:
+            print(f"  - {track_code} Race {race_num}: Error - {e}")
+
+    return built
@@ -0,0 +1,148 @@
+"""
+Dependency-aware stage scheduler for GR Cup Data Pipeline
+
+Each stage declares the tables (or other named resources, such as the
+Parquet telemetry store) it reads and writes. A stage depends on every
+earlier-declared stage that writes something it reads or writes, or
+reads something it writes, so stages touching disjoint tables run
+concurrently while stats are only computed once their inputs are loaded
+and no stage overwrites a table an earlier one is still reading.
+
+Stages run on a thread pool, each with its own DuckDB cursor, and are
+timed through the run recorder.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+import time
+
+from src.utils.instrumentation import run_recorder
+
+
+@dataclass
+class Stage:
+    """One pipeline step and the resources it touches"""
+    name: str
+    func: Callable
+    reads: Tuple[str, ...] = ()
+    writes: Tuple[str, ...] = ()
+
+
+class StageGraph:
+    """
+    A set of stages and the dependencies implied by their reads/writes
+
+    Declaration order breaks ties: when two stages write the same
+    resource, or one reads what another writes, the earlier one runs first.
+    """
+
+    def __init__(self, stages: Sequence[Stage]):
+        self.stages = list(stages)
+        self._by_name = {stage.name: stage for stage in self.stages}
+        if len(self._by_name) != len(self.stages):
+            raise ValueError("Stage names must be unique")
+
+        self.dependencies: Dict[str, Set[str]] = {}
+        for i, stage in enumerate(self.stages):
+            touched = set(stage.reads) | set(stage.writes)
+            self.dependencies[stage.name] = {
+                earlier.name for earlier in self.stages[:i]
+                if set(earlier.writes) & touched or set(earlier.reads) & set(stage.writes)
+            }
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def downstream(self, name: str) -> Set[str]:
+        """A stage plus every stage that transitively depends on it"""
+        selected = {name}
+        for stage in self.stages:
+            if self.dependencies[stage.name] & selected:
+                selected.add(stage.name)
+        return selected
+
+    def select(self, only: Optional[List[str]] = None, start: Optional[str] = None) -> List[str]:
+        """
+        Choose which stages to run
+
+        Args:
+            only: Run exactly these stages
+            start: Run this stage and everything downstream of it
+
+        Returns:
+            Stage names in declaration order
+        """
+        for name in list(only or []) + ([start] if start else []):
+            if name not in self:
+                raise ValueError(f"Unknown stage '{name}' (choose from: {', '.join(self._by_name)})")
+
+        selected = set(self._by_name)
+        if only:
+            selected &= set(only)
+        if start:
+            selected &= self.downstream(start)
+
+        return [stage.name for stage in self.stages if stage.name in selected]
+
+    def run(self, conn, names: Optional[List[str]] = None, max_workers: int = 4) -> Dict[str, float]:
+        """
+        Run stages as soon as their dependencies have finished
+
+        Dependencies on stages that are not selected are ignored, so a
+        partial run works against whatever is already in the database.
+
+        Args:
+            conn: DuckDB connection (each stage gets its own cursor)
+            names: Stages to run (all if None)
+            max_workers: Maximum concurrent stages (1 = declaration order)
+
+        Returns:
+            Dictionary of stage name -> wall time in seconds
+
+        Raises:
+            The first exception raised by a stage, after running stages finish
+        """
+        names = list(names if names is not None else self._by_name)
+        pending = {name: self.dependencies[name] & set(names) for name in names}
+        timings: Dict[str, float] = {}
+        failure: Optional[BaseException] = None
+
+        def run_stage(stage: Stage) -> float:
+            started = time.perf_counter()
+            cursor = conn.cursor()
+            try:
+                with run_recorder.stage(stage.name):
+                    stage.func(cursor)
+            finally:
+                cursor.close()
+            return time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            running = {}
+
+            while pending or running:
+                if failure is None:
+                    ready = [name for name in names if name in pending and not pending[name]]
+                    for name in ready[:max(1, max_workers) - len(running)]:
+                        del pending[name]
+                        running[pool.submit(run_stage, self._by_name[name])] = name
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        timings[name] = future.result()
+                    except BaseException as e:
+                        failure = failure or e
+                        continue
+                    for deps in pending.values():
+                        deps.discard(name)
+
+        if failure is not None:
+            raise failure
+
+        return timings
@@ -0,0 +1,228 @@
+"""
+Driver card scores for GR Cup Data Pipeline
+
+Braking, cornering and throttle scores are computed for the whole season
+in one DuckDB query over the precomputed lap aggregates and corner events
+(no raw telemetry is read); racecraft and qualifying in one query over
+race_results, lap_times and best_laps_long. Each metric is reduced to a
+per-driver median within its partition (track for technique, race for
+results), turned into a z-score against the rest of the field there, so
+faster and slower circuits are comparable, and averaged across metrics
+and partitions. The mean z is then mapped onto the 0-100 card scale:
+
+    score = clamp(50 + SCORE_Z_SCALE * z, 0, 100)
+
+A driver with no data for a score gets 50, the field average. Given a set
+of drivers, only the partitions they appear in are normalized, which is all
+their scores depend on.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.pipeline.stat_partials import key_filter
+
+
+# Score -> (source table, column, direction); direction -1 means lower is better
+TECHNIQUE_METRICS: Dict[str, List[Tuple[str, str, int]]] = {
+    'braking_score': [
+        ('telemetry_aggregates', 'brake_max', 1),          # Peak brake pressure
+        ('corner_events', 'brake_release_seconds', 1),    # Progressive release (trail braking)
+    ],
+    'cornering_score': [
+        ('telemetry_aggregates', 'gforce_lat_avg', 1),     # Lateral grip used over the lap
+        ('corner_events', 'peak_lateral_g', 1),           # Lateral grip used mid-corner
+    ],
+    'throttle_score': [
+        ('telemetry_aggregates', 'throttle_avg', 1),       # Share of the lap on throttle
+        ('corner_events', 'throttle_pickup_seconds', -1),  # Apex to full throttle
+    ],
+}
+
+# Score -> (race_metrics column, direction), z-scored within each race
+RESULT_METRICS: Dict[str, List[Tuple[str, int]]] = {
+    'racecraft_score': [
+        ('positions_gained_per_lap', 1),  # Start-to-finish progress
+        ('overtakes_per_lap', 1),         # Positions won lap to lap
+    ],
+    'qualifying_score': [
+        ('best_lap_gap_pct', -1),         # One-lap pace: best lap vs the race's fastest
+    ],
+}
+
+SCORE_Z_SCALE = 15.0  # Score points per standard deviation from the field average
+NEUTRAL_SCORE = 50.0
+
+
+def _normalized_scores_sql(samples: str, partition: str, ctes: str = "",
+                           drivers: Optional[Iterable[int]] = None) -> str:
+    """
+    Per-driver 0-100 scores from (score, metric, direction, partition..., driver_number, value) samples
+
+    Samples are reduced to one median per driver and partition, z-scored
+    within the partition and averaged across metrics and partitions. With
+    drivers, other partitions are skipped and only those drivers returned.
+    """
+    pruned = selected = ""
+    if drivers is not None:
+        driver_filter = key_filter('driver_number', list(drivers))
+        pruned = f"WHERE ({partition}) IN (SELECT {partition} FROM samples WHERE {driver_filter})"
+        selected = f"WHERE {driver_filter}"
+    return f"""
+        WITH {ctes}samples AS (
+{samples}
+        ),
+        driver_values AS (
+            SELECT score, metric, direction, {partition}, driver_number, MEDIAN(value) as value
+            FROM samples
+            {pruned}
+            GROUP BY score, metric, direction, {partition}, driver_number
+        ),
+        normalized AS (
+            SELECT
+                score,
+                driver_number,
+                direction * (value - AVG(value) OVER w) / NULLIF(STDDEV_POP(value) OVER w, 0) as z
+            FROM driver_values
+            WINDOW w AS (PARTITION BY metric, {partition})
+        )
+        SELECT
+            driver_number,
+            score,
+            LEAST(GREATEST({NEUTRAL_SCORE} + {SCORE_Z_SCALE} * AVG(COALESCE(z, 0)), 0), 100) as value
+        FROM normalized
+        {selected}
+        GROUP BY driver_number, score
+    """
+
+
+def _pivot_scores(df: pd.DataFrame, scores: List[str]) -> pd.DataFrame:
+    pivoted = df.pivot(index='driver_number', columns='score', values='value')
+    return pivoted.reindex(columns=scores).reset_index().rename_axis(columns=None)
+
+
+def technique_scores_sql(drivers: Optional[Iterable[int]] = None) -> str:
+    """Season-wide technique query, one row per (driver_number, score), normalized per track"""
+    samples = "\n            UNION ALL\n".join(
+        f"""            SELECT '{score}' as score, '{table}.{column}' as metric, {direction} as direction,
+                   track_code, driver_number, {column} as value
+            FROM {table}
+            WHERE {column} IS NOT NULL AND driver_number > 0"""
+        for score, metrics in TECHNIQUE_METRICS.items()
+        for table, column, direction in metrics
+    )
+    return _normalized_scores_sql(samples, 'track_code', drivers=drivers)
+
+
+def technique_scores(conn, drivers: Optional[Iterable[int]] = None) -> pd.DataFrame:
+    """
+    Compute braking, cornering and throttle scores for every driver
+
+    Args:
+        conn: DuckDB connection with telemetry_aggregates and corner_events
+        drivers: Only score these driver numbers (every driver if None)
+
+    Returns:
+        DataFrame with driver_number and one column per TECHNIQUE_METRICS score
+        (drivers without telemetry are absent)
+    """
+    return _pivot_scores(conn.execute(technique_scores_sql(drivers)).df(), list(TECHNIQUE_METRICS))
+
+
+def race_metrics_sql() -> str:
+    """
+    Racecraft and qualifying metrics per (track, race, driver)
+
+    Running positions come from cumulative lap times: at every lap, drivers
+    who have timed every lap so far are ranked by elapsed time. Overtakes
+    are the positions won from one lap to the next; positions gained run
+    from the first timed lap to the classified finish. The best-lap gap
+    compares each driver's best lap (best_laps, else the fastest lap in
+    the results) with the fastest in the race.
+    """
+    return """
+        running AS (
+            SELECT
+                track_code, race_num, driver_number, lap_number,
+                SUM(lap_time_seconds) OVER driver_laps as elapsed,
+                ROW_NUMBER() OVER driver_laps as laps_timed,
+                lap_number - MIN(lap_number) OVER (PARTITION BY track_code, race_num) + 1 as race_lap
+            FROM lap_times
+            WHERE lap_time_seconds > 0
+            WINDOW driver_laps AS (PARTITION BY track_code, race_num, driver_number ORDER BY lap_number)
+        ),
+        positions AS (
+            SELECT
+                track_code, race_num, driver_number, lap_number,
+                RANK() OVER (PARTITION BY track_code, race_num, lap_number ORDER BY elapsed) as running_position
+            FROM running
+            WHERE laps_timed = race_lap
+        ),
+        moves AS (
+            SELECT
+                track_code, race_num, driver_number, lap_number, running_position,
+                LAG(running_position) OVER (
+                    PARTITION BY track_code, race_num, driver_number ORDER BY lap_number
+                ) - running_position as gained
+            FROM positions
+        ),
+        racecraft AS (
+            SELECT
+                track_code, race_num, driver_number,
+                ARG_MIN(running_position, lap_number) as first_position,
+                SUM(GREATEST(gained, 0)) as overtakes,
+                COUNT(gained) as lap_changes
+            FROM moves
+            GROUP BY track_code, race_num, driver_number
+        ),
+        best AS (
+            SELECT
+                rr.track_code, rr.race_num, rr.driver_number, rr.position, rr.laps,
+                COALESCE(bl.lap_time_seconds, rr.fastest_lap_time_seconds) as best_lap
+            FROM race_results rr
+            LEFT JOIN best_laps_long bl
+              ON bl.track_code = rr.track_code AND bl.race_num = rr.race_num
+             AND bl.driver_number = rr.driver_number AND bl.rank = 1
+            WHERE rr.position IS NOT NULL AND rr.driver_number > 0
+        ),
+        race_metrics AS (
+            SELECT
+                b.track_code, b.race_num, b.driver_number,
+                (rc.first_position - b.position) / NULLIF(b.laps, 0) as positions_gained_per_lap,
+                rc.overtakes / NULLIF(rc.lap_changes, 0) as overtakes_per_lap,
+                100 * (b.best_lap - MIN(b.best_lap) OVER race) / MIN(b.best_lap) OVER race as best_lap_gap_pct
+            FROM best b
+            LEFT JOIN racecraft rc
+              ON rc.track_code = b.track_code AND rc.race_num = b.race_num AND rc.driver_number = b.driver_number
+            WINDOW race AS (PARTITION BY b.track_code, b.race_num)
+        ),
+    """
+
+
+def result_scores_sql(drivers: Optional[Iterable[int]] = None) -> str:
+    """Season-wide results query, one row per (driver_number, score), normalized per race"""
+    samples = "\n            UNION ALL\n".join(
+        f"""            SELECT '{score}' as score, '{column}' as metric, {direction} as direction,
+                   track_code, race_num, driver_number, {column} as value
+            FROM race_metrics
+            WHERE {column} IS NOT NULL"""
+        for score, metrics in RESULT_METRICS.items()
+        for column, direction in metrics
+    )
+    return _normalized_scores_sql(samples, 'track_code, race_num', ctes=race_metrics_sql(), drivers=drivers)
+
+
+def result_scores(conn, drivers: Optional[Iterable[int]] = None) -> pd.DataFrame:
+    """
+    Compute racecraft and qualifying scores for every driver
+
+    Args:
+        conn: DuckDB connection with race_results, lap_times and best_laps_long
+        drivers: Only score these driver numbers (every driver if None)
+
+    Returns:
+        DataFrame with driver_number and one column per RESULT_METRICS score
+        (drivers without results are absent)
+    """
+    return _pivot_scores(conn.execute(result_scores_sql(drivers)).df(), list(RESULT_METRICS))
@@ -0,0 +1,167 @@
+"""
+Mergeable per-race partial aggregates for GR Cup driver and track stats
+
+Driver and track stats are merges over races, so each race is reduced once
+to counts, sums, sums of squares, minima and maxima:
+
+    driver_race_partials   one row per (track_code, race_num, driver_number)
+    track_race_partials    one row per (track_code, race_num)
+
+An incremental run recomputes the partials of the races it touched and
+re-merges only the drivers and tracks those races involve. Averages and
+standard deviations are rebuilt from the merged sums:
+
+    avg = sum / n        stddev = sqrt((sumsq - sum^2 / n) / (n - 1))
+
+A full run merges the same partials computed on the fly from the base
+tables, so it never depends on the stored ones being current.
+"""
+
+from typing import List, Optional, Set, Tuple
+
+from src.pipeline.manifest import RaceKey, _races_frame
+
+
+PARTIAL_TABLES = ['driver_race_partials', 'track_race_partials']
+
+# Keep only the given races (a registered races_df) when formatted into {races}
+RACES_JOIN = "SEMI JOIN races_df USING (track_code, race_num)"
+
+
+def driver_partials_sql(races: str = "") -> str:
+    """Per (track, race, driver) partials from race_results and lap_times"""
+    return f"""
+        WITH results AS (
+            SELECT
+                track_code, race_num, driver_number,
+                COUNT(*) as result_rows,
+                COUNT(position) as position_count,
+                SUM(position) as position_sum,
+                MIN(position) as position_min,
+                SUM(laps) as race_laps,
+                COUNT(*) FILTER (WHERE position <= 3) as podiums
+            FROM race_results
+            {races}
+            GROUP BY track_code, race_num, driver_number
+        ),
+        laps AS (
+            SELECT
+                track_code, race_num, driver_number,
+                COUNT(*) as lap_count,
+                SUM(lap_time_seconds) as lap_time_sum,
+                SUM(lap_time_seconds * lap_time_seconds) as lap_time_sumsq,
+                MIN(lap_time_seconds) as lap_time_min
+            FROM lap_times
+            {races}
+            WHERE lap_time_seconds IS NOT NULL
+              AND lap_time_seconds > 0
+            GROUP BY track_code, race_num, driver_number
+        )
+        SELECT
+            track_code, race_num, driver_number,
+            COALESCE(r.result_rows, 0) as result_rows,
+            COALESCE(r.position_count, 0) as position_count,
+            r.position_sum,
+            r.position_min,
+            r.race_laps,
+            COALESCE(r.podiums, 0) as podiums,
+            COALESCE(l.lap_count, 0) as lap_count,
+            l.lap_time_sum,
+            l.lap_time_sumsq,
+            l.lap_time_min
+        FROM results r
+        FULL OUTER JOIN laps l USING (track_code, race_num, driver_number)
+    """
+
+
+def track_partials_sql(races: str = "") -> str:
+    """Per (track, race) partials from lap_times"""
+    return f"""
+        SELECT
+            track_code, race_num,
+            COUNT(*) as lap_count,
+            SUM(lap_time_seconds) as lap_time_sum,
+            MIN(lap_time_seconds) as lap_time_min,
+            ARG_MIN(driver_number, (lap_time_seconds, driver_number)) as lap_time_min_driver,
+            MAX(top_speed) as top_speed_max
+        FROM lap_times
+        {races}
+        WHERE lap_time_seconds IS NOT NULL
+          AND lap_time_seconds > 0
+        GROUP BY track_code, race_num
+    """
+
+
+def partials_source(table: str, stored: bool) -> str:
+    """FROM clause for merging: the stored table, or the partials computed from every race"""
+    if stored:
+        return table
+    sql = driver_partials_sql() if table == 'driver_race_partials' else track_partials_sql()
+    return f"({sql}) {table}"
+
+
+def key_filter(column: str, keys: Optional[List]) -> str:
+    """SQL condition restricting column to keys (TRUE when keys is None)"""
+    if keys is None:
+        return "TRUE"
+    if not keys:
+        return "FALSE"
+    return f"{column} IN ({', '.join(repr(key) for key in sorted(keys))})"
+
+
+def refresh_partials(conn, races: Optional[List[RaceKey]] = None) -> Tuple[Set[int], Set[str]]:
+    """
+    Recompute stored partials for the given races
+
+    Races that no longer have rows (e.g. removed races) simply lose their
+    partials, and their drivers still count as affected.
+
+    Args:
+        conn: DuckDB connection
+        races: (track_code, race_num) pairs to refresh (every race if None)
+
+    Returns:
+        Tuple of (driver_numbers, track_codes) whose stats may have changed
+    """
+    if races is None:
+        for table in PARTIAL_TABLES:
+            conn.execute(f"DELETE FROM {table}")
+        conn.execute(f"INSERT INTO driver_race_partials {driver_partials_sql()}")
+        conn.execute(f"INSERT INTO track_race_partials {track_partials_sql()}")
+        drivers = conn.execute("SELECT DISTINCT driver_number FROM driver_race_partials").fetchall()
+        tracks = conn.execute("SELECT DISTINCT track_code FROM track_race_partials").fetchall()
+        return {row[0] for row in drivers}, {row[0] for row in tracks}
+
+    if not races:
+        return set(), set()
+
+    races_df = _races_frame(races)
+    affected = "SELECT DISTINCT driver_number FROM driver_race_partials SEMI JOIN races_df USING (track_code, race_num)"
+
+    drivers = {row[0] for row in conn.execute(affected).fetchall()}
+    for table in PARTIAL_TABLES:
+        conn.execute(f"DELETE FROM {table} WHERE (track_code, race_num) IN (SELECT track_code, race_num FROM races_df)")
+
+    conn.execute(f"INSERT INTO driver_race_partials {driver_partials_sql(RACES_JOIN)}")
+    conn.execute(f"INSERT INTO track_race_partials {track_partials_sql(RACES_JOIN)}")
+    drivers |= {row[0] for row in conn.execute(affected).fetchall()}
+
+    return drivers, {track_code for track_code, _ in races}
+
+
+def drivers_at_tracks(conn, tracks: Set[str]) -> Set[int]:
+    """
+    Every driver with stored partials at the given tracks
+
+    Args:
+        conn: DuckDB connection
+        tracks: Track codes
+
+    Returns:
+        Set of driver numbers
+    """
+    rows = conn.execute(f"""
+        SELECT DISTINCT driver_number FROM driver_race_partials
+        WHERE {key_filter('track_code', list(tracks))}
+    """).fetchall()
+    return {row[0] for row in rows}
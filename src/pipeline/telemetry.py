@@ -0,0 +1,421 @@
+"""
+Streaming telemetry aggregation for GR Cup Data Pipeline
+
+Telemetry files are long format (one row per channel sample) and hold
+8M-18M rows per race. They are read in bounded chunks and reduced to
+mergeable per-(vehicle, lap, channel) partials, so peak memory depends on
+the chunk size rather than the file size.
+
+When the race's lap boundary windows are available, every sample is
+placed in its lap by timestamp; the ECU lap counter is only used for
+samples outside every window.
+"""
+
+import pandas as pd
+import numpy as np
+import time
+from typing import Iterator, List, Optional
+
+from src.config import TELEMETRY_CHUNK_ROWS, LAP_AGGREGATION_METRICS
+from src.utils import get_telemetry_file_path
+from src.utils.instrumentation import record_loader
+from src.pipeline import telemetry_store
+from src.pipeline.lap_segmentation import INVALID_LAP, LapSegmenter, timestamps_to_ms
+
+
+# Columns needed from the raw telemetry CSV
+TELEMETRY_COLUMNS = ['vehicle_id', 'lap', 'timestamp', 'telemetry_name', 'telemetry_value']
+
+# Channels aggregated on absolute value (G-forces are signed)
+ABSOLUTE_CHANNELS = {'accx_can', 'accy_can'}
+
+# telemetry_aggregates column -> (telemetry channel, statistic)
+LAP_AGGREGATE_SPEC = {
+    'speed_max': ('vcar', 'max'),
+    'speed_avg': ('vcar', 'avg'),
+    'speed_min': ('vcar', 'min'),
+    'throttle_avg': ('aps', 'avg'),
+    'throttle_max': ('aps', 'max'),
+    'brake_avg': ('pbrake_f', 'avg'),
+    'brake_max': ('pbrake_f', 'max'),
+    'gforce_lat_max': ('accy_can', 'max'),
+    'gforce_lat_avg': ('accy_can', 'avg'),
+    'gforce_long_max': ('accx_can', 'max'),
+    'gforce_long_avg': ('accx_can', 'avg'),
+    'rpm_max': ('nmot', 'max'),
+    'rpm_avg': ('nmot', 'avg'),
+    'gear_max': ('gear', 'max'),
+}
+
+# Aggregate columns stored as INTEGER
+INTEGER_AGGREGATES = ['rpm_max', 'rpm_avg', 'gear_max']
+
+AGGREGATE_CHANNELS = sorted({channel for channel, _ in LAP_AGGREGATE_SPEC.values()})
+
+# Column order of the telemetry_aggregates table (without id)
+TELEMETRY_AGGREGATE_COLUMNS = [
+    'track_code', 'race_num', 'driver_number', 'lap_number',
+    *LAP_AGGREGATE_SPEC.keys(),
+    'telemetry_points'
+]
+
+assert set(LAP_AGGREGATION_METRICS) <= set(LAP_AGGREGATE_SPEC)
+
+
+def _plain_index(obj):
+    """Replace categorical index levels with plain values so partials merge cleanly"""
+    obj.index = pd.MultiIndex.from_arrays(
+        [np.asarray(obj.index.get_level_values(i)) for i in range(obj.index.nlevels)]
+    )
+    return obj
+
+
+def driver_number_from_vehicle_id(vehicle_ids: pd.Series) -> pd.Series:
+    """
+    Extract car numbers from vehicle ids (e.g. 'GR86-004-78' -> 78)
+
+    Args:
+        vehicle_ids: Series of vehicle id strings
+
+    Returns:
+        Series of driver numbers (0 when the id has no numeric suffix)
+    """
+    numbers = vehicle_ids.astype(str).str.extract(r'-(\d+)$')[0]
+    return pd.to_numeric(numbers, errors='coerce').fillna(0).astype(int)
+
+
+def iter_telemetry_chunks(track_code: str, race_num: int,
+                          channels: Optional[List[str]] = None,
+                          vehicle_id: Optional[str] = None,
+                          columns: Optional[List[str]] = None,
+                          chunk_rows: int = TELEMETRY_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Stream a race's telemetry in bounded chunks
+
+    Reads from the Parquet telemetry store when the race has been converted,
+    otherwise parses the raw CSV.
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+        channels: Only keep rows for these telemetry_name values (all if None)
+        vehicle_id: Only keep rows for this vehicle (all if None)
+        columns: Columns to read (defaults to TELEMETRY_COLUMNS)
+        chunk_rows: Maximum rows per chunk
+
+    Yields:
+        DataFrame chunks with categorical vehicle_id/telemetry_name
+    """
+    if telemetry_store.has_race(track_code, race_num):
+        chunks = telemetry_store.read_store_chunks(
+            track_code, race_num, vehicle_id=vehicle_id, channels=channels,
+            columns=columns, chunk_rows=chunk_rows
+        )
+        yield from _record_chunks("telemetry_store", chunks,
+                                  telemetry_store.store_size_bytes(track_code, race_num, vehicle_id))
+        return
+
+    file_path = get_telemetry_file_path(track_code, race_num)
+
+    if file_path is None:
+        raise FileNotFoundError(f"Telemetry file not found for {track_code} Race {race_num}")
+
+    wanted = set(columns or TELEMETRY_COLUMNS)
+
+    reader = pd.read_csv(
+        file_path,
+        usecols=lambda c: c in wanted,
+        dtype={
+            'vehicle_id': 'category',
+            'telemetry_name': 'category',
+            'telemetry_value': 'float64',
+            'lap': 'float64'
+        },
+        chunksize=chunk_rows
+    )
+
+    def filtered():
+        with reader:
+            for chunk in reader:
+                if channels is not None:
+                    chunk = chunk[chunk['telemetry_name'].isin(channels)]
+                if vehicle_id is not None:
+                    chunk = chunk[chunk['vehicle_id'] == vehicle_id]
+                yield chunk
+
+    yield from _record_chunks("telemetry_csv", filtered(), file_path.stat().st_size)
+
+
+def _record_chunks(loader: str, chunks: Iterator[pd.DataFrame], bytes_read: int) -> Iterator[pd.DataFrame]:
+    """Pass chunks through, recording rows and time spent reading them"""
+    rows = 0
+    reading = 0.0
+    started = time.perf_counter()
+
+    for chunk in chunks:
+        reading += time.perf_counter() - started
+        rows += len(chunk)
+        yield chunk
+        started = time.perf_counter()
+
+    reading += time.perf_counter() - started
+    record_loader(loader, rows=rows, bytes_read=bytes_read, wall_seconds=reading)
+
+
+def recover_laps(chunk: pd.DataFrame, segmenter: LapSegmenter) -> pd.Series:
+    """
+    Lap of every sample from its timestamp, falling back to the ECU lap counter
+
+    Args:
+        chunk: Long-format telemetry with vehicle_id, lap and timestamp
+        segmenter: Lap windows of the race
+
+    Returns:
+        Lap series aligned with the chunk (NaN where neither gives a valid lap)
+    """
+    time_ms = timestamps_to_ms(chunk['timestamp'])
+    return pd.Series(segmenter.resolve(chunk['vehicle_id'], time_ms, chunk['lap']), index=chunk.index)
+
+
+class LapAggregator:
+    """Merge per-(vehicle, lap) channel partials across telemetry chunks"""
+
+    def __init__(self, channels: Optional[List[str]] = None, segmenter: Optional[LapSegmenter] = None):
+        self.channels = channels or AGGREGATE_CHANNELS
+        self.segmenter = segmenter
+        self.partials = None
+        self.points = None
+        self.rows_read = 0
+
+    def update(self, chunk: pd.DataFrame):
+        """Fold one chunk of long-format telemetry into the running partials"""
+        self.rows_read += len(chunk)
+
+        if self.segmenter is not None:
+            chunk = chunk.assign(lap=recover_laps(chunk, self.segmenter))
+
+        lap = chunk['lap']
+        chunk = chunk[(lap >= 1) & (lap < INVALID_LAP)]
+        if chunk.empty:
+            return
+
+        laps = chunk['lap'].astype(int)
+        points = _plain_index(chunk.groupby([chunk['vehicle_id'], laps], observed=True).size())
+        self.points = points if self.points is None else points.add(self.points, fill_value=0)
+
+        samples = chunk[chunk['telemetry_name'].isin(self.channels)]
+        values = samples['telemetry_value']
+        values = values.where(~samples['telemetry_name'].isin(ABSOLUTE_CHANNELS), values.abs())
+
+        partial = _plain_index(values.groupby(
+            [samples['vehicle_id'], laps[samples.index], samples['telemetry_name']],
+            observed=True
+        ).agg(['count', 'sum', 'min', 'max']))
+
+        if self.partials is not None:
+            partial = pd.concat([self.partials, partial]).groupby(level=[0, 1, 2]).agg(
+                {'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max'}
+            )
+        self.partials = partial
+
+    def result(self, track_code: str, race_num: int) -> pd.DataFrame:
+        """
+        Build telemetry_aggregates rows from the merged partials
+
+        Args:
+            track_code: Track code to stamp on each row
+            race_num: Race number to stamp on each row
+
+        Returns:
+            DataFrame with TELEMETRY_AGGREGATE_COLUMNS
+        """
+        if self.partials is None or self.partials.empty:
+            return pd.DataFrame(columns=TELEMETRY_AGGREGATE_COLUMNS)
+
+        partials = self.partials.copy()
+        partials['avg'] = partials['sum'] / partials['count']
+        wide = partials[['avg', 'min', 'max']].unstack(level=2)
+
+        df = pd.DataFrame(index=self.points.index)
+        for column, (channel, stat) in LAP_AGGREGATE_SPEC.items():
+            key = (stat, channel)
+            df[column] = wide[key].reindex(df.index) if key in wide.columns else np.nan
+
+        for column in INTEGER_AGGREGATES:
+            df[column] = df[column].round().astype('Int64')
+
+        df['telemetry_points'] = self.points.astype(int)
+        df.index.names = ['vehicle_id', 'lap_number']
+        df = df.reset_index()
+
+        df['track_code'] = track_code
+        df['race_num'] = race_num
+        df['driver_number'] = driver_number_from_vehicle_id(df['vehicle_id'])
+
+        return df[TELEMETRY_AGGREGATE_COLUMNS]
+
+
+def aggregate_race_telemetry(track_code: str, race_num: int,
+                             chunk_rows: int = TELEMETRY_CHUNK_ROWS,
+                             lap_boundaries: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Compute lap-level telemetry aggregates for one race without loading the file
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+        chunk_rows: Maximum rows held in memory at once
+        lap_boundaries: Lap windows that place samples by timestamp (ECU lap counter if None)
+
+    Returns:
+        DataFrame with one row per (vehicle, lap)
+    """
+    columns = ['vehicle_id', 'lap', 'telemetry_name', 'telemetry_value']
+    segmenter = None
+    if lap_boundaries is not None:
+        segmenter = LapSegmenter(lap_boundaries)
+        columns.append('timestamp')
+
+    aggregator = LapAggregator(segmenter=segmenter)
+
+    for chunk in iter_telemetry_chunks(track_code, race_num, columns=columns, chunk_rows=chunk_rows):
+        aggregator.update(chunk)
+
+    return aggregator.result(track_code, race_num)
+
+
+def _telemetry_source_sql(track_code: str, race_num: int) -> str:
+    """DuckDB table function that scans a race's telemetry (store first, then CSV)"""
+    if telemetry_store.has_race(track_code, race_num):
+        race_path = telemetry_store.store_race_path(track_code, race_num).as_posix()
+        return f"read_parquet('{race_path}/**/*.parquet', hive_partitioning = true)"
+
+    file_path = get_telemetry_file_path(track_code, race_num)
+
+    if file_path is None:
+        raise FileNotFoundError(f"Telemetry file not found for {track_code} Race {race_num}")
+
+    return f"""read_csv('{file_path.as_posix()}', header = true, parallel = true,
+                        types = {{'lap': 'DOUBLE', 'telemetry_value': 'DOUBLE',
+                                  'vehicle_id': 'VARCHAR', 'telemetry_name': 'VARCHAR'}})"""
+
+
+def lap_aggregate_sql(source: str, lap_windows: Optional[str] = None) -> str:
+    """
+    Build the SQL that computes telemetry_aggregates rows from a telemetry scan
+
+    Args:
+        source: FROM clause expression yielding long-format telemetry
+        lap_windows: Relation with (vehicle_id, lap_number, start_ms, end_ms) that
+            places samples by timestamp (ASOF JOIN), the ECU lap being used
+            only outside every window
+
+    Returns:
+        SELECT statement returning (vehicle_id, lap_number, <aggregates>, telemetry_points)
+    """
+    sql_stats = {'avg': 'AVG', 'min': 'MIN', 'max': 'MAX'}
+    absolute = ', '.join(f"'{channel}'" for channel in sorted(ABSOLUTE_CHANNELS))
+
+    columns = []
+    for column, (channel, stat) in LAP_AGGREGATE_SPEC.items():
+        expression = f"{sql_stats[stat]}(value) FILTER (WHERE name = '{channel}')"
+        if column in INTEGER_AGGREGATES:
+            expression = f"CAST(ROUND_EVEN({expression}, 0) AS INTEGER)"
+        columns.append(f"{expression} AS {column}")
+
+    valid_lap = f"lap >= 1 AND lap < {INVALID_LAP}"
+    if lap_windows is None:
+        laps = f"""
+            SELECT vehicle_id, CAST(lap AS INTEGER) AS lap_number, telemetry_name, telemetry_value
+            FROM {source}
+            WHERE {valid_lap}"""
+    else:
+        laps = f"""
+            SELECT * FROM (
+                SELECT
+                    t.vehicle_id,
+                    CASE WHEN t.time_ms < w.end_ms THEN w.lap_number
+                         WHEN {valid_lap} THEN CAST(t.lap AS INTEGER) END AS lap_number,
+                    t.telemetry_name,
+                    t.telemetry_value
+                FROM (
+                    SELECT *, epoch_ms(CAST(timestamp AS TIMESTAMPTZ)) AS time_ms
+                    FROM {source}
+                ) t
+                ASOF LEFT JOIN {lap_windows} w
+                  ON t.vehicle_id = w.vehicle_id AND t.time_ms >= w.start_ms
+            )
+            WHERE lap_number IS NOT NULL"""
+
+    return f"""
+        WITH samples AS (
+            SELECT
+                vehicle_id,
+                lap_number,
+                telemetry_name AS name,
+                CASE WHEN telemetry_name IN ({absolute})
+                     THEN ABS(telemetry_value) ELSE telemetry_value END AS value
+            FROM ({laps}
+            )
+        )
+        SELECT
+            vehicle_id,
+            lap_number,
+            {', '.join(columns)},
+            COUNT(*) AS telemetry_points
+        FROM samples
+        GROUP BY vehicle_id, lap_number
+        ORDER BY vehicle_id, lap_number
+    """
+
+
+def aggregate_race_telemetry_sql(conn, track_code: str, race_num: int,
+                                 lap_boundaries: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Compute lap-level telemetry aggregates with DuckDB's parallel scanners
+
+    The whole scan and GROUP BY runs inside DuckDB; only the per-(vehicle, lap)
+    result set is returned to Python.
+
+    Args:
+        conn: DuckDB connection
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+        lap_boundaries: Lap windows that place samples by timestamp (ECU lap counter if None)
+
+    Returns:
+        DataFrame with TELEMETRY_AGGREGATE_COLUMNS
+    """
+    started = time.perf_counter()
+    source = _telemetry_source_sql(track_code, race_num)
+
+    if lap_boundaries is None:
+        df = conn.execute(lap_aggregate_sql(source)).df()
+    else:
+        lap_windows = pd.DataFrame({
+            'vehicle_id': lap_boundaries['vehicle_id'].astype(str),
+            'lap_number': lap_boundaries['lap_number'].astype(int),
+            'start_ms': lap_boundaries['start_time'].to_numpy().astype('datetime64[ms]').astype(np.int64),
+            'end_ms': lap_boundaries['end_time'].to_numpy().astype('datetime64[ms]').astype(np.int64)
+        })
+        conn.register('race_lap_windows', lap_windows)
+        try:
+            df = conn.execute(lap_aggregate_sql(source, 'race_lap_windows')).df()
+        finally:
+            conn.unregister('race_lap_windows')
+
+    if telemetry_store.has_race(track_code, race_num):
+        bytes_read = telemetry_store.store_size_bytes(track_code, race_num)
+    else:
+        bytes_read = get_telemetry_file_path(track_code, race_num).stat().st_size
+    record_loader("telemetry_duckdb", rows=df['telemetry_points'].sum(), bytes_read=bytes_read,
+                  wall_seconds=time.perf_counter() - started)
+
+    df['track_code'] = track_code
+    df['race_num'] = race_num
+    df['driver_number'] = driver_number_from_vehicle_id(df['vehicle_id'])
+
+    for column in INTEGER_AGGREGATES:
+        df[column] = df[column].astype('Int64')
+
+    return df[TELEMETRY_AGGREGATE_COLUMNS]
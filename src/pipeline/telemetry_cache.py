@@ -0,0 +1,299 @@
+"""
+Memory-mapped per-channel telemetry cache for GR Cup Data Pipeline
+
+Each race is cached as one fixed-dtype binary file per channel plus a
+small lap offset index:
+
+    TELEMETRY_CACHE_DIR/COTA/R1/
+        meta.json          channels, sample count, source signature
+        laps.json          [vehicle_id, lap, start, stop] per lap
+        time_ms.bin        int64
+        vcar.bin, ...      float32
+
+Files are opened with np.memmap, so a (track, race, vehicle, lap) slice is
+a zero-copy view and only the touched pages are ever read from disk.
+
+Samples are split into laps by the race's lap boundary windows when it has
+them, so the boundary exports are part of the source signature too.
+"""
+
+import json
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import TELEMETRY_CACHE_DIR, TELEMETRY_FIELDS
+from src.utils import RaceBundle, discover_race_bundle, get_telemetry_file_path
+from src.pipeline import telemetry_store
+from src.pipeline.lap_segmentation import INVALID_LAP, race_lap_boundaries
+from src.pipeline.pivot import LapTraces, pivot_race
+
+
+CHANNEL_DTYPE = np.float32
+TIME_DTYPE = np.int64
+
+
+def cache_race_path(track_code: str, race_num: int) -> Path:
+    """Directory holding one race's cache files"""
+    return TELEMETRY_CACHE_DIR / track_code / f"R{race_num}"
+
+
+BOUNDARY_FILE_TYPES = ['lap_time', 'lap_start', 'lap_end']
+
+
+def _source_signature(track_code: str, race_num: int) -> Optional[dict]:
+    file_path = get_telemetry_file_path(track_code, race_num)
+    if file_path is None:
+        return None
+    stat = file_path.stat()
+
+    files = discover_race_bundle(track_code, race_num).files
+    windows = []
+    for file_type in BOUNDARY_FILE_TYPES:
+        if files.get(file_type) is not None:
+            boundary_stat = files[file_type].stat()
+            windows.append([file_type, boundary_stat.st_size, boundary_stat.st_mtime])
+
+    return {'size': stat.st_size, 'mtime': stat.st_mtime, 'lap_windows': windows}
+
+
+def _lap_boundaries(track_code: str, race_num: int) -> Optional[pd.DataFrame]:
+    """Lap windows of a race for timestamp segmentation (None if it has none)"""
+    return race_lap_boundaries(discover_race_bundle(track_code, race_num))
+
+
+def has_cache(track_code: str, race_num: int) -> bool:
+    """
+    Check whether a race's cache exists and matches its telemetry file
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+
+    Returns:
+        True if the cache is complete and up to date
+    """
+    meta_path = cache_race_path(track_code, race_num) / "meta.json"
+    if not meta_path.exists():
+        return False
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    return meta.get('source') == _source_signature(track_code, race_num)
+
+
+def build_cache(track_code: str, race_num: int, channels: Optional[List[str]] = None) -> int:
+    """
+    Build the memory-mapped cache for one race
+
+    When the race is in the Parquet store, vehicles are pivoted one at a
+    time and appended to the channel files, so only one vehicle is ever held
+    in memory.
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+        channels: Channels to cache (defaults to TELEMETRY_FIELDS)
+
+    Returns:
+        Number of laps cached
+    """
+    channels = list(channels or TELEMETRY_FIELDS)
+    race_path = cache_race_path(track_code, race_num)
+    staging = race_path.parent / f"_staging_R{race_num}"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    vehicle_ids = telemetry_store.store_vehicle_ids(track_code, race_num) \
+        if telemetry_store.has_race(track_code, race_num) else [None]
+
+    lap_boundaries = _lap_boundaries(track_code, race_num)
+    laps = []
+    samples = 0
+    files = {name: open(staging / f"{name}.bin", 'wb') for name in ['time_ms'] + channels}
+
+    try:
+        for vehicle_id in vehicle_ids:
+            pivoted = pivot_race(track_code, race_num, channels=channels, vehicle_id=vehicle_id,
+                                 lap_boundaries=lap_boundaries)
+
+            files['time_ms'].write(pivoted.time_ms.astype(TIME_DTYPE).tobytes())
+            for name in channels:
+                files[name].write(pivoted.channel(name).astype(CHANNEL_DTYPE).tobytes())
+
+            for row in pivoted.index.itertuples(index=False):
+                laps.append([row.vehicle_id, int(row.lap), samples + int(row.start), samples + int(row.stop)])
+            samples += len(pivoted.time_ms)
+    finally:
+        for f in files.values():
+            f.close()
+
+    with open(staging / "laps.json", 'w') as f:
+        json.dump(laps, f)
+
+    with open(staging / "meta.json", 'w') as f:
+        json.dump({
+            'channels': channels,
+            'samples': samples,
+            'channel_dtype': np.dtype(CHANNEL_DTYPE).str,
+            'time_dtype': np.dtype(TIME_DTYPE).str,
+            'source': _source_signature(track_code, race_num)
+        }, f)
+
+    shutil.rmtree(race_path, ignore_errors=True)
+    staging.rename(race_path)
+
+    return len(laps)
+
+
+class TelemetryCache:
+    """Read-only, memory-mapped view of one race's cached telemetry"""
+
+    def __init__(self, track_code: str, race_num: int):
+        self.path = cache_race_path(track_code, race_num)
+
+        meta_path = self.path / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"No telemetry cache for {track_code} Race {race_num}")
+
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+        with open(self.path / "laps.json") as f:
+            self._laps = {(v, lap): (start, stop) for v, lap, start, stop in json.load(f)}
+
+        self.channels = self.meta['channels']
+        self._arrays: Dict[str, np.memmap] = {}
+
+    def _array(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            if name != 'time_ms' and name not in self.channels:
+                raise KeyError(f"Channel {name} is not cached")
+            dtype = self.meta['time_dtype'] if name == 'time_ms' else self.meta['channel_dtype']
+            if self.meta['samples'] == 0:
+                self._arrays[name] = np.empty(0, dtype=dtype)
+            else:
+                self._arrays[name] = np.memmap(self.path / f"{name}.bin", dtype=dtype, mode='r',
+                                               shape=(self.meta['samples'],))
+        return self._arrays[name]
+
+    def laps(self) -> pd.DataFrame:
+        """Lap offset index as a DataFrame (vehicle_id, lap, start, stop)"""
+        return pd.DataFrame(
+            [(v, lap, start, stop) for (v, lap), (start, stop) in self._laps.items()],
+            columns=['vehicle_id', 'lap', 'start', 'stop']
+        )
+
+    def channel(self, name: str) -> np.ndarray:
+        """Memory-mapped array for one channel across the whole race"""
+        return self._array(name)
+
+    def lap(self, vehicle_id: str, lap: int, channels: Optional[List[str]] = None) -> LapTraces:
+        """
+        Get one lap's traces as zero-copy views
+
+        Args:
+            vehicle_id: Vehicle identifier (e.g. 'GR86-004-78')
+            lap: Lap number
+            channels: Channels to return (all cached channels if None)
+
+        Returns:
+            LapTraces backed by the memory-mapped files
+        """
+        bounds = self._laps.get((vehicle_id, int(lap)))
+        if bounds is None:
+            raise KeyError(f"No cached telemetry for vehicle {vehicle_id} lap {lap}")
+
+        start, stop = bounds
+        return LapTraces(
+            vehicle_id=vehicle_id,
+            lap=int(lap),
+            time_ms=self._array('time_ms')[start:stop],
+            channels={name: self._array(name)[start:stop] for name in (channels or self.channels)}
+        )
+
+
+@lru_cache(maxsize=16)
+def open_cache(track_code: str, race_num: int) -> TelemetryCache:
+    """Open (and keep open) the telemetry cache for a race"""
+    return TelemetryCache(track_code, race_num)
+
+
+def race_lap_samples(track_code: str, race_num: int,
+                     channels: List[str]) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Every valid lap's samples of a race, grouped by lap
+
+    Reads the lap cache when it is up to date and holds the channels,
+    otherwise pivots the race from the Parquet store or CSV.
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+        channels: Channels to load
+
+    Returns:
+        Tuple of (laps DataFrame with vehicle_id and lap, sorted; lap row of
+        every sample; time_ms of every sample; channel name -> sample values)
+    """
+    source = None
+    if has_cache(track_code, race_num):
+        cache = open_cache(track_code, race_num)
+        if all(name in cache.channels for name in channels):
+            source = cache.laps(), cache.channel('time_ms'), cache.channel
+    if source is None:
+        pivoted = pivot_race(track_code, race_num, channels=channels,
+                             lap_boundaries=_lap_boundaries(track_code, race_num))
+        source = pivoted.index, pivoted.time_ms, pivoted.channel
+    laps, time_ms, channel = source
+
+    laps = laps[(laps['lap'] >= 1) & (laps['lap'] < INVALID_LAP)]
+    laps = laps.sort_values(['vehicle_id', 'lap']).reset_index(drop=True)
+
+    # Gather every lap's samples into one contiguous, lap-grouped block
+    lengths = (laps['stop'] - laps['start']).to_numpy(dtype=np.int64)
+    lap_index = np.repeat(np.arange(len(laps)), lengths)
+    first = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    samples = np.repeat(laps['start'].to_numpy(dtype=np.int64), lengths) + np.arange(len(lap_index)) - first
+
+    laps = laps[['vehicle_id', 'lap']].astype({'vehicle_id': object, 'lap': np.int64})
+    return laps, lap_index, np.asarray(time_ms)[samples], {name: channel(name)[samples] for name in channels}
+
+
+def build_telemetry_cache(bundles: List[RaceBundle]) -> int:
+    """
+    Build caches for every race with telemetry that is missing or stale
+
+    Args:
+        bundles: Races from get_race_bundles()
+
+    Returns:
+        Number of races cached
+    """
+    built = 0
+
+    for bundle in bundles:
+        track_code = bundle.track_code
+        race_num = bundle.race_num
+
+        if not bundle.has_telemetry:
+            continue
+
+        if has_cache(track_code, race_num):
+            print(f"  = {track_code} Race {race_num}: Up to date")
+            continue
+
+        try:
+            laps = build_cache(track_code, race_num)
+            built += 1
+            print(f"  + {track_code} Race {race_num}: {laps} laps")
+
+        except Exception as e:
+            print(f"  - {track_code} Race {race_num}: Error - {e}")
+
+    open_cache.cache_clear()
+    return built
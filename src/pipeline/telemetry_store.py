@@ -0,0 +1,277 @@
+"""
+Partitioned Parquet telemetry store for GR Cup Data Pipeline
+
+Each race's telemetry CSV is converted once into a Hive-partitioned,
+zstd-compressed Parquet dataset:
+
+    TELEMETRY_STORE_DIR/track_code=COTA/race_num=1/vehicle_id=GR86-004-78/*.parquet
+
+Downstream readers go through read_store_chunks(), which prunes partitions
+so a single-driver query only touches that vehicle's files.
+"""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.dataset as ds
+    HAS_PYARROW = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAS_PYARROW = False
+
+from src.config import TELEMETRY_STORE_DIR, TELEMETRY_CHUNK_ROWS
+from src.utils import RaceBundle, get_telemetry_file_path
+
+
+# Columns kept in the store (track_code/race_num/vehicle_id live in the partition path)
+STORE_COLUMNS = ['vehicle_id', 'lap', 'timestamp', 'telemetry_name', 'telemetry_value']
+
+# Written next to the data so staleness can be checked without reading Parquet
+SOURCE_MARKER = "_source.json"
+
+
+def store_race_path(track_code: str, race_num: int) -> Path:
+    """Directory holding one race's partitions"""
+    return TELEMETRY_STORE_DIR / f"track_code={track_code}" / f"race_num={race_num}"
+
+
+def _source_signature(file_path: Path) -> dict:
+    stat = file_path.stat()
+    return {'path': str(file_path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def has_race(track_code: str, race_num: int) -> bool:
+    """
+    Check whether a race is in the store and still matches its source CSV
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+
+    Returns:
+        True if the stored partitions are complete and up to date
+    """
+    if not HAS_PYARROW:
+        return False
+
+    marker = store_race_path(track_code, race_num) / SOURCE_MARKER
+    if not marker.exists():
+        return False
+
+    file_path = get_telemetry_file_path(track_code, race_num)
+    if file_path is None:
+        return True
+
+    with open(marker) as f:
+        recorded = json.load(f)
+
+    current = _source_signature(file_path)
+    return recorded['size'] == current['size'] and recorded['mtime'] == current['mtime']
+
+
+def store_vehicle_ids(track_code: str, race_num: int) -> List[str]:
+    """
+    List the vehicle partitions stored for a race
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+
+    Returns:
+        Sorted vehicle ids (empty if the race is not in the store)
+    """
+    race_path = store_race_path(track_code, race_num)
+    if not race_path.exists():
+        return []
+
+    return sorted(
+        entry.name.split('=', 1)[1]
+        for entry in race_path.iterdir()
+        if entry.is_dir() and entry.name.startswith('vehicle_id=')
+    )
+
+
+def store_size_bytes(track_code: str, race_num: int, vehicle_id: Optional[str] = None) -> int:
+    """
+    Bytes of Parquet stored for a race (or one vehicle of it)
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+        vehicle_id: Only count this vehicle's partition
+
+    Returns:
+        Total file size in bytes
+    """
+    path = store_race_path(track_code, race_num)
+    if vehicle_id is not None:
+        path = path / f"vehicle_id={vehicle_id}"
+
+    return sum(f.stat().st_size for f in path.rglob("*.parquet"))
+
+
+def convert_race(track_code: str, race_num: int, block_size: int = 64 << 20) -> int:
+    """
+    Convert one race's telemetry CSV into the partitioned store
+
+    The CSV is streamed in blocks, so memory stays bounded. Output is written
+    to a staging directory and renamed into place, so readers never see a
+    half-written race.
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+        block_size: Bytes of CSV parsed per batch
+
+    Returns:
+        Number of rows written
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required for the telemetry store")
+
+    file_path = get_telemetry_file_path(track_code, race_num)
+    if file_path is None:
+        raise FileNotFoundError(f"Telemetry file not found for {track_code} Race {race_num}")
+
+    race_path = store_race_path(track_code, race_num)
+    staging = race_path.parent / f"_staging_race_num={race_num}"
+    shutil.rmtree(staging, ignore_errors=True)
+
+    reader = pa_csv.open_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=STORE_COLUMNS,
+            column_types={
+                'vehicle_id': pa.string(),
+                'lap': pa.int32(),
+                'timestamp': pa.timestamp('ms', tz='UTC'),
+                'telemetry_name': pa.string(),
+                'telemetry_value': pa.float64()
+            }
+        )
+    )
+
+    rows = 0
+
+    def batches():
+        nonlocal rows
+        for batch in reader:
+            rows += batch.num_rows
+            yield batch
+
+    ds.write_dataset(
+        batches(),
+        staging,
+        schema=reader.schema,
+        format="parquet",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        partitioning=ds.partitioning(pa.schema([('vehicle_id', pa.string())]), flavor="hive"),
+        min_rows_per_group=128_000,
+        max_rows_per_group=1_000_000,
+        existing_data_behavior="overwrite_or_ignore"
+    )
+
+    with open(staging / SOURCE_MARKER, 'w') as f:
+        json.dump({**_source_signature(file_path), 'rows': rows}, f)
+
+    shutil.rmtree(race_path, ignore_errors=True)
+    staging.rename(race_path)
+
+    return rows
+
+
+def read_store_chunks(track_code: str, race_num: int,
+                      vehicle_id: Optional[str] = None,
+                      channels: Optional[List[str]] = None,
+                      columns: Optional[List[str]] = None,
+                      chunk_rows: int = TELEMETRY_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Stream one race's telemetry from the store
+
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+        vehicle_id: Only read this vehicle's partition
+        channels: Only keep rows for these telemetry_name values
+        columns: Columns to read (defaults to STORE_COLUMNS)
+        chunk_rows: Maximum rows per chunk
+
+    Yields:
+        DataFrame chunks with categorical vehicle_id/telemetry_name
+    """
+    file_format = ds.ParquetFileFormat(
+        read_options=ds.ParquetReadOptions(dictionary_columns=['telemetry_name'])
+    )
+    dataset = ds.dataset(store_race_path(track_code, race_num), format=file_format, partitioning="hive")
+
+    row_filter = None
+    if vehicle_id is not None:
+        row_filter = ds.field('vehicle_id') == vehicle_id
+    if channels is not None:
+        channel_filter = ds.field('telemetry_name').isin(list(channels))
+        row_filter = channel_filter if row_filter is None else row_filter & channel_filter
+
+    # Files are per vehicle, so coalesce small batches up to chunk_rows
+    pending, pending_rows = [], 0
+    batches = dataset.to_batches(columns=list(columns or STORE_COLUMNS), filter=row_filter,
+                                 batch_size=chunk_rows)
+
+    for batch in batches:
+        if batch.num_rows:
+            pending.append(batch)
+            pending_rows += batch.num_rows
+        if pending_rows >= chunk_rows:
+            yield _to_chunk(pending)
+            pending, pending_rows = [], 0
+
+    if pending:
+        yield _to_chunk(pending)
+
+
+def _to_chunk(batches: list) -> pd.DataFrame:
+    chunk = pa.Table.from_batches(batches).to_pandas()
+    for column in ('vehicle_id', 'telemetry_name'):
+        if column in chunk.columns:
+            chunk[column] = chunk[column].astype('category')
+    return chunk
+
+
+def build_telemetry_store(bundles: List[RaceBundle]) -> int:
+    """
+    Convert every race with telemetry that is missing or stale in the store
+
+    Args:
+        bundles: Races from get_race_bundles()
+
+    Returns:
+        Number of races converted
+    """
+    converted = 0
+
+    for bundle in bundles:
+        track_code = bundle.track_code
+        race_num = bundle.race_num
+
+        if not bundle.has_telemetry:
+            continue
+
+        if has_race(track_code, race_num):
+            print(f"  = {track_code} Race {race_num}: Up to date")
+            continue
+
+        try:
+            rows = convert_race(track_code, race_num)
+            converted += 1
+            print(f"  + {track_code} Race {race_num}: {rows:,} rows")
+
+        except Exception as e:
+            print(f"  - {track_code} Race {race_num}: Error - {e}")
+
+    return converted
@@ -8,8 +8,15 @@ from .file_utils import (
     load_weather,
     load_lap_boundaries,
     get_telemetry_file_path,
-    get_all_races
+    get_all_races,
+    RaceBundle,
+    discover_race_bundle,
+    get_race_bundles,
+    DirectoryIndex,
+    directory_index,
+    read_schema_csv
 )
+from .time_utils import parse_time_column, time_column_to_seconds
 
 __all__ = [
     "get_track_race_path",
@@ -19,5 +26,13 @@ __all__ = [
     "load_weather",
     "load_lap_boundaries",
     "get_telemetry_file_path",
-    "get_all_races"
+    "get_all_races",
+    "RaceBundle",
+    "discover_race_bundle",
+    "get_race_bundles",
+    "DirectoryIndex",
+    "directory_index",
+    "read_schema_csv",
+    "parse_time_column",
+    "time_column_to_seconds"
 ]
@@ -2,13 +2,118 @@
 Utility functions for finding and loading data files
 """
 
+import csv
 import os
-import glob
+import fnmatch
+import threading
 from pathlib import Path
 from typing import Optional, Dict, List
 import pandas as pd
 
-from src.config import DATA_DIR, TRACKS, FILE_PATTERNS
+try:
+    import pyarrow  # noqa: F401 - backs pandas' Arrow CSV engine
+    HAS_PYARROW = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAS_PYARROW = False
+
+from src.config import DATA_DIR, TRACKS, FILE_PATTERNS, CSV_SCHEMAS, CSV_ENGINES
+from src.utils.instrumentation import instrument_loader
+
+
+class DirectoryIndex:
+    """
+    In-memory listings of data directories
+
+    Each directory is read with one os.scandir call and cached together
+    with its mtime. Lookups only stat the directory itself, and rescan it
+    when the mtime has changed (a file was added, removed or renamed), so
+    repeated pattern lookups never list or glob the filesystem again.
+    """
+
+    def __init__(self):
+        self._listings: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _scan(self, directory: str, mtime_ns: int) -> Dict[str, bool]:
+        with os.scandir(directory) as it:
+            entries = {entry.name: entry.is_dir() for entry in it}
+        with self._lock:
+            self._listings[directory] = (mtime_ns, entries)
+        return entries
+
+    def entries(self, directory: Path) -> Optional[Dict[str, bool]]:
+        """
+        Names in a directory mapped to whether they are directories
+
+        Args:
+            directory: Directory to list
+
+        Returns:
+            Dictionary of name -> is_dir, or None if the directory does not exist
+        """
+        key = str(directory)
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            with self._lock:
+                self._listings.pop(key, None)
+            return None
+
+        cached = self._listings.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        try:
+            return self._scan(key, mtime_ns)
+        except NotADirectoryError:
+            return None
+
+    def is_indexed(self, directory: Path) -> bool:
+        """Check whether a directory has been listed before"""
+        return str(directory) in self._listings
+
+    def scan_tree(self, root: Path):
+        """Index a directory and every subdirectory below it in one walk"""
+        entries = self.entries(root)
+        for name, is_dir in (entries or {}).items():
+            if is_dir:
+                self.scan_tree(root / name)
+
+    def names(self, directory: Path) -> List[str]:
+        """Sorted entry names of a directory (empty if it does not exist)"""
+        return sorted(self.entries(directory) or {})
+
+    def exists(self, path: Path) -> bool:
+        """Check whether a file or directory exists, using the parent's listing"""
+        entries = self.entries(path.parent)
+        return entries is not None and path.name in entries
+
+    def is_dir(self, path: Path) -> bool:
+        """Check whether a directory exists, using the parent's listing"""
+        entries = self.entries(path.parent)
+        return bool(entries and entries.get(path.name))
+
+    def find(self, directory: Path, pattern: str) -> Optional[Path]:
+        """
+        First file in a directory matching a name or glob pattern
+
+        Args:
+            directory: Directory to search
+            pattern: File name, optionally with glob wildcards
+
+        Returns:
+            Path to the file if found, None otherwise
+        """
+        return _match_file(directory, self.names(directory), pattern)
+
+    def clear(self):
+        """Forget every cached listing"""
+        with self._lock:
+            self._listings.clear()
+
+
+# Shared index used by every lookup in this module
+directory_index = DirectoryIndex()
 
 
 def get_track_race_path(track_code: str, race_num: int) -> Path:
@@ -28,7 +133,11 @@ def get_track_race_path(track_code: str, race_num: int) -> Path:
     track_dir = DATA_DIR / TRACKS[track_code]["directory"]
     race_dir = track_dir / f"Race {race_num}"
 
-    if not race_dir.exists():
+    # Index the whole track directory the first time it is seen
+    if not directory_index.is_indexed(track_dir):
+        directory_index.scan_tree(track_dir)
+
+    if not directory_index.is_dir(race_dir):
         raise FileNotFoundError(f"Race directory not found: {race_dir}")
 
     return race_dir
@@ -46,42 +155,230 @@ def find_file_by_pattern(directory: Path, pattern: str, **kwargs) -> Optional[Pa
     Returns:
         Path to the file if found, None otherwise
     """
+    return directory_index.find(directory, pattern.format(**kwargs))
+
+
+class RaceBundle:
+    """
+    Every source file for one race, discovered with a single directory listing
+
+    Each file is parsed at most once and the parsed frame is cached on the
+    bundle, so all pipeline stages can share one bundle per race. Loads are
+    locked per file, so concurrent stages asking for the same file wait for
+    one parse instead of each running their own. Cached frames are shared:
+    callers must not modify them in place.
+
+    Timing exports are parsed with the CSV_SCHEMAS dtypes using csv_engine
+    ('pandas' or 'pyarrow', see read_schema_csv).
+    """
+
+    def __init__(self, track_code: str, race_num: int, race_dir: Path,
+                 files: Dict[str, Optional[Path]], csv_engine: str = "pandas"):
+        self.track_code = track_code
+        self.race_num = race_num
+        self.race_dir = race_dir
+        self.files = files
+        self.csv_engine = csv_engine
+        self._frames = {}
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def __repr__(self) -> str:
+        found = sorted(key for key, path in self.files.items() if path is not None)
+        return f"RaceBundle({self.track_code} Race {self.race_num}, files={found})"
+
+    def __getstate__(self):
+        # Ship only paths to worker processes, never cached frames (or locks)
+        state = self.__dict__.copy()
+        state['_frames'] = {}
+        state['_locks'] = {}
+        return state
+
+    @property
+    def track_name(self) -> str:
+        return TRACKS[self.track_code]["name"]
+
+    @property
+    def telemetry_path(self) -> Optional[Path]:
+        return self.files.get("telemetry")
+
+    @property
+    def has_telemetry(self) -> bool:
+        return self.telemetry_path is not None
+
+    def _cached(self, key: str, reader):
+        if key not in self._frames:
+            # setdefault is atomic, so every thread gets the same lock for a key
+            with self._locks.setdefault(key, threading.Lock()):
+                if key not in self._frames:
+                    self._frames[key] = reader()
+        return self._frames[key]
+
+    def _require(self, file_type: str, label: str) -> Path:
+        file_path = self.files.get(file_type)
+        if file_path is None:
+            raise FileNotFoundError(f"{label} file not found for {self.track_code} Race {self.race_num}")
+        return file_path
+
+    def load_lap_analysis(self) -> pd.DataFrame:
+        """Lap analysis data (column names stripped of whitespace)"""
+        return self._cached("lap_analysis", lambda: _read_timing_csv(
+            self._require("lap_analysis", "Lap analysis"), "lap_analysis",
+            self.track_code, self.race_num, self.csv_engine
+        ))
+
+    def load_race_results(self) -> pd.DataFrame:
+        """Provisional race results"""
+        return self._cached("results", lambda: _read_timing_csv(
+            self._require("results", "Results"), "results",
+            self.track_code, self.race_num, self.csv_engine
+        ))
+
+    def load_best_laps(self) -> pd.DataFrame:
+        """Best 10 laps by driver"""
+        return self._cached("best_laps", lambda: _read_timing_csv(
+            self._require("best_laps", "Best laps"), "best_laps",
+            self.track_code, self.race_num, self.csv_engine
+        ))
+
+    def load_weather(self) -> pd.DataFrame:
+        """Weather data (empty DataFrame if the race has no weather file)"""
+        def read():
+            file_path = self.files.get("weather")
+            if file_path is None:
+                print(f"Warning: Weather file not found for {self.track_code} Race {self.race_num}")
+                return pd.DataFrame()
+            return _read_timing_csv(file_path, "weather", self.track_code, self.race_num, self.csv_engine)
+
+        return self._cached("weather", read)
+
+    def load_lap_boundaries(self) -> Dict[str, pd.DataFrame]:
+        """Lap boundary files as a dictionary with 'time', 'start', 'end' DataFrames"""
+        def read():
+            result = {}
+            for key, pattern_key in [("time", "lap_time"), ("start", "lap_start"), ("end", "lap_end")]:
+                file_path = self.files.get(pattern_key)
+                if file_path is not None:
+                    result[key] = _read_boundary_csv(file_path, pattern_key, self.csv_engine)
+                    result[key]['track_code'] = self.track_code
+                    result[key]['race_num'] = self.race_num
+            return result
+
+        return self._cached("lap_boundaries", read)
+
+
+def _match_file(race_dir: Path, names: List[str], pattern: str, **kwargs) -> Optional[Path]:
+    """Resolve a FILE_PATTERNS entry against an already-listed directory"""
     formatted_pattern = pattern.format(**kwargs)
 
-    # Handle glob patterns in the formatted string
     if '*' in formatted_pattern:
-        matches = list(directory.glob(formatted_pattern))
-        return matches[0] if matches else None
+        matches = sorted(fnmatch.filter(names, formatted_pattern))
+        return race_dir / matches[0] if matches else None
 
-    file_path = directory / formatted_pattern
-    return file_path if file_path.exists() else None
+    return race_dir / formatted_pattern if formatted_pattern in names else None
 
 
-def load_lap_analysis(track_code: str, race_num: int) -> pd.DataFrame:
+def discover_race_bundle(track_code: str, race_num: int, csv_engine: str = "pandas") -> RaceBundle:
     """
-    Load lap analysis data for a specific race
+    Discover every source file for a race from the cached directory listing
 
     Args:
         track_code: Track code (e.g., 'COTA', 'BMP')
         race_num: Race number (1 or 2)
+        csv_engine: CSV parser for the bundle's loaders ('pandas' or 'pyarrow')
 
     Returns:
-        DataFrame with lap analysis data
+        RaceBundle for the race
     """
     race_dir = get_track_race_path(track_code, race_num)
-    file_path = find_file_by_pattern(
-        race_dir,
-        FILE_PATTERNS["lap_analysis"],
-        race_num=race_num
-    )
+    track_prefix = TRACKS[track_code]["telemetry_prefix"]
+    names = directory_index.names(race_dir)
+
+    files = {}
+    for file_type, pattern in FILE_PATTERNS.items():
+        patterns = pattern if isinstance(pattern, list) else [pattern]
+        files[file_type] = None
+        for candidate in patterns:
+            file_path = _match_file(race_dir, names, candidate, track=track_prefix, race_num=race_num)
+            if file_path is not None:
+                files[file_type] = file_path
+                break
 
-    if file_path is None:
-        raise FileNotFoundError(f"Lap analysis file not found for {track_code} Race {race_num}")
+    return RaceBundle(track_code, race_num, race_dir, files, csv_engine)
 
-    df = pd.read_csv(file_path, sep=';')
 
-    # Strip whitespace from column names
+def get_race_bundles(csv_engine: str = "pandas") -> List[RaceBundle]:
+    """
+    Discover bundles for every available race
+
+    Args:
+        csv_engine: CSV parser for the bundles' loaders ('pandas' or 'pyarrow')
+
+    Returns:
+        List of RaceBundle, one per race directory found
+    """
+    bundles = []
+
+    for track_code in TRACKS:
+        for race_num in [1, 2]:
+            try:
+                bundles.append(discover_race_bundle(track_code, race_num, csv_engine))
+            except FileNotFoundError:
+                continue
+
+    return bundles
+
+
+def read_csv_header(file_path: Path, sep: str) -> List[str]:
+    """Raw column names from the first line of a CSV file"""
+    with open(file_path, newline='', encoding='utf-8-sig') as f:
+        return next(csv.reader(f, delimiter=sep), [])
+
+
+def read_schema_csv(file_path: Path, file_type: str, engine: str = "pandas") -> pd.DataFrame:
+    """
+    Read a CSV export with the dtypes registered for its file type
+
+    Header names are matched to CSV_SCHEMAS after stripping whitespace, and
+    returned stripped. The 'pandas' engine keeps every column (unlisted ones
+    are inferred); the 'pyarrow' engine parses with multiple threads and
+    only materializes the schema's columns. A file whose values do not fit
+    the schema is re-read with inferred dtypes.
+
+    Args:
+        file_path: CSV file
+        file_type: CSV_SCHEMAS key (same as FILE_PATTERNS)
+        engine: 'pandas' or 'pyarrow'
+
+    Returns:
+        DataFrame with stripped column names
+    """
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Unknown CSV engine '{engine}' (choose from: {', '.join(CSV_ENGINES)})")
+
+    schema = CSV_SCHEMAS[file_type]
+    raw_names = {name.strip(): name for name in read_csv_header(file_path, schema["sep"])}
+    dtypes = {raw_names[column]: dtype for column, dtype in schema["dtypes"].items() if column in raw_names}
+
+    options = {'sep': schema["sep"]}
+    if engine == "pyarrow" and HAS_PYARROW:
+        options.update(engine="pyarrow", usecols=list(dtypes))
+
+    try:
+        df = pd.read_csv(file_path, dtype=dtypes, **options)
+    except ValueError as e:
+        print(f"Warning: {Path(file_path).name} does not match the {file_type} schema "
+              f"({str(e).splitlines()[0]}), inferring dtypes")
+        df = pd.read_csv(file_path, **options)
+
     df.columns = df.columns.str.strip()
+    return df
+
+
+@instrument_loader("timing_csv")
+def _read_timing_csv(file_path: Path, file_type: str, track_code: str, race_num: int,
+                     engine: str = "pandas") -> pd.DataFrame:
+    """Read a semicolon-separated timing export and tag it with its race"""
+    df = read_schema_csv(file_path, file_type, engine)
 
     df['track_code'] = track_code
     df['race_num'] = race_num
@@ -89,32 +386,38 @@ def load_lap_analysis(track_code: str, race_num: int) -> pd.DataFrame:
     return df
 
 
-def load_race_results(track_code: str, race_num: int) -> pd.DataFrame:
+@instrument_loader("lap_boundary_csv")
+def _read_boundary_csv(file_path: Path, file_type: str, engine: str = "pandas") -> pd.DataFrame:
+    """Read a comma-separated lap start/end/time export"""
+    return read_schema_csv(file_path, file_type, engine)
+
+
+def load_lap_analysis(track_code: str, race_num: int) -> pd.DataFrame:
     """
-    Load race results for a specific race
+    Load lap analysis data for a specific race
 
     Args:
         track_code: Track code (e.g., 'COTA', 'BMP')
         race_num: Race number (1 or 2)
 
     Returns:
-        DataFrame with race results
+        DataFrame with lap analysis data
     """
-    race_dir = get_track_race_path(track_code, race_num)
-    file_path = find_file_by_pattern(
-        race_dir,
-        FILE_PATTERNS["results"],
-        race_num=race_num
-    )
+    return discover_race_bundle(track_code, race_num).load_lap_analysis()
 
-    if file_path is None:
-        raise FileNotFoundError(f"Results file not found for {track_code} Race {race_num}")
 
-    df = pd.read_csv(file_path, sep=';')
-    df['track_code'] = track_code
-    df['race_num'] = race_num
+def load_race_results(track_code: str, race_num: int) -> pd.DataFrame:
+    """
+    Load race results for a specific race
 
-    return df
+    Args:
+        track_code: Track code (e.g., 'COTA', 'BMP')
+        race_num: Race number (1 or 2)
+
+    Returns:
+        DataFrame with race results
+    """
+    return discover_race_bundle(track_code, race_num).load_race_results()
 
 
 def load_best_laps(track_code: str, race_num: int) -> pd.DataFrame:
@@ -128,21 +431,7 @@ def load_best_laps(track_code: str, race_num: int) -> pd.DataFrame:
     Returns:
         DataFrame with best lap times
     """
-    race_dir = get_track_race_path(track_code, race_num)
-    file_path = find_file_by_pattern(
-        race_dir,
-        FILE_PATTERNS["best_laps"],
-        race_num=race_num
-    )
-
-    if file_path is None:
-        raise FileNotFoundError(f"Best laps file not found for {track_code} Race {race_num}")
-
-    df = pd.read_csv(file_path, sep=';')
-    df['track_code'] = track_code
-    df['race_num'] = race_num
-
-    return df
+    return discover_race_bundle(track_code, race_num).load_best_laps()
 
 
 def load_weather(track_code: str, race_num: int) -> pd.DataFrame:
@@ -156,22 +445,7 @@ def load_weather(track_code: str, race_num: int) -> pd.DataFrame:
     Returns:
         DataFrame with weather data
     """
-    race_dir = get_track_race_path(track_code, race_num)
-    file_path = find_file_by_pattern(
-        race_dir,
-        FILE_PATTERNS["weather"],
-        race_num=race_num
-    )
-
-    if file_path is None:
-        print(f"Warning: Weather file not found for {track_code} Race {race_num}")
-        return pd.DataFrame()
-
-    df = pd.read_csv(file_path, sep=';')
-    df['track_code'] = track_code
-    df['race_num'] = race_num
-
-    return df
+    return discover_race_bundle(track_code, race_num).load_weather()
 
 
 def load_lap_boundaries(track_code: str, race_num: int) -> Dict[str, pd.DataFrame]:
@@ -185,25 +459,7 @@ def load_lap_boundaries(track_code: str, race_num: int) -> Dict[str, pd.DataFram
     Returns:
         Dictionary with 'time', 'start', 'end' DataFrames
     """
-    race_dir = get_track_race_path(track_code, race_num)
-    track_prefix = TRACKS[track_code]["telemetry_prefix"]
-
-    result = {}
-
-    for key, pattern_key in [("time", "lap_time"), ("start", "lap_start"), ("end", "lap_end")]:
-        file_path = find_file_by_pattern(
-            race_dir,
-            FILE_PATTERNS[pattern_key],
-            track=track_prefix,
-            race_num=race_num
-        )
-
-        if file_path and file_path.exists():
-            result[key] = pd.read_csv(file_path)
-            result[key]['track_code'] = track_code
-            result[key]['race_num'] = race_num
-
-    return result
+    return discover_race_bundle(track_code, race_num).load_lap_boundaries()
 
 
 def get_telemetry_file_path(track_code: str, race_num: int) -> Optional[Path]:
@@ -229,7 +485,7 @@ def get_telemetry_file_path(track_code: str, race_num: int) -> Optional[Path]:
             track=track_prefix,
             race_num=race_num
         )
-        if file_path and file_path.exists():
+        if file_path is not None:
             return file_path
 
     return None
@@ -244,22 +500,16 @@ def get_all_races() -> List[Dict[str, any]]:
     """
     races = []
 
-    for track_code, track_info in TRACKS.items():
-        for race_num in [1, 2]:
-            try:
-                race_dir = get_track_race_path(track_code, race_num)
-                telemetry_path = get_telemetry_file_path(track_code, race_num)
-
-                races.append({
-                    "track_code": track_code,
-                    "track_name": track_info["name"],
-                    "location": track_info["location"],
-                    "race_num": race_num,
-                    "race_dir": race_dir,
-                    "has_telemetry": telemetry_path is not None,
-                    "telemetry_path": telemetry_path
-                })
-            except FileNotFoundError:
-                continue
+    for bundle in get_race_bundles():
+        track_info = TRACKS[bundle.track_code]
+        races.append({
+            "track_code": bundle.track_code,
+            "track_name": track_info["name"],
+            "location": track_info["location"],
+            "race_num": bundle.race_num,
+            "race_dir": bundle.race_dir,
+            "has_telemetry": bundle.has_telemetry,
+            "telemetry_path": bundle.telemetry_path
+        })
 
     return races
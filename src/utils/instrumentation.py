@@ -0,0 +1,274 @@
+"""
+Per-stage and per-loader pipeline instrumentation
+
+Stages are timed with run_recorder.stage(name); loaders and stages report
+their row and byte counts with add_rows_in / add_rows_out / add_bytes_read,
+which are attributed to the stage running on the calling thread. Loader
+metrics collected in worker processes are drained with drain_loaders()
+and merged back into the parent's recorder.
+"""
+
+import functools
+import json
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # pragma: no cover - not available on Windows
+    HAS_RESOURCE = False
+
+
+PIPELINE_RUNS_COLUMNS = [
+    'run_id', 'stage', 'started_at', 'wall_seconds', 'cpu_seconds',
+    'rows_in', 'rows_out', 'bytes_read', 'peak_rss_mb', 'status'
+]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of this process or any finished child, in MB
+
+    Returns:
+        Peak RSS in MB, or None where the resource module is unavailable
+    """
+    if not HAS_RESOURCE:
+        return None
+
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+@dataclass
+class StageMetrics:
+    """Resource usage of one pipeline stage"""
+    stage: str
+    started_at: str = ''
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+    bytes_read: int = 0
+    peak_rss_mb: Optional[float] = None
+    status: str = 'running'
+
+    @property
+    def rows_per_second(self) -> float:
+        rows = max(self.rows_in, self.rows_out)
+        return rows / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+@dataclass
+class LoaderMetrics:
+    """Cumulative usage of one file loader"""
+    calls: int = 0
+    wall_seconds: float = 0.0
+    rows: int = 0
+    bytes_read: int = 0
+
+    def merge(self, other: 'LoaderMetrics'):
+        self.calls += other.calls
+        self.wall_seconds += other.wall_seconds
+        self.rows += other.rows
+        self.bytes_read += other.bytes_read
+
+
+class RunRecorder:
+    """Collect stage and loader metrics for one pipeline run"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Start a new run"""
+        self.run_id = datetime.now().strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+        self.started_at = datetime.now()
+        self.stages: List[StageMetrics] = []
+        self.loaders: Dict[str, LoaderMetrics] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def current(self) -> Optional[StageMetrics]:
+        """Metrics of the stage running on this thread, if any"""
+        return getattr(self._local, 'stage', None)
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time a stage and make it the target of add_* calls on this thread
+
+        Args:
+            name: Stage name
+        """
+        metrics = StageMetrics(stage=name, started_at=datetime.now().isoformat(timespec='seconds'))
+        with self._lock:
+            self.stages.append(metrics)
+
+        previous = self.current()
+        self._local.stage = metrics
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+
+        try:
+            yield metrics
+            metrics.status = 'ok'
+        except BaseException:
+            metrics.status = 'failed'
+            raise
+        finally:
+            metrics.wall_seconds = time.perf_counter() - wall_start
+            metrics.cpu_seconds = time.thread_time() - cpu_start
+            metrics.peak_rss_mb = peak_rss_mb()
+            self._local.stage = previous
+
+    def add(self, rows_in: int = 0, rows_out: int = 0, bytes_read: int = 0):
+        """Add counts to the stage running on this thread"""
+        metrics = self.current()
+        if metrics is not None:
+            metrics.rows_in += int(rows_in)
+            metrics.rows_out += int(rows_out)
+            metrics.bytes_read += int(bytes_read)
+
+    def add_loader(self, name: str, metrics: LoaderMetrics):
+        """Merge one loader call (or a batch of them) into the run"""
+        with self._lock:
+            self.loaders.setdefault(name, LoaderMetrics()).merge(metrics)
+
+    def drain_loaders(self) -> Dict[str, LoaderMetrics]:
+        """Return and clear loader metrics (used by worker processes)"""
+        with self._lock:
+            loaders, self.loaders = self.loaders, {}
+        return loaders
+
+    def merge_loaders(self, loaders: Dict[str, LoaderMetrics]):
+        """
+        Fold loader metrics from a worker process into this run
+
+        Rows and bytes are also attributed to the stage on this thread.
+        """
+        for name, metrics in loaders.items():
+            self.add_loader(name, metrics)
+            self.add(rows_in=metrics.rows, bytes_read=metrics.bytes_read)
+
+    def report(self) -> dict:
+        """Run summary as a JSON-serialisable dictionary"""
+        return {
+            'run_id': self.run_id,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'peak_rss_mb': peak_rss_mb(),
+            'stages': [
+                {**asdict(m), 'rows_per_second': round(m.rows_per_second, 1)} for m in self.stages
+            ],
+            'loaders': {name: asdict(m) for name, m in sorted(self.loaders.items())}
+        }
+
+    def write_json(self, directory: Path) -> Path:
+        """
+        Write the run report as JSON
+
+        Args:
+            directory: Output directory (created if missing)
+
+        Returns:
+            Path of the report file
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        report_path = directory / f"run_{self.run_id}.json"
+        with open(report_path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        return report_path
+
+    def write_table(self, conn):
+        """
+        Append one row per stage to the pipeline_runs table
+
+        Args:
+            conn: DuckDB connection
+        """
+        if not self.stages:
+            return
+
+        df_runs = pd.DataFrame([
+            {**asdict(m), 'run_id': self.run_id, 'started_at': pd.Timestamp(m.started_at)}
+            for m in self.stages
+        ])[PIPELINE_RUNS_COLUMNS]
+        conn.execute("INSERT INTO pipeline_runs SELECT * FROM df_runs")
+
+    def print_summary(self):
+        """Print a one-line summary per stage"""
+        print("\n[TIMING] Stage metrics:")
+        for m in self.stages:
+            rss = f"{m.peak_rss_mb:,.0f} MB" if m.peak_rss_mb is not None else "n/a"
+            print(f"  {m.stage:<28} {m.wall_seconds:7.2f}s wall {m.cpu_seconds:7.2f}s cpu "
+                  f"{m.rows_in:>10,} in {m.rows_out:>10,} out {m.bytes_read / 1e6:9.1f} MB read "
+                  f"peak {rss} [{m.status}]")
+
+
+# Global recorder instance
+run_recorder = RunRecorder()
+
+
+def add_rows_in(rows: int):
+    """Count rows read by the current stage"""
+    run_recorder.add(rows_in=rows)
+
+
+def add_rows_out(rows: int):
+    """Count rows written by the current stage"""
+    run_recorder.add(rows_out=rows)
+
+
+def add_bytes_read(num_bytes: int):
+    """Count bytes read by the current stage"""
+    run_recorder.add(bytes_read=num_bytes)
+
+
+def record_loader(name: str, rows: int, bytes_read: int, wall_seconds: float):
+    """
+    Record one loader call against the run and the current stage
+
+    Args:
+        name: Loader name used in the run report
+        rows: Rows returned
+        bytes_read: Bytes of source data read
+        wall_seconds: Time spent loading
+    """
+    metrics = LoaderMetrics(calls=1, wall_seconds=wall_seconds, rows=int(rows), bytes_read=int(bytes_read))
+    run_recorder.add_loader(name, metrics)
+    run_recorder.add(rows_in=metrics.rows, bytes_read=metrics.bytes_read)
+
+
+def instrument_loader(name: str):
+    """
+    Decorator recording wall time, rows and bytes for a file loader
+
+    The decorated function's first argument must be the file path; rows are
+    taken from the returned DataFrame.
+
+    Args:
+        name: Loader name used in the run report
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(file_path, *args, **kwargs):
+            started = time.perf_counter()
+            result = func(file_path, *args, **kwargs)
+
+            record_loader(name, rows=len(result), bytes_read=Path(file_path).stat().st_size,
+                          wall_seconds=time.perf_counter() - started)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,99 @@
+"""
+Vectorized parsing of timing strings from the race timing exports
+"""
+
+from typing import Tuple
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    HAS_PYARROW = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAS_PYARROW = False
+
+
+# Optional '+' (gaps), optional hours and minutes, then seconds with decimals
+TIME_PATTERN = r'^\+?(?:(?:(?P<hours>\d+):)?(?P<minutes>\d+):)?(?P<seconds>\d+(?:\.\d*)?)$'
+
+# One ':'-separated component of a time string
+COMPONENT_PATTERN = r'^\d+(\.\d*)?$'
+
+
+def _parse_components_arrow(text: pd.Series) -> np.ndarray:
+    """Split on ':' and cast every component inside Arrow compute kernels"""
+    arr = pa.array(text, from_pandas=True)
+    if not pa.types.is_string(arr.type):
+        arr = arr.cast(pa.string())
+
+    arr = pc.utf8_ltrim(pc.utf8_trim_whitespace(arr), characters='+')
+    parts = pc.split_pattern(arr, ':')
+
+    lengths = pc.list_value_length(parts).fill_null(0).to_numpy(zero_copy_only=False)
+    flat = pc.list_flatten(parts)
+    valid = pc.match_substring_regex(flat, COMPONENT_PATTERN)
+    values = pc.cast(pc.if_else(valid, flat, pa.scalar(None, pa.string())), pa.float64())
+    values = np.append(values.to_numpy(zero_copy_only=False), np.nan)
+
+    # Position of each row's last component in the flattened array
+    last = np.cumsum(lengths) - 1
+    seconds = np.where(lengths >= 1, values[last], np.nan)
+    minutes = np.where(lengths >= 2, values[last - 1], 0.0)
+    hours = np.where(lengths == 3, values[last - 2], 0.0)
+
+    total = hours * 3600 + minutes * 60 + seconds
+    total[lengths > 3] = np.nan
+    return total
+
+
+def _parse_components_regex(text: pd.Series) -> np.ndarray:
+    """Fallback parser for environments without pyarrow"""
+    parts = text.str.strip().str.extract(TIME_PATTERN)
+
+    hours = pd.to_numeric(parts['hours'], errors='coerce').fillna(0).to_numpy(dtype=float)
+    minutes = pd.to_numeric(parts['minutes'], errors='coerce').fillna(0).to_numpy(dtype=float)
+    seconds = pd.to_numeric(parts['seconds'], errors='coerce').to_numpy(dtype=float)
+
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def parse_time_column(values) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a whole column of timing strings to seconds
+
+    Handles 'SS.mmm', 'M:SS.mmm' and 'H:MM:SS.mmm', plus '+'-prefixed gaps
+    (e.g. '+1.234'). Non-time values such as '+1 Lap' or '-' become NaN.
+
+    Args:
+        values: Series, array or list of time strings
+
+    Returns:
+        Tuple of (float seconds array, invalid mask). The mask is True where a
+        non-empty value could not be parsed; missing values are NaN but not invalid.
+    """
+    text = pd.Series(values).astype("string")
+
+    if HAS_PYARROW:
+        total = _parse_components_arrow(text)
+    else:
+        total = _parse_components_regex(text)
+
+    missing = (text.isna() | (text.str.strip() == '')).to_numpy(dtype=bool, na_value=True)
+    invalid = np.isnan(total) & ~missing
+
+    return total, invalid
+
+
+def time_column_to_seconds(values: pd.Series) -> pd.Series:
+    """
+    Convert a column of timing strings to float seconds, keeping the index
+
+    Args:
+        values: Series of time strings
+
+    Returns:
+        Series of seconds (NaN where missing or unparseable)
+    """
+    seconds, _ = parse_time_column(values)
+    return pd.Series(seconds, index=values.index)
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from src.pipeline.corners import assign_corner_ids
+
+
+def test_close_corners_keep_separate_ids():
+    # A chicane: apexes 70 m apart, each scattered +-12 m over 20 cars x 20 laps
+    rng = np.random.default_rng(0)
+    n_laps = 400
+    laps = np.repeat(np.arange(n_laps), 2)
+    apex_m = np.tile([1000.0, 1070.0], n_laps) + rng.uniform(-12, 12, 2 * n_laps)
+    events = pd.DataFrame({
+        'lap_row': laps,
+        'apex_m': apex_m,
+        'peak_lateral_g': rng.uniform(0.8, 1.2, 2 * n_laps),
+    })
+
+    assigned = assign_corner_ids(events, n_laps)
+
+    assert sorted(assigned['corner_id'].unique()) == [1, 2]
+    assert (assigned.groupby('lap_row')['corner_id'].nunique() == 2).all()
+    assert np.allclose(sorted(assigned['corner_distance_m'].unique()), [1000, 1070], atol=3)
@@ -0,0 +1,52 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from src.utils import file_utils
+from src.utils.file_utils import RaceBundle
+
+
+def test_concurrent_loads_parse_once(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def slow_read(file_path, schema_key, track_code, race_num, csv_engine):
+        with lock:
+            calls.append(schema_key)
+        time.sleep(0.05)
+        return pd.DataFrame({'LAP_NUMBER': [1, 2, 3]})
+
+    monkeypatch.setattr(file_utils, '_read_timing_csv', slow_read)
+    bundle = RaceBundle('COTA', 1, Path('.'), {'lap_analysis': Path('analysis.csv')})
+
+    barrier = threading.Barrier(8)
+
+    def load():
+        barrier.wait()
+        return bundle.load_lap_analysis()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        frames = list(pool.map(lambda _: load(), range(8)))
+
+    assert calls == ['lap_analysis']
+    assert all(frame is frames[0] for frame in frames)
+
+
+def test_lap_analysis_blank_keys_match_schema(tmp_path, capsys):
+    csv_path = tmp_path / "analysis.csv"
+    csv_path.write_text(
+        "NUMBER; DRIVER_NUMBER; LAP_NUMBER; LAP_TIME\n"
+        "7;7;1;1:56.805\n"
+        "7;;2;1:47.911\n"
+        "7;7;;1:48.002\n"
+    )
+
+    df = file_utils.read_schema_csv(csv_path, "lap_analysis")
+
+    assert "inferring dtypes" not in capsys.readouterr().out
+    assert str(df['DRIVER_NUMBER'].dtype) == 'Int64'
+    assert df['DRIVER_NUMBER'].isna().tolist() == [False, True, False]
+    assert df['LAP_NUMBER'].isna().tolist() == [False, False, True]
@@ -0,0 +1,99 @@
+import duckdb
+import numpy as np
+import pandas as pd
+
+from src.pipeline.lap_segmentation import INVALID_LAP, LapSegmenter, build_lap_boundaries
+from src.pipeline.pivot import pivot_telemetry
+from src.pipeline.telemetry import LapAggregator, lap_aggregate_sql, recover_laps
+
+ORIGIN = pd.Timestamp('2025-04-26 15:00:00')
+
+
+def boundaries():
+    # Two 60 s laps for one car; nothing is timed after 120 s
+    return pd.DataFrame({
+        'vehicle_id': ['GR86-004-78'] * 2,
+        'lap_number': [1, 2],
+        'start_time': [ORIGIN, ORIGIN + pd.Timedelta(seconds=60)],
+        'end_time': [ORIGIN + pd.Timedelta(seconds=60), ORIGIN + pd.Timedelta(seconds=120)],
+    })
+
+
+def shifted_telemetry():
+    # The ECU counter runs one lap ahead, and is unknown for one sample
+    seconds = [10, 50, 70, 110, 130, 140]
+    ecu_laps = [2, 2, 3, INVALID_LAP, 5, INVALID_LAP]
+    return pd.DataFrame({
+        'vehicle_id': pd.Categorical(['GR86-004-78'] * len(seconds)),
+        'lap': np.array(ecu_laps, dtype=float),
+        'timestamp': [(ORIGIN + pd.Timedelta(seconds=s)).isoformat() + 'Z' for s in seconds],
+        'telemetry_name': pd.Categorical(['vcar'] * len(seconds)),
+        'telemetry_value': [100.0, 110.0, 120.0, 130.0, 140.0, 150.0],
+    })
+
+
+def test_windows_override_shifted_ecu_laps():
+    laps = recover_laps(shifted_telemetry(), LapSegmenter(boundaries()))
+
+    # Inside the windows the timestamp wins; outside, a valid ECU lap is kept
+    assert laps.tolist()[:5] == [1, 1, 2, 2, 5]
+    assert np.isnan(laps.iloc[5])
+
+
+def test_pivot_splits_laps_by_timestamp():
+    pivoted = pivot_telemetry(shifted_telemetry(), channels=['vcar'], lap_boundaries=boundaries())
+
+    assert pivoted.index['lap'].tolist() == [1, 2, 5]
+    assert pivoted.lap('GR86-004-78', 1).channels['vcar'].tolist() == [100.0, 110.0]
+    assert pivoted.lap('GR86-004-78', 2).channels['vcar'].tolist() == [120.0, 130.0]
+
+
+def test_sql_and_pandas_aggregates_agree():
+    telemetry = shifted_telemetry()
+    aggregator = LapAggregator(segmenter=LapSegmenter(boundaries()))
+    aggregator.update(telemetry)
+    expected = aggregator.result('COTA', 1)
+
+    conn = duckdb.connect()
+    conn.register('telemetry_df', telemetry.astype({'vehicle_id': str, 'telemetry_name': str}))
+    conn.register('windows_df', pd.DataFrame({
+        'vehicle_id': ['GR86-004-78'] * 2,
+        'lap_number': [1, 2],
+        'start_ms': boundaries()['start_time'].to_numpy().astype('datetime64[ms]').astype(np.int64),
+        'end_ms': boundaries()['end_time'].to_numpy().astype('datetime64[ms]').astype(np.int64),
+    }))
+    actual = conn.execute(lap_aggregate_sql('telemetry_df', 'windows_df')).df()
+
+    assert actual['lap_number'].tolist() == expected['lap_number'].tolist() == [1, 2, 5]
+    assert actual['speed_avg'].tolist() == expected['speed_avg'].tolist() == [105.0, 125.0, 140.0]
+    assert actual['telemetry_points'].tolist() == [2, 2, 1]
+
+
+def boundary_export(seconds, value=None):
+    df = pd.DataFrame({
+        'vehicle_id': 'GR86-004-78',
+        'vehicle_number': 78,
+        'lap': [1, 2, 3],
+        'timestamp': [(ORIGIN + pd.Timedelta(seconds=s)).isoformat() + 'Z' if s is not None else None
+                      for s in seconds],
+    })
+    if value is not None:
+        df['value'] = value
+    return df
+
+
+def test_blank_boundary_timestamps_use_fallbacks():
+    frames = {
+        'start': boundary_export([0, None, 120]),
+        'end': boundary_export([60, 120, None]),
+        'time': boundary_export([60, 120, 180], value=[60000, 60000, 60000]),
+    }
+
+    laps = build_lap_boundaries(frames, 'COTA', 1)
+
+    # Lap 2 starts at its end minus the lap time; lap 3 ends at its lap_time timestamp
+    assert laps['lap_number'].tolist() == [1, 2, 3]
+    assert laps['start_time'].tolist() == [ORIGIN + pd.Timedelta(seconds=s) for s in (0, 60, 120)]
+    assert laps['end_time'].tolist() == [ORIGIN + pd.Timedelta(seconds=s) for s in (60, 120, 180)]
+    assert laps['lap_time_seconds'].tolist() == [60.0, 60.0, 60.0]
+    assert len(LapSegmenter(laps)) == 3
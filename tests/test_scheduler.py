@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+from src.pipeline.scheduler import Stage, StageGraph
+
+
+def noop(conn):
+    pass
+
+
+class FakeConnection:
+    def cursor(self):
+        return self
+
+    def close(self):
+        pass
+
+
+def test_dependencies_follow_reads_and_writes():
+    graph = StageGraph([
+        Stage('load', noop, writes=('laps',)),
+        Stage('stats', noop, reads=('laps',), writes=('stats',)),
+        Stage('weather', noop, writes=('weather',)),
+        Stage('reload', noop, writes=('laps',)),
+    ])
+
+    assert graph.dependencies['stats'] == {'load'}
+    assert graph.dependencies['weather'] == set()
+    # Writing a table an earlier stage reads waits for that reader (write after read)
+    assert graph.dependencies['reload'] == {'load', 'stats'}
+    assert graph.downstream('stats') == {'stats', 'reload'}
+
+
+def test_writer_waits_for_earlier_reader():
+    reading = threading.Event()
+    order = []
+
+    def read(conn):
+        reading.set()
+        time.sleep(0.05)
+        order.append('read')
+
+    def write(conn):
+        reading.wait(1)
+        order.append('write')
+
+    graph = StageGraph([
+        Stage('read', read, reads=('cache',), writes=('stats',)),
+        Stage('write', write, writes=('cache',)),
+    ])
+    graph.run(FakeConnection(), max_workers=2)
+
+    assert order == ['read', 'write']
+
+
+def test_select_rejects_unknown_stage():
+    graph = StageGraph([Stage('load', noop, writes=('laps',))])
+
+    with pytest.raises(ValueError, match="missing"):
+        graph.select(only=['missing'])